@@ -0,0 +1,57 @@
+"""Add taxonomy merges to the history enums
+
+Revision ID: 5f2a8d3c1e07
+Revises: e4131f44a282
+Create Date: 2026-10-18 09:12:40.118372
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5f2a8d3c1e07"
+down_revision = "e4131f44a282"
+branch_labels = None
+depends_on = None
+
+
+OLD_METHODS = sa.Enum("create", "update", "delete", name="methodenum")
+NEW_METHODS = sa.Enum("create", "update", "delete", "merge", name="methodenum")
+OLD_TYPES = sa.Enum("person", "opus", "part", "subpart", "voice", name="typeenum")
+NEW_TYPES = sa.Enum(
+    "person", "opus", "part", "subpart", "voice", "taxonomy", name="typeenum"
+)
+
+
+def upgrade():
+    with op.batch_alter_table("history", schema=None) as batch_op:
+        batch_op.alter_column(
+            "method", existing_type=OLD_METHODS, type_=NEW_METHODS, existing_nullable=True
+        )
+        batch_op.alter_column(
+            "type", existing_type=OLD_TYPES, type_=NEW_TYPES, existing_nullable=True
+        )
+
+    with op.batch_alter_table("backup", schema=None) as batch_op:
+        batch_op.alter_column(
+            "type", existing_type=OLD_TYPES, type_=NEW_TYPES, existing_nullable=True
+        )
+
+
+def downgrade():
+    op.execute("DELETE FROM history WHERE method = 'merge' OR type = 'taxonomy'")
+    op.execute("DELETE FROM backup WHERE type = 'taxonomy'")
+
+    with op.batch_alter_table("backup", schema=None) as batch_op:
+        batch_op.alter_column(
+            "type", existing_type=NEW_TYPES, type_=OLD_TYPES, existing_nullable=True
+        )
+
+    with op.batch_alter_table("history", schema=None) as batch_op:
+        batch_op.alter_column(
+            "type", existing_type=NEW_TYPES, type_=OLD_TYPES, existing_nullable=True
+        )
+        batch_op.alter_column(
+            "method", existing_type=NEW_METHODS, type_=OLD_METHODS, existing_nullable=True
+        )
@@ -4,9 +4,10 @@ from http import HTTPStatus
 
 from flask import Blueprint, Flask
 from flask_jwt_extended.exceptions import NoAuthorizationError
-from flask_restx import Api
 from flask_restx.errors import ValidationError
+from flask_restx.representations import output_json
 
+from ..performance import TimedApi, request_phase
 from ..user_api import log_unauthorized
 
 api_blueprint = Blueprint("api", __name__)
@@ -20,7 +21,7 @@ authorizations = {
     },
 }
 
-api = Api(
+api = TimedApi(
     version="0.1",
     title="MUSE4Music API",
     doc="/doc/",
@@ -29,11 +30,17 @@ api = Api(
     description="The restful api for muse 4 music.",
 )
 
-from . import data, root, taxonomies  # noqa
+from . import data, performance, root, taxonomies  # noqa
 
 api.init_app(api_blueprint)
 
 
+@api.representation("application/json")
+def output_json_timed(payload, code, headers=None):
+    with request_phase("json"):
+        return output_json(payload, code, headers)
+
+
 @api.errorhandler(ValidationError)
 def handle_validation_erorr(error: ValidationError):
     """Validation failed."""
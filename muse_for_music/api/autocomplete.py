@@ -0,0 +1,148 @@
+"""Module containing the in-memory autocomplete indexes of the api."""
+
+import unicodedata
+from bisect import bisect_left
+from difflib import get_close_matches
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+from flask import current_app
+
+
+class AutocompleteEntry(NamedTuple):
+    """A selectable item with its ancestor path."""
+
+    id: int
+    name: str
+    path: Tuple[str, ...] = ()
+
+
+def normalize(text: str) -> str:
+    """Normalize text for case and accent insensitive matching."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).strip()
+
+
+class PrefixIndex:
+    """Sorted prefix index over the names of autocomplete entries.
+
+    Names starting with the query are ranked first, followed by names with
+    a later word starting with the query. Both groups are sorted
+    alphabetically. Only if no name matches the query, a fuzzy search
+    over all names is used.
+    """
+
+    def __init__(self, entries: Iterable[AutocompleteEntry]):
+        self.entries: List[AutocompleteEntry] = sorted(
+            entries, key=lambda e: (normalize(e.name), e.id)
+        )
+        self.names: List[str] = [normalize(e.name) for e in self.entries]
+        words: List[Tuple[str, int]] = []
+        for index, name in enumerate(self.names):
+            for position, char in enumerate(name):
+                if position > 0 and not name[position - 1].isalnum() and char.isalnum():
+                    words.append((name[position:], index))
+        words.sort()
+        self.words: List[str] = [word for word, _ in words]
+        self.word_entries: List[int] = [index for _, index in words]
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str) -> Iterable[int]:
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            yield position
+            position += 1
+
+    def _ranked_matches(self, prefix: str, limit: int) -> Dict[int, None]:
+        """Get the indexes of names and then words starting with the prefix."""
+        found: Dict[int, None] = {}  # ordered set of entry indexes
+        for position in self._prefix_range(self.names, prefix):
+            if len(found) >= limit:
+                return found
+            found[position] = None
+        for position in self._prefix_range(self.words, prefix):
+            if len(found) >= limit:
+                break
+            found.setdefault(self.word_entries[position], None)
+        return found
+
+    def _fuzzy_matches(self, prefix: str, limit: int) -> Dict[int, None]:
+        """Get the indexes of the names closest to the prefix."""
+        found: Dict[int, None] = {}
+        for name in get_close_matches(prefix, self.names, n=limit, cutoff=0.75):
+            for position in self._prefix_range(self.names, name):
+                if len(found) >= limit:
+                    break
+                if self.names[position] == name:
+                    found.setdefault(position, None)
+        return found
+
+    def search(self, query: str, limit: int = 10) -> List[AutocompleteEntry]:
+        """Get the best matching entries for the query.
+
+        Arguments:
+            query: str -- The (partial) name to search for.
+            limit: int -- The maximum number of entries to return.
+
+        Returns:
+            List[AutocompleteEntry] -- The matching entries, best match first.
+        """
+        prefix = normalize(query)
+        if not prefix or limit < 1:
+            return []
+        found = self._ranked_matches(prefix, limit)
+        if not found and len(prefix) >= 3:
+            found = self._fuzzy_matches(prefix, limit)
+        return [self.entries[index] for index in found]
+
+
+class AutocompleteIndexes:
+    """The autocomplete indexes of one worker.
+
+    Every index is stored with the version of the data it was built from
+    and is rebuilt on the next search after the version changed.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._indexes: Dict[str, Tuple[int, PrefixIndex]] = {}
+
+    def get(
+        self,
+        key: str,
+        version: int,
+        load_entries: Callable[[], Sequence[AutocompleteEntry]],
+    ) -> PrefixIndex:
+        """Get the index for the version and rebuild it if it is outdated.
+
+        Arguments:
+            key: str -- The name of the index.
+            version: int -- The current version of the indexed data.
+            load_entries: Callable -- Loads the entries to build the index from.
+        """
+        entry = self._indexes.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        with self._lock:
+            entry = self._indexes.get(key)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+            index = PrefixIndex(load_entries())
+            self._indexes[key] = (version, index)
+            return index
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+
+def get_autocomplete_indexes() -> AutocompleteIndexes:
+    """Get the autocomplete indexes of the current app."""
+    indexes = current_app.extensions.get("m4m_autocomplete")
+    if indexes is None:
+        indexes = AutocompleteIndexes()
+        current_app.extensions["m4m_autocomplete"] = indexes
+    return indexes
@@ -14,6 +14,9 @@ from .models import history_get
 
 ns = api.namespace("history", description="Resource for history.", path="/history")
 
+# entries of these methods are listed even if the resource does not exist
+LISTED_METHODS = (MethodEnum.delete, MethodEnum.merge)
+
 
 @ns.route("/")
 class HistoryResource(Resource):
@@ -24,7 +27,7 @@ class HistoryResource(Resource):
     def get(self):
         q = select(History).order_by(History.time.desc())
         hist = db.session.execute(q).scalars().all()
-        return [h for h in hist if h.full_resource or h.method == MethodEnum.delete]
+        return [h for h in hist if h.full_resource or h.method in LISTED_METHODS]
 
 
 @ns.route("/<string:username>/")
@@ -48,4 +51,4 @@ class UserHistoryResource(Resource):
             .order_by(History.time.desc())
         )
         hist = db.session.execute(q).scalars().all()
-        return [h for h in hist if h.full_resource or h.method == MethodEnum.delete]
+        return [h for h in hist if h.full_resource or h.method in LISTED_METHODS]
@@ -7,13 +7,19 @@ from enum import Enum
 from flask_restx import fields
 
 from ...hal_field import HaLUrl, NestedFields, UrlData
+from ...models.data.history import HistoryTaxonomyItem
 from ...models.data.opus import Opus
 from ...models.data.part import Part
 from ...models.data.people import Person
 from ...models.data.subpart import SubPart
 from ...models.data.voice import Voice
 from ..models import with_curies
-from ..taxonomies.models import taxonomy_item_get, taxonomy_item_ref
+from ..taxonomies.models import (
+    TaxonomyItemNested,
+    TaxonomyItemRef,
+    taxonomy_item_get,
+    taxonomy_item_ref,
+)
 from . import api
 
 
@@ -276,7 +282,7 @@ instrumentation_context_put = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "instrumentation_quantity_before",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="InstrumentierungEinbettungQuantitaet",
                     title="Instrumentierungsquantität davor",
@@ -284,7 +290,7 @@ instrumentation_context_put = api.model(
             ),
             (
                 "instrumentation_quality_before",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="InstrumentierungEinbettungQualitaet",
                     title="Instrumentierungsqualität davor",
@@ -292,7 +298,7 @@ instrumentation_context_put = api.model(
             ),
             (
                 "instrumentation_quantity_after",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="InstrumentierungEinbettungQuantitaet",
                     title="Instrumentierungsquantität danach",
@@ -300,7 +306,7 @@ instrumentation_context_put = api.model(
             ),
             (
                 "instrumentation_quality_after",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="InstrumentierungEinbettungQualitaet",
                     title="Instrumentierungsqualität danach",
@@ -317,7 +323,7 @@ instrumentation_context_get = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "instrumentation_quantity_before",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="InstrumentierungEinbettungQuantitaet",
                     title="Instrumentierungsquantität davor",
@@ -325,7 +331,7 @@ instrumentation_context_get = api.model(
             ),
             (
                 "instrumentation_quality_before",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="InstrumentierungEinbettungQualitaet",
                     title="Instrumentierungsqualität davor",
@@ -333,7 +339,7 @@ instrumentation_context_get = api.model(
             ),
             (
                 "instrumentation_quantity_after",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="InstrumentierungEinbettungQuantitaet",
                     title="Instrumentierungsquantität danach",
@@ -341,7 +347,7 @@ instrumentation_context_get = api.model(
             ),
             (
                 "instrumentation_quality_after",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="InstrumentierungEinbettungQualitaet",
                     title="Instrumentierungsqualität danach",
@@ -358,13 +364,13 @@ dynamic_context_put = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "loudness_before",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref, taxonomy="Lautstaerke", title="Lautstärke davor"
                 ),
             ),
             (
                 "dynamic_trend_before",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="LautstaerkeEinbettung",
                     title="Lautstärke-Entwicklung davor",
@@ -372,13 +378,13 @@ dynamic_context_put = api.model(
             ),
             (
                 "loudness_after",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref, taxonomy="Lautstaerke", title="Lautstärke danach"
                 ),
             ),
             (
                 "dynamic_trend_after",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="LautstaerkeEinbettung",
                     title="Lautstärke-Entwicklung danach",
@@ -395,13 +401,13 @@ dynamic_context_get = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "loudness_before",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get, taxonomy="Lautstaerke", title="Lautstärke davor"
                 ),
             ),
             (
                 "dynamic_trend_before",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="LautstaerkeEinbettung",
                     title="Lautstärke Einbettung davor",
@@ -409,13 +415,13 @@ dynamic_context_get = api.model(
             ),
             (
                 "loudness_after",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get, taxonomy="Lautstaerke", title="Lautstärke danach"
                 ),
             ),
             (
                 "dynamic_trend_after",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="LautstaerkeEinbettung",
                     title="Lautstärke Einbettung danach",
@@ -432,7 +438,7 @@ tempo_context_put = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "tempo_context_before",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="TempoEinbettung",
                     title="Tempo Einbettung davor",
@@ -440,7 +446,7 @@ tempo_context_put = api.model(
             ),
             (
                 "tempo_trend_before",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="TempoEntwicklung",
                     title="Tempo-Entwicklung davor",
@@ -448,7 +454,7 @@ tempo_context_put = api.model(
             ),
             (
                 "tempo_context_after",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="TempoEinbettung",
                     title="Tempo Einbettung danach",
@@ -456,7 +462,7 @@ tempo_context_put = api.model(
             ),
             (
                 "tempo_trend_after",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="TempoEntwicklung",
                     title="Tempo-Entwicklung danach",
@@ -473,7 +479,7 @@ tempo_context_get = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "tempo_context_before",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="TempoEinbettung",
                     title="Tempo Einbettung davor",
@@ -481,7 +487,7 @@ tempo_context_get = api.model(
             ),
             (
                 "tempo_trend_before",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="TempoEntwicklung",
                     title="Tempo-Entwicklung davor",
@@ -489,7 +495,7 @@ tempo_context_get = api.model(
             ),
             (
                 "tempo_context_after",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="TempoEinbettung",
                     title="Tempo Einbettung danach",
@@ -497,7 +503,7 @@ tempo_context_get = api.model(
             ),
             (
                 "tempo_trend_after",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="TempoEntwicklung",
                     title="Tempo-Entwicklung danach",
@@ -515,14 +521,14 @@ form_put = api.model(
             ("contains_theme", fields.Boolean(default=False, title="Enthält Thema")),
             (
                 "form_schema",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref, taxonomy="Formschema", title="Formschema"
                 ),
             ),
             (
                 "formal_functions",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="FormaleFunktion",
                     title="Formale Funktion",
@@ -540,14 +546,14 @@ form_get = api.model(
             ("contains_theme", fields.Boolean(default=False, title="Enthält Thema")),
             (
                 "form_schema",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get, taxonomy="Formschema", title="Formschema"
                 ),
             ),
             (
                 "formal_functions",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="FormaleFunktion",
                     title="Formale Funktion",
@@ -564,13 +570,13 @@ harmonic_center_put = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "tonalitaet",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref, taxonomy="Tonalitaet", title="Tonalität"
                 ),
             ),
             (
                 "harmonische_funktion",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="HarmonischeFunktion",
                     title="Harmonische Funktion",
@@ -579,11 +585,11 @@ harmonic_center_put = api.model(
             ),
             (
                 "grundton",
-                fields.Nested(taxonomy_item_ref, taxonomy="Grundton", title="Grundton"),
+                TaxonomyItemRef(taxonomy_item_ref, taxonomy="Grundton", title="Grundton"),
             ),
             (
                 "harmonische_stufe",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="HarmonischeStufe",
                     title="Harmonische Stufe",
@@ -601,13 +607,13 @@ harmonic_center_get = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "tonalitaet",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get, taxonomy="Tonalitaet", title="Tonalität"
                 ),
             ),
             (
                 "harmonische_funktion",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="HarmonischeFunktion",
                     title="Harmonische Funktion",
@@ -616,11 +622,13 @@ harmonic_center_get = api.model(
             ),
             (
                 "grundton",
-                fields.Nested(taxonomy_item_get, taxonomy="Grundton", title="Grundton"),
+                TaxonomyItemNested(
+                    taxonomy_item_get, taxonomy="Grundton", title="Grundton"
+                ),
             ),
             (
                 "harmonische_stufe",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="HarmonischeStufe",
                     title="Harmonische Stufe",
@@ -638,7 +646,7 @@ harmonics_put = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "degree_of_dissonance",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref, taxonomy="Dissonanzgrad", title="Dissonanzgrad"
                 ),
             ),
@@ -656,7 +664,7 @@ harmonics_put = api.model(
             (
                 "chords",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Akkord",
                     default=[],
@@ -666,7 +674,7 @@ harmonics_put = api.model(
             ),
             (
                 "harmonic_complexity",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="HarmonischeKomplexitaet",
                     title="Harmonische Komplexität",
@@ -685,7 +693,7 @@ harmonics_put = api.model(
             ),
             (
                 "harmonic_density",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="HarmonischeDichte",
                     title="Harmonische Dichte",
@@ -704,7 +712,7 @@ harmonics_put = api.model(
             (
                 "harmonic_phenomenons",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="HarmonischePhaenomene",
                     default=[],
@@ -714,7 +722,7 @@ harmonics_put = api.model(
             (
                 "harmonic_changes",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="HarmonischeEntwicklung",
                     default=[],
@@ -724,7 +732,7 @@ harmonics_put = api.model(
             (
                 "harmonische_funktion",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="HarmonischeFunktionVerwandschaft",
                     title="Zeigt Modulation zu Tonart mit folgender Funktion (bezogen auf Werkausschnitt)",
@@ -758,7 +766,7 @@ harmonics_get = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "degree_of_dissonance",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get, taxonomy="Dissonanzgrad", title="Dissonanzgrad"
                 ),
             ),
@@ -771,7 +779,7 @@ harmonics_get = api.model(
             # ('dissonances', fields.List(fields.Nested(taxonomy_item_get), isArray=True, taxonomy='Dissonanzen', default=[], title='Dissonanzen')),
             (
                 "harmonic_complexity",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="HarmonischeKomplexitaet",
                     title="Harmonische Komplexität",
@@ -788,7 +796,7 @@ harmonics_get = api.model(
             ),
             (
                 "harmonic_density",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="HarmonischeDichte",
                     title="Harmonische Dichte",
@@ -803,7 +811,7 @@ harmonics_get = api.model(
             (
                 "harmonic_phenomenons",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="HarmonischePhaenomene",
                     default=[],
@@ -813,7 +821,7 @@ harmonics_get = api.model(
             (
                 "harmonic_changes",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="HarmonischeEntwicklung",
                     default=[],
@@ -823,7 +831,7 @@ harmonics_get = api.model(
             (
                 "harmonische_funktion",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="HarmonischeFunktionVerwandschaft",
                     title="Zeigt Modulation zu Tonart mit folgender Funktion (bezogen auf Werkausschnitt)",
@@ -848,7 +856,7 @@ dramaturgic_context_put = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "ambitus_context_before",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="AmbitusEinbettung",
                     title="Ambitus Einbettung davor",
@@ -856,7 +864,7 @@ dramaturgic_context_put = api.model(
             ),
             (
                 "ambitus_change_before",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="AmbitusEntwicklung",
                     title="Ambitus-Entwicklung davor",
@@ -864,7 +872,7 @@ dramaturgic_context_put = api.model(
             ),
             (
                 "melodic_line_before",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="Melodiebewegung",
                     title="Melodielinie davor",
@@ -873,7 +881,7 @@ dramaturgic_context_put = api.model(
             ),
             (
                 "ambitus_context_after",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="AmbitusEinbettung",
                     title="Ambitus Einbettung danach",
@@ -881,7 +889,7 @@ dramaturgic_context_put = api.model(
             ),
             (
                 "ambitus_change_after",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="AmbitusEntwicklung",
                     title="Ambitus-Entwicklung danach",
@@ -889,7 +897,7 @@ dramaturgic_context_put = api.model(
             ),
             (
                 "melodic_line_after",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="Melodiebewegung",
                     title="Melodielinie danach",
@@ -907,7 +915,7 @@ dramaturgic_context_get = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "ambitus_context_before",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="AmbitusEinbettung",
                     title="Ambitus Einbettung davor",
@@ -915,7 +923,7 @@ dramaturgic_context_get = api.model(
             ),
             (
                 "ambitus_change_before",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="AmbitusEntwicklung",
                     title="Ambitus-Entwicklung davor",
@@ -923,7 +931,7 @@ dramaturgic_context_get = api.model(
             ),
             (
                 "melodic_line_before",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="Melodiebewegung",
                     title="Melodielinie davor",
@@ -931,7 +939,7 @@ dramaturgic_context_get = api.model(
             ),
             (
                 "ambitus_context_after",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="AmbitusEinbettung",
                     title="Ambitus Einbettung danach",
@@ -939,7 +947,7 @@ dramaturgic_context_get = api.model(
             ),
             (
                 "ambitus_change_after",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="AmbitusEntwicklung",
                     title="Ambitus-Entwicklung danach",
@@ -947,7 +955,7 @@ dramaturgic_context_get = api.model(
             ),
             (
                 "melodic_line_after",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="Melodiebewegung",
                     title="Melodielinie danach",
@@ -965,7 +973,7 @@ rhythm_put = api.model(
             (
                 "measure_times",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Taktart",
                     default=[],
@@ -975,7 +983,7 @@ rhythm_put = api.model(
             (
                 "rhythmic_phenomenons",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="RhythmischesPhaenomen",
                     default=[],
@@ -985,7 +993,7 @@ rhythm_put = api.model(
             (
                 "rhythm_types",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Rhythmustyp",
                     default=[],
@@ -1005,7 +1013,7 @@ rhythm_get = api.model(
             (
                 "measure_times",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Taktart",
                     default=[],
@@ -1015,7 +1023,7 @@ rhythm_get = api.model(
             (
                 "rhythmic_phenomenons",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="RhythmischesPhaenomen",
                     default=[],
@@ -1025,7 +1033,7 @@ rhythm_get = api.model(
             (
                 "rhythm_types",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Rhythmustyp",
                     default=[],
@@ -1044,13 +1052,13 @@ dynamic_marking_put = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "lautstaerke",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref, taxonomy="Lautstaerke", title="Lautstärke"
                 ),
             ),
             (
                 "lautstaerke_zusatz",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref, taxonomy="LautstaerkeZusatz", title="Zusatz"
                 ),
             ),
@@ -1065,13 +1073,13 @@ dynamic_marking_get = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "lautstaerke",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get, taxonomy="Lautstaerke", title="Lautstärke"
                 ),
             ),
             (
                 "lautstaerke_zusatz",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get, taxonomy="LautstaerkeZusatz", title="Zusatz"
                 ),
             ),
@@ -1095,7 +1103,7 @@ dynamic_put = api.model(
             (
                 "dynamic_changes",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="LautstaerkeEntwicklung",
                     default=[],
@@ -1122,7 +1130,7 @@ dynamic_get = api.model(
             (
                 "dynamic_changes",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="LautstaerkeEntwicklung",
                     default=[],
@@ -1141,7 +1149,7 @@ satz_put = api.model(
             (
                 "satzart_allgemein",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="SatzartAllgemein",
                     title="Satzart allgemein",
@@ -1150,7 +1158,7 @@ satz_put = api.model(
             (
                 "satzart_speziell",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="SatzartSpeziell",
                     title="Satzart speziell",
@@ -1168,7 +1176,7 @@ satz_get = api.model(
             (
                 "satzart_allgemein",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="SatzartAllgemein",
                     title="Satzart allgemein",
@@ -1177,7 +1185,7 @@ satz_get = api.model(
             (
                 "satzart_speziell",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="SatzartSpeziell",
                     title="Satzart speziell",
@@ -1195,11 +1203,11 @@ specification_aa = api.model(
             ("path", fields.String(required=True, readonly=True)),
             (
                 "share",
-                fields.Nested(taxonomy_item_ref, taxonomy="SpecAnteil", title="Anteil"),
+                TaxonomyItemRef(taxonomy_item_ref, taxonomy="SpecAnteil", title="Anteil"),
             ),
             (
                 "occurence",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref, taxonomy="SpecAuftreten", title="Auftreten"
                 ),
             ),
@@ -1215,7 +1223,7 @@ specification_aai = api.inherit(
             (
                 "instrumentation",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="SpecInstrument",
                     default=[],
@@ -1236,18 +1244,20 @@ specification_get = api.model(
             ("path", fields.String(required=True, readonly=True)),
             (
                 "share",
-                fields.Nested(taxonomy_item_get, taxonomy="SpecAnteil", title="Anteil"),
+                TaxonomyItemNested(
+                    taxonomy_item_get, taxonomy="SpecAnteil", title="Anteil"
+                ),
             ),
             (
                 "occurence",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get, taxonomy="SpecAuftreten", title="Auftreten"
                 ),
             ),
             (
                 "instrumentation",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="SpecInstrument",
                     default=[],
@@ -1288,7 +1298,7 @@ musicial_sequence_put = api.model(
             ("beats", fields.Integer(default=0, title="Zählzeiten")),
             (
                 "flow",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="BewegungImTonraum",
                     title="Bewegung im Tonraum",
@@ -1301,7 +1311,7 @@ musicial_sequence_put = api.model(
             ("tonal_corrected", fields.Boolean(default=False, title="Tonal angepasst")),
             (
                 "starting_interval",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="Intervall",
                     title="Intervall der Sequenzierung",
@@ -1319,7 +1329,7 @@ musicial_sequence_get = api.model(
             ("beats", fields.Integer(default=0, title="Zählzeiten")),
             (
                 "flow",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="BewegungImTonraum",
                     title="Bewegung im Tonraum",
@@ -1332,7 +1342,7 @@ musicial_sequence_get = api.model(
             ("tonal_corrected", fields.Boolean(default=False, title="Tonal angepasst")),
             (
                 "starting_interval",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get,
                     taxonomy="Intervall",
                     title="Intervall der Sequenzierung",
@@ -1383,7 +1393,7 @@ composition_put = api.model(
             (
                 "composition_techniques",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Verarbeitungstechnik",
                     default=[],
@@ -1442,7 +1452,7 @@ composition_get = api.model(
             (
                 "composition_techniques",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Verarbeitungstechnik",
                     default=[],
@@ -1469,7 +1479,7 @@ opus_citation_put = api.model(
             ("opus", fields.Nested(opus_get_citation, reference="opus", title="Werk")),
             (
                 "citation_type",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref, taxonomy="Zitat", title="Art des Zitats"
                 ),
             ),
@@ -1485,7 +1495,7 @@ opus_citation_get = api.model(
             ("opus", fields.Nested(opus_get_citation, reference="opus", title="Werk")),
             (
                 "citation_type",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get, taxonomy="Zitat", title="Art des Zitats"
                 ),
             ),
@@ -1511,7 +1521,7 @@ citations_put = api.model(
             (
                 "gattung_citations",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Gattung",
                     default=[],
@@ -1521,7 +1531,7 @@ citations_put = api.model(
             (
                 "instrument_citations",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Instrument",
                     default=[],
@@ -1541,7 +1551,7 @@ citations_put = api.model(
             (
                 "program_citations",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Programmgegenstand",
                     default=[],
@@ -1551,7 +1561,7 @@ citations_put = api.model(
             (
                 "tonmalerei_citations",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Tonmalerei",
                     default=[],
@@ -1561,7 +1571,7 @@ citations_put = api.model(
             (
                 "epoch_citations",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Epoche",
                     default=[],
@@ -1588,7 +1598,7 @@ citations_get = api.model(
             (
                 "gattung_citations",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Gattung",
                     default=[],
@@ -1598,7 +1608,7 @@ citations_get = api.model(
             (
                 "instrument_citations",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Instrument",
                     default=[],
@@ -1618,7 +1628,7 @@ citations_get = api.model(
             (
                 "program_citations",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Programmgegenstand",
                     default=[],
@@ -1628,7 +1638,7 @@ citations_get = api.model(
             (
                 "tonmalerei_citations",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Tonmalerei",
                     default=[],
@@ -1638,7 +1648,7 @@ citations_get = api.model(
             (
                 "epoch_citations",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Epoche",
                     default=[],
@@ -1657,7 +1667,7 @@ tempo_put = api.model(
             (
                 "tempo_markings",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Tempo",
                     default=[],
@@ -1667,7 +1677,7 @@ tempo_put = api.model(
             (
                 "tempo_changes",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="TempoEntwicklung",
                     default=[],
@@ -1686,7 +1696,7 @@ tempo_get = api.model(
             (
                 "tempo_markings",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Tempo",
                     default=[],
@@ -1696,7 +1706,7 @@ tempo_get = api.model(
             (
                 "tempo_changes",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="TempoEntwicklung",
                     default=[],
@@ -1714,25 +1724,25 @@ ambitus_put = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "highest_pitch",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref, taxonomy="Grundton", title="Höchster Ton"
                 ),
             ),
             (
                 "highest_octave",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref, taxonomy="Oktave", title="Höchste Oktave"
                 ),
             ),
             (
                 "lowest_pitch",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref, taxonomy="Grundton", title="Niedrigster Ton"
                 ),
             ),
             (
                 "lowest_octave",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref, taxonomy="Oktave", title="Niedrigste Oktave"
                 ),
             ),
@@ -1747,25 +1757,25 @@ ambitus_get = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "highest_pitch",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get, taxonomy="Grundton", title="Höchster Ton"
                 ),
             ),
             (
                 "highest_octave",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get, taxonomy="Oktave", title="Höchste Oktave"
                 ),
             ),
             (
                 "lowest_pitch",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get, taxonomy="Grundton", title="Niedrigster Ton"
                 ),
             ),
             (
                 "lowest_octave",
-                fields.Nested(
+                TaxonomyItemNested(
                     taxonomy_item_get, taxonomy="Oktave", title="Niedrigste Oktave"
                 ),
             ),
@@ -1781,7 +1791,7 @@ rendition_put = api.model(
             (
                 "mood_markings",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Ausdruck",
                     default=[],
@@ -1791,7 +1801,7 @@ rendition_put = api.model(
             (
                 "technic_markings",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Spielanweisung",
                     default=[],
@@ -1801,7 +1811,7 @@ rendition_put = api.model(
             (
                 "articulation_markings",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Artikulation",
                     default=[],
@@ -1820,7 +1830,7 @@ rendition_get = api.model(
             (
                 "mood_markings",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Ausdruck",
                     default=[],
@@ -1830,7 +1840,7 @@ rendition_get = api.model(
             (
                 "technic_markings",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Spielanweisung",
                     default=[],
@@ -1840,7 +1850,7 @@ rendition_get = api.model(
             (
                 "articulation_markings",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Artikulation",
                     default=[],
@@ -1943,7 +1953,7 @@ part_put = api.inherit(
             (
                 "occurence_in_movement",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="AuftretenSatz",
                     title="Vorkommen im Werk",
@@ -1992,7 +2002,7 @@ part_put = api.inherit(
             (
                 "formal_functions",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="FormaleFunktion",
                     title="Formale Funktion",
@@ -2064,7 +2074,7 @@ subpart_put = api.inherit(
         [
             (
                 "occurence_in_part",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     required=True,
                     taxonomy="AuftretenWerkausschnitt",
@@ -2073,7 +2083,7 @@ subpart_put = api.inherit(
             ),
             (
                 "share_of_part",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     required=True,
                     taxonomy="Anteil",
@@ -2083,7 +2093,7 @@ subpart_put = api.inherit(
             (
                 "instrumentation",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref, required=True),
+                    TaxonomyItemRef(taxonomy_item_ref, required=True),
                     required=True,
                     isArray=True,
                     taxonomy="Instrument",
@@ -2207,7 +2217,7 @@ related_voice_put = api.model(
             ("id", fields.Integer(default=-1, readonly=True, example=1)),
             (
                 "type_of_relationship",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     required=True,
                     taxonomy="VoiceToVoiceRelation",
@@ -2231,7 +2241,7 @@ related_voice_get = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             (
                 "type_of_relationship",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     required=True,
                     taxonomy="VoiceToVoiceRelation",
@@ -2256,7 +2266,7 @@ voice_put = api.inherit(
             (
                 "instrumentation",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Instrument",
                     default=[],
@@ -2273,7 +2283,7 @@ voice_put = api.inherit(
             (
                 "musicial_function",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="MusikalischeFunktion",
                     default=[],
@@ -2283,7 +2293,7 @@ voice_put = api.inherit(
             ),
             (
                 "share",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="Anteil",
                     title="Anteil der Stimme",
@@ -2292,7 +2302,7 @@ voice_put = api.inherit(
             ),
             (
                 "occurence_in_part",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="AuftretenWerkausschnitt",
                     title="Auftreten der Stimme",
@@ -2316,7 +2326,7 @@ voice_put = api.inherit(
             (
                 "dominant_note_values",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Notenwert",
                     default=[],
@@ -2338,7 +2348,7 @@ voice_put = api.inherit(
             (
                 "musicial_figures",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="MusikalischeWendung",
                     default=[],
@@ -2358,7 +2368,7 @@ voice_put = api.inherit(
             (
                 "ornaments",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Verzierung",
                     default=[],
@@ -2367,12 +2377,14 @@ voice_put = api.inherit(
             ),
             (
                 "melody_form",
-                fields.Nested(taxonomy_item_ref, taxonomy="Melodieform", title="Melodik"),
+                TaxonomyItemRef(
+                    taxonomy_item_ref, taxonomy="Melodieform", title="Melodik"
+                ),
             ),
             (
                 "intervallik",
                 fields.List(
-                    fields.Nested(taxonomy_item_ref),
+                    TaxonomyItemRef(taxonomy_item_ref),
                     isArray=True,
                     taxonomy="Intervallik",
                     title="Intervallik",
@@ -2442,7 +2454,7 @@ voice_get = api.inherit(
             (
                 "instrumentation",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Instrument",
                     default=[],
@@ -2459,7 +2471,7 @@ voice_get = api.inherit(
             (
                 "musicial_function",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="MusikalischeFunktion",
                     default=[],
@@ -2467,10 +2479,10 @@ voice_get = api.inherit(
                     description='Alles, was zutrifft, auswählen, insbesondere auch redundante Optionen (z.B. "spielt Begleitung" und "spielt folgende Begleitfigur", etc.).',
                 ),
             ),
-            ("share", fields.Nested(taxonomy_item_get, taxonomy="Anteil")),
+            ("share", TaxonomyItemNested(taxonomy_item_get, taxonomy="Anteil")),
             (
                 "occurence_in_part",
-                fields.Nested(taxonomy_item_get, taxonomy="AuftretenWerkausschnitt"),
+                TaxonomyItemNested(taxonomy_item_get, taxonomy="AuftretenWerkausschnitt"),
             ),
             ("satz", fields.Nested(satz_get, description="Satz")),
             (
@@ -2487,7 +2499,7 @@ voice_get = api.inherit(
             (
                 "dominant_note_values",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Notenwert",
                     default=[],
@@ -2509,7 +2521,7 @@ voice_get = api.inherit(
             (
                 "musicial_figures",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="MusikalischeWendung",
                     default=[],
@@ -2529,17 +2541,22 @@ voice_get = api.inherit(
             (
                 "ornaments",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Verzierung",
                     default=[],
                 ),
             ),
-            ("melody_form", fields.Nested(taxonomy_item_get, taxonomy="Melodieform")),
+            (
+                "melody_form",
+                TaxonomyItemNested(taxonomy_item_get, taxonomy="Melodieform"),
+            ),
             (
                 "intervallik",
                 fields.List(
-                    fields.Nested(taxonomy_item_get), isArray=True, taxonomy="Intervallik"
+                    TaxonomyItemNested(taxonomy_item_get),
+                    isArray=True,
+                    taxonomy="Intervallik",
                 ),
             ),
             (
@@ -2599,13 +2616,13 @@ subpart_get = api.inherit(
             ("_links", NestedFields(subpart_links)),
             (
                 "occurence_in_part",
-                fields.Nested(taxonomy_item_get, taxonomy="AuftretenWerkausschnitt"),
+                TaxonomyItemNested(taxonomy_item_get, taxonomy="AuftretenWerkausschnitt"),
             ),
-            ("share_of_part", fields.Nested(taxonomy_item_get, taxonomy="Anteil")),
+            ("share_of_part", TaxonomyItemNested(taxonomy_item_get, taxonomy="Anteil")),
             (
                 "instrumentation",
                 fields.List(
-                    fields.Nested(taxonomy_item_get),
+                    TaxonomyItemNested(taxonomy_item_get),
                     isArray=True,
                     taxonomy="Instrument",
                     default=[],
@@ -2677,7 +2694,7 @@ opus_put = api.inherit(
             ),
             (
                 "genre",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="GattungNineteenthCentury",
                     required=True,
@@ -2686,7 +2703,7 @@ opus_put = api.inherit(
             ),
             (
                 "grundton",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="Grundton",
                     required=True,
@@ -2695,7 +2712,7 @@ opus_put = api.inherit(
             ),
             (
                 "tonalitaet",
-                fields.Nested(
+                TaxonomyItemRef(
                     taxonomy_item_ref,
                     taxonomy="Tonalitaet",
                     description="Hier nur ein Tongeschlecht eintragen (in der Regel das der Anfangs- und Schlusstonika).",
@@ -2785,9 +2802,9 @@ opus_small = api.inherit(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             ("_links", NestedFields(opus_links)),
             ("composer", fields.Nested(person_get)),
-            ("genre", fields.Nested(taxonomy_item_get)),
-            ("grundton", fields.Nested(taxonomy_item_get)),
-            ("tonalitaet", fields.Nested(taxonomy_item_get)),
+            ("genre", TaxonomyItemNested(taxonomy_item_get)),
+            ("grundton", TaxonomyItemNested(taxonomy_item_get)),
+            ("tonalitaet", TaxonomyItemNested(taxonomy_item_get)),
         ]
     ),
 )
@@ -2885,6 +2902,25 @@ history_voice_get = api.inherit(
     ),
 )
 
+history_taxonomy_item_get = api.inherit(
+    "HistoryTaxonomyItemGET",
+    history_object_get,
+    OrderedDict(
+        [
+            ("id", fields.Integer(default=1, readonly=True, example=1)),
+            ("taxonomy", fields.String(readonly=True, example="Instrument")),
+            ("name", fields.String(readonly=True)),
+            (
+                "merged_id",
+                fields.Integer(
+                    readonly=True,
+                    description="The id of the item merged into this item.",
+                ),
+            ),
+        ]
+    ),
+)
+
 history_get = api.model(
     "HistoryGET",
     OrderedDict(
@@ -2892,11 +2928,15 @@ history_get = api.model(
             ("id", fields.Integer(default=1, readonly=True, example=1)),
             ("time", fields.DateTime(readonly=True)),
             ("username", fields.String(attribute="user.username", readonly=True)),
-            ("method", EnumField(enum=["create", "update", "delete"], readonly=True)),
+            (
+                "method",
+                EnumField(enum=["create", "update", "delete", "merge"], readonly=True),
+            ),
             (
                 "type",
                 EnumField(
-                    enum=["person", "opus", "part", "subpart", "voice"], readonly=True
+                    enum=["person", "opus", "part", "subpart", "voice", "taxonomy"],
+                    readonly=True,
                 ),
             ),
             (
@@ -2908,6 +2948,7 @@ history_get = api.model(
                         Part: history_part_get,
                         SubPart: history_subpart_get,
                         Voice: history_voice_get,
+                        HistoryTaxonomyItem: history_taxonomy_item_get,
                     }
                 ),
             ),
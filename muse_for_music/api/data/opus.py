@@ -5,7 +5,7 @@ from json import dumps
 
 from flask import request
 from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
-from flask_restx import Resource, marshal
+from flask_restx import Resource
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.sql import delete, select
 
@@ -14,6 +14,7 @@ from ...models.data.history import Backup, History, MethodEnum, TypeEnum
 from ...models.data.opus import Opus
 from ...models.data.part import Part
 from ...models.users import User
+from ...performance import timed_marshal
 from ...user_api import RoleEnum, has_roles
 from ...util import abort
 from . import api
@@ -52,7 +53,7 @@ class OpusListResource(Resource):
             hist = History(MethodEnum.create, new_opus)
             db.session.add(hist)
             db.session.commit()
-            return marshal(new_opus, opus_small_get)
+            return timed_marshal(new_opus, opus_small_get)
         except IntegrityError as err:
             db.session.rollback()
             if hasattr(err, "orig"):
@@ -66,6 +67,11 @@ class OpusListResource(Resource):
 @ns.route("/<int:id>/")
 class OpusResource(Resource):
 
+    @ns.param(
+        "expand",
+        'Use "taxonomy_paths" to add the ancestor path to all tree taxonomy items.',
+        _in="query",
+    )
     @ns.marshal_with(opus_small_get)
     @ns.response(HTTPStatus.NOT_FOUND, "Opus not found.")
     @jwt_required()
@@ -99,7 +105,7 @@ class OpusResource(Resource):
             hist = History(MethodEnum.update, opus, user)
             db.session.add(hist)
             db.session.commit()
-            return marshal(opus, opus_small_get)
+            return timed_marshal(opus, opus_small_get)
         except IntegrityError as err:
             db.session.rollback()
             if hasattr(err, "orig"):
@@ -152,4 +158,4 @@ class OpusPartsResource(Resource):
         hist = History(MethodEnum.create, new_part)
         db.session.add(hist)
         db.session.commit()
-        return marshal(new_part, part_get)
+        return timed_marshal(new_part, part_get)
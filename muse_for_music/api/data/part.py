@@ -5,7 +5,7 @@ from json import dumps
 
 from flask import request
 from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
-from flask_restx import Resource, marshal
+from flask_restx import Resource
 from sqlalchemy.sql import delete
 
 from ... import db
@@ -13,6 +13,7 @@ from ...models.data.history import Backup, History, MethodEnum, TypeEnum
 from ...models.data.part import Part
 from ...models.data.subpart import SubPart
 from ...models.users import User
+from ...performance import timed_marshal
 from ...user_api import RoleEnum, has_roles
 from ...util import abort
 from . import api
@@ -43,6 +44,11 @@ class PartsListResource(Resource):
 @ns.route("/<int:id>/")
 class PartResource(Resource):
 
+    @ns.param(
+        "expand",
+        'Use "taxonomy_paths" to add the ancestor path to all tree taxonomy items.',
+        _in="query",
+    )
     @ns.marshal_with(part_small_get)
     @ns.response(HTTPStatus.NOT_FOUND, "Part not found.")
     @jwt_required()
@@ -77,7 +83,7 @@ class PartResource(Resource):
         db.session.add(hist)
 
         db.session.commit()
-        return marshal(part, part_get)
+        return timed_marshal(part, part_get)
 
     @ns.response(HTTPStatus.NOT_FOUND, "Part not found.")
     @jwt_required()
@@ -121,4 +127,4 @@ class PartSubpartsResource(Resource):
         hist = History(MethodEnum.create, new_subpart)
         db.session.add(hist)
         db.session.commit()
-        return marshal(new_subpart, subpart_get)
+        return timed_marshal(new_subpart, subpart_get)
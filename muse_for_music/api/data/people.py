@@ -5,7 +5,7 @@ from json import dumps
 
 from flask import request
 from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Resource, marshal
+from flask_restx import Resource
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.sql import delete, select
 
@@ -14,10 +14,14 @@ from ...models.data.citations import PersonToCitations
 from ...models.data.history import Backup, History, MethodEnum, TypeEnum
 from ...models.data.opus import Opus
 from ...models.data.people import GenderEnum, Person
+from ...models.taxonomies.version import get_taxonomy_versions
 from ...models.users import User
+from ...performance import timed_marshal
 from ...user_api import RoleEnum, has_roles
 from ...util import abort
 from .. import api
+from ..autocomplete import AutocompleteEntry, get_autocomplete_indexes
+from ..models import autocomplete_match
 from .backup import to_backup_json
 from .models import person_get, person_post, person_put
 
@@ -69,7 +73,7 @@ class PersonListResource(Resource):
             hist = History(MethodEnum.create, new_person)
             db.session.add(hist)
             db.session.commit()
-            return marshal(new_person, person_get)
+            return timed_marshal(new_person, person_get)
         except IntegrityError as err:
             db.session.rollback()
             message = str(err)
@@ -78,6 +82,33 @@ class PersonListResource(Resource):
             abort(HTTPStatus.INTERNAL_SERVER_ERROR, str(err))
 
 
+def person_autocomplete_entries():
+    q = select(Person.id, Person.name).where(Person.name.is_not(None))
+    return [
+        AutocompleteEntry(person_id, name) for person_id, name in db.session.execute(q)
+    ]
+
+
+@ns.route("/autocomplete/")
+class PersonAutocompleteResource(Resource):
+
+    @ns.param("q", "The start of the name (or of a word in the name).", _in="query")
+    @ns.param(
+        "limit", "The maximum number of persons. (Default: 10, Max: 50)", _in="query"
+    )
+    @ns.marshal_list_with(autocomplete_match)
+    @jwt_required()
+    def get(self):
+        limit = min(max(request.args.get("limit", 10, type=int), 1), 50)
+        index = get_autocomplete_indexes().get(
+            "person",
+            get_taxonomy_versions().get("Person", 0),
+            person_autocomplete_entries,
+        )
+        matches = index.search(request.args.get("q", ""), limit)
+        return [match._asdict() for match in matches]
+
+
 @ns.route("/<int:id>/")
 class PersonResource(Resource):
 
@@ -130,7 +161,7 @@ class PersonResource(Resource):
         hist = History(MethodEnum.update, person, user)
         db.session.add(hist)
         db.session.commit()
-        return marshal(person, person_get)
+        return timed_marshal(person, person_get)
 
     @ns.response(HTTPStatus.NOT_FOUND, "Person not found.")
     @jwt_required()
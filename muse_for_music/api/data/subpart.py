@@ -5,7 +5,7 @@ from json import dumps
 
 from flask import request
 from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
-from flask_restx import Resource, marshal
+from flask_restx import Resource
 from sqlalchemy.sql import delete
 
 from ... import db
@@ -13,6 +13,7 @@ from ...models.data.history import Backup, History, MethodEnum, TypeEnum
 from ...models.data.subpart import SubPart
 from ...models.data.voice import Voice
 from ...models.users import User
+from ...performance import timed_marshal
 from ...user_api import RoleEnum, has_roles
 from ...util import abort
 from . import api
@@ -43,6 +44,11 @@ class SubPartListResource(Resource):
 @ns.route("/<int:subpart_id>/")
 class SubPartResource(Resource):
 
+    @ns.param(
+        "expand",
+        'Use "taxonomy_paths" to add the ancestor path to all tree taxonomy items.',
+        _in="query",
+    )
     @ns.marshal_with(subpart_get)
     @ns.response(HTTPStatus.NOT_FOUND, "Subpart not found.")
     @jwt_required()
@@ -79,7 +85,7 @@ class SubPartResource(Resource):
         db.session.add(hist)
 
         db.session.commit()
-        return marshal(subpart, subpart_get)
+        return timed_marshal(subpart, subpart_get)
 
     @ns.response(HTTPStatus.NOT_FOUND, "Subpart not found.")
     @jwt_required()
@@ -134,12 +140,17 @@ class SubPartVoiceListResource(Resource):
         hist = History(MethodEnum.create, new_voice)
         db.session.add(hist)
         db.session.commit()
-        return marshal(new_voice, voice_get)
+        return timed_marshal(new_voice, voice_get)
 
 
 @ns.route("/<int:subpart_id>/voices/<int:voice_id>/")
 class SubPartVoiceResource(Resource):
 
+    @ns.param(
+        "expand",
+        'Use "taxonomy_paths" to add the ancestor path to all tree taxonomy items.',
+        _in="query",
+    )
     @ns.marshal_with(voice_get)
     @ns.response(HTTPStatus.NOT_FOUND, "voice not found.")
     @jwt_required()
@@ -175,7 +186,7 @@ class SubPartVoiceResource(Resource):
         hist = History(MethodEnum.update, voice, user)
         db.session.add(hist)
         db.session.commit()
-        return marshal(voice, voice_get)
+        return timed_marshal(voice, voice_get)
 
     @ns.response(HTTPStatus.NOT_FOUND, "voice not found.")
     @jwt_required()
@@ -1,5 +1,7 @@
 """Module containing models for whole API to use."""
 
+from flask_restx import fields
+
 from ..hal_field import HaLUrl, NestedFields, UrlData
 from . import api
 
@@ -38,3 +40,58 @@ root_model = api.model(
         "_links": NestedFields(root_links),
     },
 )
+
+autocomplete_match = api.model(
+    "AutocompleteMatch",
+    {
+        "id": fields.Integer(readonly=True, example=1),
+        "name": fields.String(readonly=True),
+        "path": fields.List(
+            fields.String(),
+            readonly=True,
+            description="Names of the ancestors of a tree taxonomy item (top down).",
+        ),
+    },
+)
+
+query_fingerprint = api.model(
+    "QueryFingerprint",
+    {
+        "fingerprint": fields.String(readonly=True, description="The normalized sql."),
+        "count": fields.Integer(readonly=True, description="Executions in the request."),
+        "duration": fields.Float(readonly=True, description="Total duration in seconds."),
+    },
+)
+
+slow_request = api.model(
+    "SlowRequest",
+    {
+        "id": fields.Integer(readonly=True),
+        "time": fields.DateTime(readonly=True),
+        "endpoint": fields.String(readonly=True),
+        "view": fields.String(readonly=True),
+        "method": fields.String(readonly=True),
+        "url": fields.String(readonly=True),
+        "status": fields.Integer(readonly=True),
+        "duration": fields.Float(readonly=True, description="Duration in seconds."),
+        "query_count": fields.Integer(readonly=True),
+        "write_count": fields.Integer(readonly=True),
+        "query_duration": fields.Float(readonly=True),
+        "top_queries": fields.List(fields.Nested(query_fingerprint), readonly=True),
+    },
+)
+
+slow_endpoint = api.model(
+    "SlowEndpoint",
+    {
+        "endpoint": fields.String(readonly=True),
+        "method": fields.String(readonly=True),
+        "count": fields.Integer(readonly=True, description="Number of slow requests."),
+        "duration_p50": fields.Float(readonly=True),
+        "duration_p95": fields.Float(readonly=True),
+        "duration_max": fields.Float(readonly=True),
+        "query_count_avg": fields.Float(readonly=True),
+        "query_count_max": fields.Integer(readonly=True),
+        "last_seen": fields.DateTime(readonly=True),
+    },
+)
@@ -0,0 +1,105 @@
+"""Module containing the admin API for slow requests and request profiles."""
+
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+from flask import Response, current_app, request
+from flask_jwt_extended import jwt_required
+from flask_restx import Resource
+
+from ..profiling import get_profile_summary
+from ..slow_requests import get_slow_request_store
+from ..user_api import RoleEnum, has_roles
+from ..util import abort
+from . import api
+from .models import slow_endpoint, slow_request
+
+ns = api.namespace(
+    "performance",
+    description="Resource for slow requests and request profiles.",
+    path="/performance",
+)
+
+
+def time_arg(name: str) -> datetime | None:
+    """Parse an ISO 8601 time query parameter (UTC if no timezone is given)."""
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        abort(HTTPStatus.BAD_REQUEST, 'Malformed time "{}"!'.format(value))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def check_store_enabled():
+    if not current_app.config.get("SLOW_REQUEST_STORE", True):
+        abort(HTTPStatus.NOT_FOUND, "The slow request store is disabled.")
+
+
+@ns.route("/slow-requests/")
+class SlowRequestListResource(Resource):
+
+    @ns.param("endpoint", "Only requests of this flask endpoint.", _in="query")
+    @ns.param("since", "Only requests after this time (ISO 8601).", _in="query")
+    @ns.param("until", "Only requests before this time (ISO 8601).", _in="query")
+    @ns.param(
+        "percentile",
+        "Only requests at or above this duration percentile (0-100).",
+        _in="query",
+    )
+    @ns.param(
+        "limit", "The maximum number of requests. (Default: 50, Max: 500)", _in="query"
+    )
+    @ns.marshal_list_with(slow_request)
+    @ns.response(HTTPStatus.BAD_REQUEST, "Malformed time or percentile.")
+    @ns.response(HTTPStatus.NOT_FOUND, "The slow request store is disabled.")
+    @jwt_required()
+    @has_roles([RoleEnum.admin])
+    def get(self):
+        check_store_enabled()
+        min_percentile = request.args.get("percentile", 0, type=float)
+        if not 0 <= min_percentile <= 100:
+            abort(HTTPStatus.BAD_REQUEST, "The percentile must be between 0 and 100!")
+        return get_slow_request_store().get_requests(
+            endpoint=request.args.get("endpoint"),
+            since=time_arg("since"),
+            until=time_arg("until"),
+            min_percentile=min_percentile,
+            limit=min(max(request.args.get("limit", 50, type=int), 1), 500),
+        )
+
+
+@ns.route("/endpoints/")
+class SlowEndpointListResource(Resource):
+
+    @ns.param("since", "Only requests after this time (ISO 8601).", _in="query")
+    @ns.param("until", "Only requests before this time (ISO 8601).", _in="query")
+    @ns.marshal_list_with(slow_endpoint)
+    @ns.response(HTTPStatus.BAD_REQUEST, "Malformed time.")
+    @ns.response(HTTPStatus.NOT_FOUND, "The slow request store is disabled.")
+    @jwt_required()
+    @has_roles([RoleEnum.admin])
+    def get(self):
+        check_store_enabled()
+        return get_slow_request_store().get_endpoint_summaries(
+            since=time_arg("since"), until=time_arg("until")
+        )
+
+
+@ns.route("/profiles/<string:profile_id>/")
+class RequestProfileResource(Resource):
+
+    @ns.produces(["text/plain"])
+    @ns.response(HTTPStatus.OK, "The text summary of the profile.")
+    @ns.response(HTTPStatus.NOT_FOUND, "Profile not found.")
+    @jwt_required()
+    @has_roles([RoleEnum.admin])
+    def get(self, profile_id: str):
+        summary = get_profile_summary(profile_id)
+        if summary is None:
+            abort(HTTPStatus.NOT_FOUND, "Profile not found.")
+        return Response(summary, mimetype="text/plain")
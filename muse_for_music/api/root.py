@@ -1,13 +1,12 @@
 """Module containing the root resource of the API."""
 
-from flask_restx import marshal
-
+from ..performance import timed_marshal
 from . import api
 from .models import root_model
 
 
 def render_root_custom():
-    return marshal(None, root_model)
+    return timed_marshal(None, root_model)
 
 
 api.render_root = render_root_custom  # type: ignore
@@ -1,32 +1,59 @@
 """Module containing API Endpoints for Taxonomy Resources."""
 
 from http import HTTPStatus
-from typing import Dict, Type
+from typing import Dict, List, Type
 
 from flask import current_app, request
 from flask_jwt_extended import jwt_required
-from flask_restx import Resource, marshal
-from sqlalchemy.exc import IntegrityError
+from flask_restx import Resource
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.sql import select
 
 from ... import db
-from ...models.taxonomies import Taxonomy, get_taxonomies
+from ...models.data.history import History, MethodEnum
+from ...models.taxonomies import Taxonomy, TreeTaxonomy, get_taxonomies
+from ...models.taxonomies.bulk import insert_tree_items
+from ...models.taxonomies.journal import get_taxonomy_delta
+from ...models.taxonomies.merge import merge_taxonomy_items
+from ...models.taxonomies.usage import (
+    get_item_usages,
+    get_taxonomy_references,
+    get_usage_counts,
+)
+from ...performance import timed_marshal
 from ...user_api import RoleEnum, has_roles
 from ...util import abort
 from .. import api
+from ..autocomplete import AutocompleteEntry, get_autocomplete_indexes
+from ..models import autocomplete_match
 
 ns = api.namespace("taxonomies", description="All Taxonomies.")
 
 from .models import (  # noqa: E402
     list_taxonomy_model,
+    taxonomy_bundle_json,
+    taxonomy_changes,
     taxonomy_item_get,
+    taxonomy_item_merge,
+    taxonomy_item_merge_post,
     taxonomy_item_post,
+    taxonomy_item_where_used,
     taxonomy_list_resource,
     taxonomy_model,
+    taxonomy_tree_item_batch,
+    taxonomy_tree_item_batch_post,
     taxonomy_tree_item_get,
     taxonomy_tree_item_get_json,
+    taxonomy_tree_item_lazy_get,
+    taxonomy_usage,
     tree_taxonomy_model,
     tree_taxonomy_model_json,
 )
+from .cache import (  # noqa: E402
+    TAXONOMY_MODELS,
+    cached_taxonomy_response,
+    taxonomy_bundle_response,
+)
 
 taxonomies: Dict[str, Type[Taxonomy]] = get_taxonomies()
 
@@ -41,11 +68,61 @@ class TaxonomyListResource(Resource):
         return {"taxonomies": taxonomy_list}
 
 
-def get_taxonomy(taxonomy_type: str, taxonomy_name: str) -> Type[Taxonomy]:
+@ns.route("/bundle/")
+class TaxonomyBundleResource(Resource):
+
+    @ns.param(
+        "taxonomies",
+        "Comma separated list of taxonomy names. (Default: all taxonomies)",
+        _in="query",
+    )
+    @ns.param(
+        "versions",
+        "Comma separated list of taxonomy versions known by the client "
+        '(e.g. "Instrument:3,Anteil:1"). Known taxonomies are left out of the '
+        "bundle if the version did not change.",
+        _in="query",
+    )
+    @ns.response(HTTPStatus.OK, "success", taxonomy_bundle_json)
+    @ns.response(HTTPStatus.NOT_MODIFIED, "No taxonomy was modified.")
+    @ns.response(HTTPStatus.BAD_REQUEST, "Malformed versions parameter.")
+    @ns.response(HTTPStatus.NOT_FOUND, "Taxonomy not found.")
+    @jwt_required()
+    def get(self):
+        names = request.args.get("taxonomies", "")
+        selected = list(taxonomies.values())
+        if names:
+            selected = [
+                get_taxonomy_by_name(name.strip())
+                for name in names.split(",")
+                if name.strip()
+            ]
+        known_versions: Dict[str, int] = {}
+        for known in request.args.get("versions", "").split(","):
+            if not known.strip():
+                continue
+            name, _, version = known.strip().rpartition(":")
+            if not name or not version.isdigit():
+                abort(
+                    HTTPStatus.BAD_REQUEST,
+                    'Malformed taxonomy version "{}"!'.format(known),
+                )
+            known_versions[get_taxonomy_by_name(name).__name__] = int(version)
+        return taxonomy_bundle_response(
+            [(tax, TAXONOMY_MODELS[tax.taxonomy_type]) for tax in selected],
+            known_versions,
+        )
+
+
+def get_taxonomy_by_name(taxonomy_name: str) -> Type[Taxonomy]:
     taxonomy_name = taxonomy_name.upper()
     if taxonomy_name not in taxonomies:
         abort(HTTPStatus.NOT_FOUND, "The reqested Taxonomy could not be found.")
-    taxonomy: Type[Taxonomy] = taxonomies[taxonomy_name]
+    return taxonomies[taxonomy_name]
+
+
+def get_taxonomy(taxonomy_type: str, taxonomy_name: str) -> Type[Taxonomy]:
+    taxonomy = get_taxonomy_by_name(taxonomy_name)
     if taxonomy_type != taxonomy.taxonomy_type:
         abort(
             HTTPStatus.BAD_REQUEST,
@@ -57,18 +134,21 @@ def get_taxonomy(taxonomy_type: str, taxonomy_name: str) -> Type[Taxonomy]:
 @ns.route("/<string:taxonomy_type>/<string:taxonomy>/", doc=False)
 class TaxonomyResource(Resource):
 
-    @ns.marshal_with(taxonomy_model)
+    @ns.response(HTTPStatus.OK, "success", taxonomy_model)
+    @ns.response(HTTPStatus.NOT_MODIFIED, "Taxonomy not modified.")
     @ns.response(HTTPStatus.BAD_REQUEST, "Mismatching taxonomy type.")
     @ns.response(HTTPStatus.NOT_FOUND, "Taxonomy not found.")
     @jwt_required()
     def get(self, taxonomy_type: str, taxonomy: str):
-        return get_taxonomy(taxonomy_type, taxonomy)
+        tax = get_taxonomy(taxonomy_type, taxonomy)
+        return cached_taxonomy_response(tax, taxonomy_model)
 
 
 @ns.route("/list/<string:taxonomy>/")
 class ListTaxonomyResource(Resource):
 
-    @ns.marshal_with(list_taxonomy_model)
+    @ns.response(HTTPStatus.OK, "success", list_taxonomy_model)
+    @ns.response(HTTPStatus.NOT_MODIFIED, "Taxonomy not modified.")
     @ns.response(HTTPStatus.BAD_REQUEST, "Mismatching taxonomy type.")
     @ns.response(HTTPStatus.NOT_FOUND, "Taxonomy not found.")
     @jwt_required()
@@ -76,7 +156,7 @@ class ListTaxonomyResource(Resource):
         tax = get_taxonomy("list", taxonomy)
         if tax is None:
             abort(HTTPStatus.NOT_FOUND, 'Taxonomy "{}" not found.'.format(taxonomy))
-        return tax
+        return cached_taxonomy_response(tax, list_taxonomy_model)
 
     @ns.doc(model=taxonomy_item_get, expect=[taxonomy_item_post], validate=True)
     @jwt_required()
@@ -90,13 +170,14 @@ class ListTaxonomyResource(Resource):
         item = create_taxonomy_item(tax, item_data)
         db.session.add(item)
         db.session.commit()
-        return marshal(item, taxonomy_item_get)
+        return timed_marshal(item, taxonomy_item_get)
 
 
 @ns.route("/tree/<string:taxonomy>/")
 class TreeTaxonomyResource(Resource):
 
     @ns.response(HTTPStatus.OK, "success", tree_taxonomy_model_json)
+    @ns.response(HTTPStatus.NOT_MODIFIED, "Taxonomy not modified.")
     @ns.response(HTTPStatus.BAD_REQUEST, "Mismatching taxonomy type.")
     @ns.response(HTTPStatus.NOT_FOUND, "Taxonomy not found.")
     @jwt_required()
@@ -104,7 +185,7 @@ class TreeTaxonomyResource(Resource):
         tax = get_taxonomy("tree", taxonomy)
         if tax is None:
             abort(HTTPStatus.NOT_FOUND, 'Taxonomy "{}" not found.'.format(taxonomy))
-        return marshal(tax, tree_taxonomy_model)
+        return cached_taxonomy_response(tax, tree_taxonomy_model)
 
 
 def get_taxonomy_item(tax: Type[Taxonomy], item_id) -> Taxonomy:
@@ -127,6 +208,7 @@ def create_taxonomy_item(tax: Type[Taxonomy], new_values) -> Taxonomy:
     new_values.pop("specifications", None)  # TODO remove
     item = tax(**new_values)
     db.session.add(item)
+    tax.mark_changed()
     return item
 
 
@@ -147,6 +229,7 @@ def edit_taxonomy_item(item: Taxonomy, new_values: Dict):
         item.description = new_values["description"]
     if "mapping" in new_values:
         item.mapping = new_values["mapping"]
+    type(item).mark_changed()
     db.session.commit()
 
 
@@ -163,6 +246,7 @@ def delete_taxonomy_item(taxonomy: Type[Taxonomy], item_id: int):
     if item.name == "na":
         abort(HTTPStatus.BAD_REQUEST, 'Can not delete "na"!')
     db.session.delete(item)
+    taxonomy.mark_changed()
     db.session.commit()
     current_app.logger.info("Taxonomy item %s deleted.", item)
 
@@ -193,7 +277,7 @@ class TaxonomyItemResource(Resource):
         item_data = request.get_json()
         item_data.pop("specifications", None)
         edit_taxonomy_item(item, item_data)
-        return marshal(item, taxonomy_item_get)
+        return timed_marshal(item, taxonomy_item_get)
 
     @ns.response(HTTPStatus.BAD_REQUEST, "Mismatching taxonomy type.")
     @ns.response(HTTPStatus.NOT_FOUND, "Taxonomy or Item not found.")
@@ -236,7 +320,7 @@ class ListTaxonomyItemResource(Resource):
         item_data = request.get_json()
         item_data.pop("specifications", None)
         edit_taxonomy_item(item, item_data)
-        return marshal(item, taxonomy_item_get)
+        return timed_marshal(item, taxonomy_item_get)
 
     @ns.response(HTTPStatus.BAD_REQUEST, "Mismatching taxonomy type.")
     @ns.response(HTTPStatus.NOT_FOUND, "Taxonomy or Item not found.")
@@ -256,15 +340,27 @@ class ListTaxonomyItemResource(Resource):
 @ns.route("/tree/<string:taxonomy>/<int:item_id>/")
 class TreeTaxonomyItemResource(Resource):
 
+    @ns.param(
+        "depth",
+        "Only return descendants up to this depth. Returned items get a child_count and a descendant_count. (Default: all descendants)",
+        _in="query",
+    )
     @ns.response(HTTPStatus.OK, "success", model=taxonomy_tree_item_get_json)
-    @ns.response(HTTPStatus.BAD_REQUEST, "Mismatching taxonomy type.")
+    @ns.response(HTTPStatus.BAD_REQUEST, "Mismatching taxonomy type or invalid depth.")
     @ns.response(HTTPStatus.NOT_FOUND, "Taxonomy or Item not found.")
     @jwt_required()
     def get(self, taxonomy: str, item_id: int):
         tax = get_taxonomy("tree", taxonomy)
         if tax is None:
             abort(HTTPStatus.NOT_FOUND, 'Taxonomy "{}" not found.'.format(taxonomy))
-        return marshal(get_taxonomy_item(tax, item_id), taxonomy_tree_item_get)
+        item = get_taxonomy_item(tax, item_id)
+        if "depth" in request.args:
+            depth = request.args.get("depth", type=int)
+            if depth is None or depth < 0:
+                abort(HTTPStatus.BAD_REQUEST, "The depth must be a positive integer!")
+            subtree = tax.get_subtree(item.id, depth)
+            return timed_marshal(subtree, taxonomy_tree_item_lazy_get)
+        return timed_marshal(tax.get_tree(item.id), taxonomy_tree_item_get)
 
     @ns.doc(model=taxonomy_tree_item_get_json, expect=[taxonomy_item_post], validate=True)
     @jwt_required()
@@ -281,7 +377,7 @@ class TreeTaxonomyItemResource(Resource):
         item = create_taxonomy_item(tax, new_item)
         db.session.add(item)
         db.session.commit()
-        return marshal(item, taxonomy_tree_item_get)
+        return timed_marshal(item, taxonomy_tree_item_get)
 
     @ns.response(HTTPStatus.BAD_REQUEST, "Mismatching taxonomy type.")
     @ns.response(HTTPStatus.NOT_FOUND, "Taxonomy or Item not found.")
@@ -296,7 +392,7 @@ class TreeTaxonomyItemResource(Resource):
         item_data = request.get_json()
         item_data.pop("specifications", None)
         edit_taxonomy_item(item, item_data)
-        return marshal(item, taxonomy_tree_item_get)
+        return timed_marshal(item, taxonomy_tree_item_get)
 
     @ns.response(HTTPStatus.BAD_REQUEST, "Mismatching taxonomy type.")
     @ns.response(HTTPStatus.NOT_FOUND, "Taxonomy or Item not found.")
@@ -314,3 +410,214 @@ class TreeTaxonomyItemResource(Resource):
                 HTTPStatus.BAD_REQUEST,
                 "The taxonomy item or one of its children is still in use!",
             )
+
+
+@ns.route("/tree/<string:taxonomy>/<int:item_id>/batch/")
+class TreeTaxonomyItemBatchResource(Resource):
+
+    @ns.doc(model=taxonomy_tree_item_batch)
+    @ns.expect([taxonomy_tree_item_batch_post], validate=False)
+    @ns.response(HTTPStatus.BAD_REQUEST, "Mismatching taxonomy type or invalid items.")
+    @ns.response(HTTPStatus.NOT_FOUND, "Taxonomy or Item not found.")
+    @ns.response(HTTPStatus.CONFLICT, "Items conflict with the current taxonomy.")
+    @jwt_required()
+    @has_roles([RoleEnum.taxonomy_editor])
+    def post(self, taxonomy: str, item_id: int):
+        tax = get_taxonomy("tree", taxonomy)
+        if tax is None:
+            abort(HTTPStatus.NOT_FOUND, 'Taxonomy "{}" not found.'.format(taxonomy))
+        parent = get_taxonomy_item(tax, item_id)
+        if parent.name == "na":
+            abort(HTTPStatus.BAD_REQUEST, 'Can not add items below "na"!')
+        items = request.get_json(silent=True)
+        if not isinstance(items, list):
+            abort(HTTPStatus.BAD_REQUEST, "Expected a list of items!")
+        try:
+            ids = insert_tree_items(tax, parent.id, items)
+            db.session.commit()
+        except ValueError as err:
+            db.session.rollback()
+            abort(HTTPStatus.BAD_REQUEST, str(err))
+        except DataError:
+            db.session.rollback()
+            abort(HTTPStatus.BAD_REQUEST, "The items contain invalid values!")
+        except IntegrityError:
+            db.session.rollback()
+            abort(HTTPStatus.CONFLICT, "The items conflict with the current taxonomy!")
+        current_app.logger.info(
+            "Added %d items below taxonomy item %s.", len(ids), parent
+        )
+        return timed_marshal({"parent": parent.id, "ids": ids}, taxonomy_tree_item_batch)
+
+
+@ns.route("/<string:taxonomy_type>/<string:taxonomy>/usage/")
+class TaxonomyUsageResource(Resource):
+
+    @ns.response(HTTPStatus.OK, "success", taxonomy_usage)
+    @ns.response(HTTPStatus.BAD_REQUEST, "Mismatching taxonomy type.")
+    @ns.response(HTTPStatus.NOT_FOUND, "Taxonomy not found.")
+    @jwt_required()
+    def get(self, taxonomy_type: str, taxonomy: str):
+        tax = get_taxonomy(taxonomy_type, taxonomy)
+        usage = get_usage_counts(tax)
+        items_q = select(tax.id, tax.name).order_by(tax.id)
+        items = []
+        for item_id, name in db.session.execute(items_q):
+            references = usage.get(item_id, {})
+            items.append(
+                {
+                    "id": item_id,
+                    "name": name,
+                    "usage_count": sum(references.values()),
+                    "references": references,
+                }
+            )
+        result = {
+            "taxonomy": tax.__name__,
+            "references": [ref.name for ref in get_taxonomy_references(tax)],
+            "items": items,
+        }
+        return timed_marshal(result, taxonomy_usage)
+
+
+@ns.route("/<string:taxonomy_type>/<string:taxonomy>/changes/")
+class TaxonomyChangesResource(Resource):
+
+    @ns.param("since", "The taxonomy version known by the client.", _in="query")
+    @ns.response(HTTPStatus.OK, "success", taxonomy_changes)
+    @ns.response(HTTPStatus.BAD_REQUEST, "Mismatching taxonomy type or invalid version.")
+    @ns.response(HTTPStatus.NOT_FOUND, "Taxonomy not found.")
+    @jwt_required()
+    def get(self, taxonomy_type: str, taxonomy: str):
+        tax = get_taxonomy(taxonomy_type, taxonomy)
+        since = request.args.get("since", type=int)
+        if since is None:
+            abort(HTTPStatus.BAD_REQUEST, "The since parameter must be an integer!")
+        delta = get_taxonomy_delta(tax, since)
+        columns = [tax.id, tax.name, tax.description]
+        if issubclass(tax, TreeTaxonomy):
+            columns.append(tax.parent_id)
+        items_q = select(*columns).order_by(tax.id)
+        if delta.complete:
+            items_q = items_q.where(tax.id.in_(delta.changed))
+        items = (
+            db.session.execute(items_q).mappings().all()
+            if delta.changed or not delta.complete
+            else []
+        )
+        result = {
+            "taxonomy": tax.__name__,
+            "taxonomy_type": tax.taxonomy_type,
+            "since": since,
+            "version": delta.version,
+            "snapshot": not delta.complete,
+            "items": items,
+            "deleted": delta.deleted,
+        }
+        return timed_marshal(result, taxonomy_changes)
+
+
+@ns.route("/<string:taxonomy_type>/<string:taxonomy>/<int:item_id>/usage/")
+class TaxonomyItemUsageResource(Resource):
+
+    @ns.param("page", "The page to return. (Default: 1)", _in="query")
+    @ns.param(
+        "page_size",
+        "The number of references per page. (Default: 50, Max: 500)",
+        _in="query",
+    )
+    @ns.response(HTTPStatus.OK, "success", taxonomy_item_where_used)
+    @ns.response(HTTPStatus.BAD_REQUEST, "Mismatching taxonomy type.")
+    @ns.response(HTTPStatus.NOT_FOUND, "Taxonomy or Item not found.")
+    @jwt_required()
+    def get(self, taxonomy_type: str, taxonomy: str, item_id: int):
+        tax = get_taxonomy(taxonomy_type, taxonomy)
+        item = get_taxonomy_item(tax, item_id)
+        page = max(request.args.get("page", 1, type=int), 1)
+        page_size = min(max(request.args.get("page_size", 50, type=int), 1), 500)
+        total, references = get_item_usages(
+            tax, item.id, offset=(page - 1) * page_size, limit=page_size
+        )
+        result = {
+            "id": item.id,
+            "usage_count": total,
+            "page": page,
+            "page_size": page_size,
+            "references": references,
+        }
+        return timed_marshal(result, taxonomy_item_where_used)
+
+
+@ns.route("/<string:taxonomy_type>/<string:taxonomy>/<int:item_id>/merge/")
+class TaxonomyItemMergeResource(Resource):
+
+    @ns.doc(model=taxonomy_item_merge, expect=[taxonomy_item_merge_post], validate=True)
+    @ns.response(HTTPStatus.BAD_REQUEST, "Items can not be merged.")
+    @ns.response(HTTPStatus.NOT_FOUND, "Taxonomy or Item not found.")
+    @jwt_required()
+    @has_roles([RoleEnum.admin])
+    def post(self, taxonomy_type: str, taxonomy: str, item_id: int):
+        tax = get_taxonomy(taxonomy_type, taxonomy)
+        item = get_taxonomy_item(tax, item_id)
+        target = get_taxonomy_item(tax, request.get_json()["target"])
+        if item.name in ("root", "na"):
+            abort(HTTPStatus.BAD_REQUEST, 'Can not merge "{}"!'.format(item.name))
+        if target.name == "root":
+            abort(HTTPStatus.BAD_REQUEST, 'Can not merge into "root"!')
+        try:
+            result = merge_taxonomy_items(tax, item.id, target.id)
+            db.session.add(
+                History(MethodEnum.merge, target, details={"merged_id": item.id})
+            )
+            db.session.commit()
+        except ValueError as err:
+            db.session.rollback()
+            abort(HTTPStatus.BAD_REQUEST, str(err))
+        except IntegrityError:
+            db.session.rollback()
+            abort(HTTPStatus.BAD_REQUEST, "The items could not be merged!")
+        current_app.logger.info("Taxonomy item %s merged into %s.", item_id, target)
+        return timed_marshal(
+            {"id": item_id, "target": target, **result._asdict()}, taxonomy_item_merge
+        )
+
+
+def taxonomy_autocomplete_entries(tax: Type[Taxonomy]) -> List[AutocompleteEntry]:
+    """Get the selectable items of a taxonomy with their ancestor paths."""
+    if not issubclass(tax, TreeTaxonomy):
+        q = select(tax.id, tax.name)
+        return [
+            AutocompleteEntry(item_id, name) for item_id, name in db.session.execute(q)
+        ]
+    entries = []
+    stack = [(node, ()) for node in tax.get_nodes().values() if node.parent is None]
+    while stack:
+        node, path = stack.pop()
+        if node.parent is None and node.name == "root":
+            child_path = ()
+        else:
+            entries.append(AutocompleteEntry(node.id, node.name, path))
+            child_path = (*path, node.name)
+        stack.extend((child, child_path) for child in node.children)
+    return entries
+
+
+@ns.route("/<string:taxonomy_type>/<string:taxonomy>/autocomplete/")
+class TaxonomyAutocompleteResource(Resource):
+
+    @ns.param("q", "The start of the item name (or of a word in the name).", _in="query")
+    @ns.param("limit", "The maximum number of items. (Default: 10, Max: 50)", _in="query")
+    @ns.marshal_list_with(autocomplete_match)
+    @ns.response(HTTPStatus.BAD_REQUEST, "Mismatching taxonomy type.")
+    @ns.response(HTTPStatus.NOT_FOUND, "Taxonomy not found.")
+    @jwt_required()
+    def get(self, taxonomy_type: str, taxonomy: str):
+        tax = get_taxonomy(taxonomy_type, taxonomy)
+        limit = min(max(request.args.get("limit", 10, type=int), 1), 50)
+        index = get_autocomplete_indexes().get(
+            "taxonomy:" + tax.__name__,
+            tax.get_version(),
+            lambda: taxonomy_autocomplete_entries(tax),
+        )
+        matches = index.search(request.args.get("q", ""), limit)
+        return [match._asdict() for match in matches]
@@ -0,0 +1,238 @@
+"""Module containing the response cache for taxonomy resources."""
+
+from functools import partial
+from hashlib import sha1
+from http import HTTPStatus
+from threading import Lock
+from typing import Dict, Sequence, Tuple, Type
+
+from flask import Response, current_app, request
+from flask_restx import Model
+from flask_restx.representations import output_json
+
+from ...models.taxonomies import Taxonomy, get_taxonomies
+from ...performance import request_phase, timed_marshal
+from .models import list_taxonomy_model, tree_taxonomy_model
+from .snapshot import SnapshotSources, get_taxonomy_snapshots, iter_chunks
+
+CacheKey = Tuple[str, str, str]
+
+TAXONOMY_MODELS = {
+    "list": list_taxonomy_model,
+    "tree": tree_taxonomy_model,
+}
+
+
+class TaxonomyResponseCache:
+    """Cache for fully encoded taxonomy responses.
+
+    Entries are stored together with the taxonomy version they were built
+    from. An entry is only returned while its version matches the current
+    taxonomy version, so bumping the version invalidates all entries of a
+    taxonomy.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._entries: Dict[CacheKey, Tuple[int, bytes]] = {}
+
+    def get(self, key: CacheKey, version: int) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def put(self, key: CacheKey, version: int, data: bytes):
+        with self._lock:
+            old_entry = self._entries.get(key)
+            if old_entry is not None and old_entry[0] > version:
+                return  # never replace a newer entry
+            self._entries[key] = (version, data)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def get_taxonomy_cache() -> TaxonomyResponseCache:
+    """Get the taxonomy response cache of the current app."""
+    cache = current_app.extensions.get("m4m_taxonomy_cache")
+    if cache is None:
+        cache = TaxonomyResponseCache()
+        current_app.extensions["m4m_taxonomy_cache"] = cache
+    return cache
+
+
+def encode_json(data) -> bytes:
+    """Encode data exactly like the json representation of the api does."""
+    with request_phase("json"):
+        return output_json(data, HTTPStatus.OK).get_data()
+
+
+def taxonomy_etag(key: CacheKey, version: int) -> str:
+    """Get the strong etag of a taxonomy response for the given version."""
+    etag_source = "{}:{}".format(":".join(key), version)
+    return sha1(etag_source.encode()).hexdigest()
+
+
+def cached_taxonomy_response(tax: Type[Taxonomy], model: Model) -> Response:
+    """Get the marshalled taxonomy as json response.
+
+    The encoded response is served from the cache if the taxonomy did not
+    change since it was built. The response carries an etag derived from the
+    taxonomy version. If the etag matches the If-None-Match header a 304
+    response is returned without loading the taxonomy.
+
+    Arguments:
+        tax: Type[Taxonomy] -- The taxonomy to marshal.
+        model: Model -- The api model to marshal the taxonomy with.
+
+    Returns:
+        Response -- The json response.
+    """
+    mask_header = current_app.config.get("RESTX_MASK_HEADER", "X-Fields")
+    if request.headers.get(mask_header):
+        # masked responses are rare and not worth caching
+        mask = request.headers.get(mask_header)
+        data = encode_json(timed_marshal(tax, model, mask=mask))
+        return Response(data, mimetype="application/json")
+
+    key = taxonomy_cache_key(tax, model)
+    version = tax.get_version()
+    etag = taxonomy_etag(key, version)
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=HTTPStatus.NOT_MODIFIED)
+    else:
+        response = encoded_response(get_encoded_taxonomy(tax, model, version))
+    return with_revalidation(response, etag)
+
+
+def encoded_response(data: bytes | memoryview) -> Response:
+    """Create the json response, views of the snapshot are streamed."""
+    if isinstance(data, bytes):
+        return Response(data, mimetype="application/json")
+    response = Response(iter_chunks(data), mimetype="application/json")
+    response.content_length = len(data)
+    return response
+
+
+def taxonomy_cache_key(tax: Type[Taxonomy], model: Model) -> CacheKey:
+    # urls in the response are absolute and depend on the requested host
+    return (tax.__name__, model.name, request.host_url)
+
+
+def get_encoded_taxonomy(
+    tax: Type[Taxonomy], model: Model, version: int
+) -> bytes | memoryview:
+    """Get the encoded taxonomy from the cache or marshal it on a cache miss.
+
+    With TAXONOMY_SNAPSHOT enabled the encoded taxonomies are kept in the
+    snapshot file shared by all workers instead of the worker cache. A miss
+    updates the snapshot of all taxonomies at once.
+    """
+    if current_app.config.get("TAXONOMY_SNAPSHOT", False):
+        return get_taxonomy_snapshots().get(
+            request.host_url,
+            snapshot_key(tax, model),
+            version,
+            partial(encode_taxonomy, tax, model),
+            snapshot_sources,
+        )
+    key = taxonomy_cache_key(tax, model)
+    cache = get_taxonomy_cache()
+    data = cache.get(key, version)
+    if data is None:
+        data = encode_taxonomy(tax, model)
+        cache.put(key, version, data)
+    return data
+
+
+def encode_taxonomy(tax: Type[Taxonomy], model: Model) -> bytes:
+    return encode_json(timed_marshal(tax, model))
+
+
+def snapshot_key(tax: Type[Taxonomy], model: Model) -> str:
+    return "{}:{}".format(tax.__name__, model.name)
+
+
+def snapshot_sources() -> SnapshotSources:
+    """Get the current version and the encoder of every taxonomy."""
+    sources: SnapshotSources = {}
+    for tax in get_taxonomies().values():
+        model = TAXONOMY_MODELS[tax.taxonomy_type]
+        sources[snapshot_key(tax, model)] = (
+            tax.get_version(),
+            partial(encode_taxonomy, tax, model),
+        )
+    return sources
+
+
+def with_revalidation(response: Response, etag: str) -> Response:
+    response.set_etag(etag)
+    # allow browsers to keep the response but force a revalidation
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def taxonomy_bundle_response(
+    taxonomies: Sequence[Tuple[Type[Taxonomy], Model]], known_versions: Dict[str, int]
+) -> Response:
+    """Get multiple taxonomies in one json response.
+
+    The bundle is assembled from the cached encoded taxonomies. Taxonomies
+    with a version matching the version already known by the client are only
+    listed as unchanged.
+
+    Arguments:
+        taxonomies: Sequence[Tuple[Type[Taxonomy], Model]] -- The taxonomies
+            to include with the model to marshal each taxonomy with.
+        known_versions: Dict[str, int] -- The taxonomy versions the client
+            already has by taxonomy name.
+
+    Returns:
+        Response -- The json response.
+    """
+    versions = [(tax, model, tax.get_version()) for tax, model in taxonomies]
+    etag_source = ",".join(
+        "{}:{}".format(tax.__name__, version) for tax, _, version in versions
+    )
+    etag_source += "|" + ",".join(
+        "{}:{}".format(name, version) for name, version in sorted(known_versions.items())
+    )
+    etag = taxonomy_etag((etag_source, "bundle", request.host_url), 0)
+    if request.if_none_match.contains_weak(etag):
+        return with_revalidation(Response(status=HTTPStatus.NOT_MODIFIED), etag)
+
+    parts = []
+    unchanged = []
+    for tax, model, version in versions:
+        name = tax.__name__
+        if known_versions.get(name) == version:
+            unchanged.append(name)
+            continue
+        data = get_encoded_taxonomy(tax, model, version)
+        if data[-1:] == b"\n":
+            data = data[:-1]
+        parts.append(
+            b"".join(
+                (
+                    encode_json(name).rstrip(),
+                    b': {"version": ',
+                    str(version).encode(),
+                    b', "taxonomy": ',
+                    data,
+                    b"}",
+                )
+            )
+        )
+    data = b"".join(
+        (
+            b'{"taxonomies": {',
+            b", ".join(parts),
+            b'}, "unchanged": ',
+            encode_json(unchanged).rstrip(),
+            b"}\n",
+        )
+    )
+    return with_revalidation(Response(data, mimetype="application/json"), etag)
@@ -13,10 +13,13 @@ return marshal(test, taxonomy_tree_item_get), HTTPStatus.OK
 """
 
 from collections import OrderedDict
+from typing import Dict
 
-from flask_restx import fields, marshal
+from flask import has_request_context, request
+from flask_restx import Model, fields, marshal
 
 from ...hal_field import HaLUrl, NestedFields, UrlData
+from ...models.taxonomies import TreeTaxonomy, get_taxonomy_info
 from ..models import with_curies
 from . import ns
 
@@ -28,7 +31,7 @@ taxonomy_item_links = ns.model(
                 "api.taxonomies_taxonomy_item_resource",
                 absolute=True,
                 url_data={
-                    "taxonomy": "__class__.__name__",
+                    "taxonomy": "taxonomy_name",
                     "taxonomy_type": "taxonomy_type",
                     "item_id": "id",
                 },
@@ -40,7 +43,7 @@ taxonomy_item_links = ns.model(
                 "api.taxonomies_taxonomy_resource",
                 absolute=True,
                 url_data={
-                    "taxonomy": "__class__.__name__",
+                    "taxonomy": "taxonomy_name",
                     "taxonomy_type": "taxonomy_type",
                 },
             ),
@@ -156,6 +159,147 @@ taxonomy_tree_item_get_json = ns.schema_model(
 )
 
 
+# Use taxonomy_tree_item_lazy_get for marshalling subtrees loaded with a depth
+# limit (see TreeTaxonomy.get_subtree)
+taxonomy_tree_item_lazy_get = ns.inherit(
+    "TaxonomyTreeItemLazyGET",
+    taxonomy_item_get,
+    OrderedDict(
+        [
+            (
+                "child_count",
+                fields.Integer(readonly=True, description="Number of direct children."),
+            ),
+            (
+                "descendant_count",
+                fields.Integer(readonly=True, description="Number of all descendants."),
+            ),
+        ]
+    ),
+)
+
+taxonomy_tree_item_lazy_get["children"] = fields.List(
+    fields.Nested(taxonomy_tree_item_lazy_get), default=[]
+)
+
+
+# Use taxonomy_tree_item_batch_post for documentation only (recursive model)
+taxonomy_tree_item_batch_post = ns.schema_model(
+    "TaxonomyTreeItemBatchPOST",
+    {
+        "allOf": [
+            {"$ref": "#/definitions/{0}".format(taxonomy_item_post.name)},
+            {
+                "properties": {
+                    "children": {
+                        "type": "array",
+                        "items": {"$ref": "#/definitions/TaxonomyTreeItemBatchPOST"},
+                    }
+                }
+            },
+        ]
+    },
+)
+
+taxonomy_tree_item_batch = ns.model(
+    "TaxonomyTreeItemBatch",
+    {
+        "parent": fields.Integer(readonly=True, description="The id of the parent item."),
+        "ids": fields.List(
+            fields.Integer,
+            readonly=True,
+            description="The ids of the new items in the order of the request (pre order).",
+        ),
+    },
+)
+
+
+EXPAND_TAXONOMY_PATHS = "taxonomy_paths"
+
+
+def is_expanded(name: str) -> bool:
+    """Check if the expand query parameter of the request contains the name."""
+    if not has_request_context():
+        return False
+    expand = request.args.get("expand", "")
+    return name in {part.strip() for part in expand.split(",")}
+
+
+taxonomy_path_item = ns.model(
+    "TaxonomyPathItem",
+    OrderedDict(
+        [
+            ("id", fields.Integer(readonly=True, example=1)),
+            ("name", fields.String(readonly=True)),
+        ]
+    ),
+)
+
+_path_models: Dict[str, Model] = {}
+
+
+def with_taxonomy_path(model: Model) -> Model:
+    """Get the model extended by the ancestor path of tree taxonomy items."""
+    path_model = _path_models.get(model.name)
+    if path_model is None:
+        path_model = ns.inherit(
+            model.name + "WithPath",
+            model,
+            {
+                "path": fields.List(
+                    fields.Nested(taxonomy_path_item),
+                    readonly=True,
+                    description=(
+                        "The ancestors of a tree taxonomy item below the root item. "
+                        "Only present with ?expand={}.".format(EXPAND_TAXONOMY_PATHS)
+                    ),
+                ),
+            },
+        )
+        _path_models[model.name] = path_model
+    return path_model
+
+
+class TaxonomyItemNested(fields.Nested):
+    """Nested field for taxonomy item references in data responses.
+
+    Adds the ancestor path of tree taxonomy items (without the root item) if
+    the request has the query parameter ?expand=taxonomy_paths. The paths are
+    resolved from the cached parent index of the taxonomy.
+    """
+
+    def __init__(self, model: Model, **kwargs):
+        super().__init__(with_taxonomy_path(model), **kwargs)
+
+    def output(self, key, obj, ordered=False, **kwargs):
+        value = super().output(key, obj, ordered=ordered, **kwargs)
+        if value is None:
+            return value
+        value.pop("path", None)
+        if not is_expanded(EXPAND_TAXONOMY_PATHS):
+            return value
+        item = fields.get_value(key if self.attribute is None else self.attribute, obj)
+        if isinstance(item, TreeTaxonomy):
+            path = get_taxonomy_info(type(item)).ancestor_path(item.id)
+            value["path"] = [{"id": item_id, "name": name} for item_id, name in path]
+        return value
+
+
+class TaxonomyItemRef(fields.Nested):
+    """Nested field for taxonomy item references in data requests.
+
+    The item can also be referenced by its name instead of an object.
+    """
+
+    def schema(self):
+        schema = super().schema()
+        schema.pop("$ref", None)
+        schema.pop("allOf", None)
+        ref = {"$ref": "#/definitions/{}".format(self.nested.name)}
+        schema.setdefault("anyOf", [ref]).append({"type": "string"})
+        return schema
+
+
 class TaxonomyItems(fields.Raw):
     """Raw field for formatting taxonomy Items."""
 
@@ -209,9 +353,7 @@ taxonomy_model = ns.model(
         "taxonomy_type": fields.String(
             default="list", enum=["list", "tree"], discriminator=True, readonly=True
         ),
-        "select_only_leafs": fields.Boolean(
-            default=False, readonly=True, required=False
-        ),
+        "select_only_leafs": fields.Boolean(default=False, readonly=True, required=False),
         "select_multiple": fields.Boolean(default=False, readonly=True, required=False),
         "specification": fields.String(readonly=True, required=False),
         "items": TaxonomyItems(required=False),
@@ -272,8 +414,163 @@ taxonomy_list_resource = ns.model(
     "TaxonomyList",
     {
         "_links": NestedFields(taxonomy_list_links),
-        "taxonomies": fields.Nested(
-            taxonomy_model, attribute="taxonomies", as_list=True
+        "taxonomies": fields.Nested(taxonomy_model, attribute="taxonomies", as_list=True),
+    },
+)
+
+# model for taxonomy bundles (documentation only)
+taxonomy_bundle_json = ns.schema_model(
+    "TaxonomyBundleJSON",
+    {
+        "type": "object",
+        "properties": {
+            "taxonomies": {
+                "type": "object",
+                "additionalProperties": {
+                    "type": "object",
+                    "properties": {
+                        "version": {"type": "integer"},
+                        "taxonomy": {
+                            "oneOf": [
+                                {
+                                    "$ref": "#/definitions/{0}".format(
+                                        list_taxonomy_model.name
+                                    )
+                                },
+                                {
+                                    "$ref": "#/definitions/{0}".format(
+                                        tree_taxonomy_model_json.name
+                                    )
+                                },
+                            ]
+                        },
+                    },
+                },
+            },
+            "unchanged": {"type": "array", "items": {"type": "string"}},
+        },
+    },
+)
+
+# models for taxonomy item usage
+taxonomy_item_usage = ns.model(
+    "TaxonomyItemUsage",
+    {
+        "id": fields.Integer(readonly=True, example=1),
+        "name": fields.String(readonly=True),
+        "usage_count": fields.Integer(readonly=True, default=0),
+        "references": fields.Raw(
+            readonly=True,
+            default={},
+            description='Number of referencing rows by "table.column".',
+        ),
+    },
+)
+
+taxonomy_usage = ns.model(
+    "TaxonomyUsage",
+    {
+        "taxonomy": fields.String(readonly=True),
+        "references": fields.List(
+            fields.String(),
+            readonly=True,
+            description='All columns referencing the taxonomy as "table.column".',
+        ),
+        "items": fields.List(fields.Nested(taxonomy_item_usage), readonly=True),
+    },
+)
+
+taxonomy_item_reference = ns.model(
+    "TaxonomyItemReference",
+    {
+        "table": fields.String(readonly=True),
+        "column": fields.String(readonly=True),
+        "row_id": fields.Integer(
+            readonly=True, description="The id of the row referencing the item."
+        ),
+    },
+)
+
+taxonomy_item_where_used = ns.model(
+    "TaxonomyItemWhereUsed",
+    {
+        "id": fields.Integer(readonly=True, example=1),
+        "usage_count": fields.Integer(readonly=True),
+        "page": fields.Integer(readonly=True),
+        "page_size": fields.Integer(readonly=True),
+        "references": fields.List(fields.Nested(taxonomy_item_reference), readonly=True),
+    },
+)
+
+# models for merging taxonomy items
+taxonomy_item_merge_post = ns.model(
+    "TaxonomyItemMergePOST",
+    {
+        "target": fields.Integer(
+            required=True,
+            example=1,
+            description="The id of the item that replaces the merged item.",
+        ),
+    },
+)
+
+taxonomy_item_merge = ns.model(
+    "TaxonomyItemMerge",
+    {
+        "id": fields.Integer(readonly=True, description="The id of the merged item."),
+        "target": fields.Nested(taxonomy_item_get, readonly=True),
+        "updated": fields.Raw(
+            readonly=True,
+            default={},
+            description='Number of rewritten references by "table.column".',
+        ),
+        "removed_duplicates": fields.Raw(
+            readonly=True,
+            default={},
+            description='Number of removed duplicate association rows by "table.column".',
+        ),
+        "moved_children": fields.Integer(readonly=True, default=0),
+    },
+)
+
+# models for the change journal
+taxonomy_item_change = ns.model(
+    "TaxonomyItemChange",
+    {
+        "id": fields.Integer(readonly=True, example=1),
+        "name": fields.String(readonly=True),
+        "description": fields.String(readonly=True),
+        "parent": fields.Integer(
+            readonly=True,
+            attribute="parent_id",
+            description="The id of the parent item (only for tree taxonomies).",
+        ),
+    },
+)
+
+taxonomy_changes = ns.model(
+    "TaxonomyChanges",
+    {
+        "taxonomy": fields.String(readonly=True),
+        "taxonomy_type": fields.String(readonly=True),
+        "since": fields.Integer(readonly=True, description="The requested version."),
+        "version": fields.Integer(
+            readonly=True, description="The current version of the taxonomy."
+        ),
+        "snapshot": fields.Boolean(
+            readonly=True,
+            description="True if the items are a full snapshot of the taxonomy "
+            "because the changes since the requested version are not known.",
+        ),
+        "items": fields.List(
+            fields.Nested(taxonomy_item_change),
+            readonly=True,
+            description="The changed (or new) items.",
+        ),
+        "deleted": fields.List(
+            fields.Integer,
+            readonly=True,
+            description="The ids of deleted items.",
         ),
     },
 )
@@ -0,0 +1,221 @@
+"""Module containing the memory mapped snapshot of encoded taxonomy responses.
+
+All workers share one snapshot file per host url in the instance folder.
+The file starts with a json header listing the version, offset and length
+of every encoded taxonomy, followed by the encoded taxonomies. Workers map
+the file read only, so the taxonomies are kept once in the page cache
+instead of once per worker heap. A new file is written next to the old one
+and moved into place, workers map the new file on their next miss. Hits are
+served as views of the mapping without copying the encoded taxonomy.
+
+The snapshot is disabled by default (see TAXONOMY_SNAPSHOT in the config).
+"""
+
+import json
+import mmap
+import os
+import struct
+from hashlib import sha1
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Callable, Dict, Iterator, Tuple
+
+from flask import current_app
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+SNAPSHOT_MAGIC = b"M4MTAX01"
+HEADER_LENGTH = struct.Struct(">I")
+
+# key -> (version, offset, length)
+SnapshotEntries = Dict[str, Tuple[int, int, int]]
+# key -> (version, encodes the entry)
+SnapshotSources = Dict[str, Tuple[int, Callable[[], bytes]]]
+
+
+class TaxonomySnapshot:
+    """A read only mapping of a snapshot file.
+
+    The mapping stays valid after the file was replaced, it is closed when
+    the last view of it is released.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.entries: SnapshotEntries = {}
+        self.stat: os.stat_result | None = None
+        self._mmap: mmap.mmap | None = None
+        try:
+            with open(file_path, "rb") as snapshot_file:
+                self.stat = os.fstat(snapshot_file.fileno())
+                if self.stat.st_size == 0:
+                    return
+                self._mmap = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return
+        self.entries = self._read_header(self._mmap)
+
+    @staticmethod
+    def _read_header(data: mmap.mmap) -> SnapshotEntries:
+        prefix_length = len(SNAPSHOT_MAGIC) + HEADER_LENGTH.size
+        if data[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            return {}
+        (header_length,) = HEADER_LENGTH.unpack_from(data, len(SNAPSHOT_MAGIC))
+        header = json.loads(data[prefix_length : prefix_length + header_length])
+        # offsets in the file are relative to the end of the header
+        data_start = prefix_length + header_length
+        return {
+            key: (version, data_start + offset, length)
+            for key, (version, offset, length) in header["entries"].items()
+        }
+
+    def is_current(self) -> bool:
+        """Check if the mapped file is still the file at the snapshot path."""
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return self.stat is None
+        if self.stat is None:
+            return False
+        return (stat.st_ino, stat.st_mtime_ns) == (
+            self.stat.st_ino,
+            self.stat.st_mtime_ns,
+        )
+
+    def view(self, key: str, version: int) -> memoryview | None:
+        """Get a zero copy view of the encoded taxonomy of this version."""
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != version or self._mmap is None:
+            return None
+        _, offset, length = entry
+        return memoryview(self._mmap)[offset : offset + length]
+
+
+def write_snapshot(file_path: str, entries: Dict[str, Tuple[int, bytes | memoryview]]):
+    """Write a snapshot file atomically.
+
+    Arguments:
+        file_path: str -- The path of the snapshot file.
+        entries: Dict[str, Tuple[int, bytes]] -- The version and the encoded
+            data by key.
+    """
+    header_entries: SnapshotEntries = {}
+    offset = 0
+    for key, (version, data) in entries.items():
+        header_entries[key] = (version, offset, len(data))
+        offset += len(data)
+    header = json.dumps({"entries": header_entries}).encode()
+    folder = os.path.dirname(file_path)
+    with NamedTemporaryFile(dir=folder, prefix=".snapshot-", delete=False) as tmp:
+        tmp.write(SNAPSHOT_MAGIC)
+        tmp.write(HEADER_LENGTH.pack(len(header)))
+        tmp.write(header)
+        for _, data in entries.values():
+            tmp.write(data)
+    os.replace(tmp.name, file_path)
+
+
+class TaxonomySnapshotStore:
+    """The mapped snapshot files of one worker (one file per host url)."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self._lock = Lock()
+        self._snapshots: Dict[str, TaxonomySnapshot] = {}
+
+    def snapshot_path(self, host_url: str) -> str:
+        host_hash = sha1(host_url.encode()).hexdigest()[:16]
+        return os.path.join(self.folder, "taxonomy-snapshot-{}.bin".format(host_hash))
+
+    def _snapshot(self, host_url: str, refresh: bool = False) -> TaxonomySnapshot:
+        snapshot = self._snapshots.get(host_url)
+        if snapshot is None or (refresh and not snapshot.is_current()):
+            snapshot = TaxonomySnapshot(self.snapshot_path(host_url))
+            self._snapshots[host_url] = snapshot
+        return snapshot
+
+    def get(
+        self,
+        host_url: str,
+        key: str,
+        version: int,
+        build: Callable[[], bytes],
+        sources: Callable[[], SnapshotSources] | None = None,
+    ) -> bytes | memoryview:
+        """Get the encoded taxonomy from the snapshot or update it on a miss.
+
+        A hit returns a view of the mapped file without copying the data.
+        On a miss all outdated entries of the given sources are encoded and
+        written in one pass, so a cold worker or a version change leads to a
+        single new snapshot file.
+
+        Arguments:
+            host_url: str -- The host url used in the encoded taxonomies.
+            key: str -- The key of the encoded taxonomy.
+            version: int -- The current version of the taxonomy.
+            build: Callable[[], bytes] -- Encodes the taxonomy on a miss.
+            sources: Callable[[], SnapshotSources] -- All entries that
+                belong into the snapshot (optional).
+        """
+        view = self._snapshot(host_url).view(key, version)
+        if view is not None:
+            return view
+        with self._lock:
+            view = self._snapshot(host_url, refresh=True).view(key, version)
+            if view is not None:
+                return view
+            all_sources = sources() if sources is not None else {}
+            all_sources[key] = (version, build)
+            view = self.update(host_url, all_sources).view(key, version)
+        return build() if view is None else view
+
+    def update(self, host_url: str, sources: SnapshotSources) -> TaxonomySnapshot:
+        """Encode all outdated entries and write them in one snapshot file.
+
+        Entries of the current snapshot that are up to date, newer than the
+        source or not part of the sources are kept.
+        """
+        path = self.snapshot_path(host_url)
+        with open(path + ".lock", "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            # another worker may have written the entries in the meantime
+            snapshot = self._snapshot(host_url, refresh=True)
+            entries: Dict[str, Tuple[int, bytes | memoryview]] = {}
+            for key, (version, _, _) in snapshot.entries.items():
+                view = snapshot.view(key, version)
+                assert view is not None
+                entries[key] = (version, view)
+            outdated = [
+                (key, version, build)
+                for key, (version, build) in sources.items()
+                if entries.get(key, (-1,))[0] < version
+            ]
+            if not outdated:
+                return snapshot
+            for key, version, build in outdated:
+                entries[key] = (version, build())
+            write_snapshot(path, entries)
+            return self._snapshot(host_url, refresh=True)
+
+
+def iter_chunks(data: memoryview, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Stream a view of the snapshot without copying it at once."""
+    for start in range(0, len(data), chunk_size):
+        yield data[start : start + chunk_size].tobytes()
+
+
+def get_taxonomy_snapshots() -> TaxonomySnapshotStore:
+    """Get the snapshot store of the current app."""
+    store = current_app.extensions.get("m4m_taxonomy_snapshots")
+    if store is None:
+        folder = current_app.config.get("TAXONOMY_SNAPSHOT_PATH") or os.path.join(
+            current_app.instance_path, "taxonomy_snapshots"
+        )
+        os.makedirs(folder, exist_ok=True)
+        store = TaxonomySnapshotStore(folder)
+        current_app.extensions["m4m_taxonomy_snapshots"] = store
+    return store
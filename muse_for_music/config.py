@@ -18,6 +18,40 @@ class Config(object):
     # Monitor request performance
     MONITOR_REQUEST_PERORMANCE = True
     LONG_REQUEST_THRESHHOLD = 1
+    # log queries repeated more often in one request as possible N+1 queries
+    N_PLUS_ONE_THRESHOLD = 10
+    # measure the time of fetching rows and building the orm objects separately
+    # (the orm phase) for every request, profiled requests are always measured
+    REQUEST_PHASE_ORM = False
+
+    # keep the last SLOW_REQUEST_STORE_SIZE slow requests (slower than
+    # LONG_REQUEST_THRESHHOLD or with more than SLOW_REQUEST_QUERY_THRESHOLD
+    # queries) for the admin performance api (stored in SLOW_REQUEST_STORE_PATH,
+    # default: instance/slow_requests.sqlite)
+    SLOW_REQUEST_STORE = True
+    SLOW_REQUEST_STORE_SIZE = 1000
+    SLOW_REQUEST_QUERY_THRESHOLD = 100
+
+    # profile requests of admins with the "X-M4M-Profile: 1" header and keep
+    # the last REQUEST_PROFILE_KEEP profiles
+    # (stored in REQUEST_PROFILE_PATH, default: instance/profiles)
+    REQUEST_PROFILING = True
+    REQUEST_PROFILE_KEEP = 100
+
+    # prometheus metrics of all workers on the admin only /metrics endpoint
+    # (stored in METRICS_PATH, default: instance/metrics)
+    REQUEST_METRICS = True
+    # seconds between writes of the metrics of a worker
+    METRICS_FLUSH_INTERVAL = 5
+
+    # seconds between checks for taxonomy changes of other workers
+    # (0 checks once per request)
+    TAXONOMY_VERSION_TTL = 0
+
+    # share the encoded taxonomies of all workers in a memory mapped file
+    # (off by default, stored in TAXONOMY_SNAPSHOT_PATH,
+    # default: instance/taxonomy_snapshots)
+    TAXONOMY_SNAPSHOT = False
 
     # for better json performance
     JSON_SORT_KEYS = False
@@ -40,3 +74,5 @@ class DebugConfig(Config):
 class TestingConfig(Config):
     TESTING = True
     LOG_PATH = "/tmp"
+    REQUEST_METRICS = False
+    SLOW_REQUEST_STORE = False
@@ -27,7 +27,7 @@ def view_taxonomy(taxonomy: str):
     else:
         assert issubclass(tax, TreeTaxonomy)
         template = "debug/taxonomies/tree.html"
-        content = (tax.get_root(),)
+        content = (tax.get_tree(),)
     return render_template(
         template,
         title="muse4music – Taxonomy: {}".format(taxonomy),
@@ -14,6 +14,8 @@ from flask_restx.fields import (
     urlunparse,
 )
 
+from .performance import request_phase
+
 # monkeypatch flask restplus to allow custom fields
 if True:  # noqa: C901
     old_init = Raw.__init__
@@ -247,17 +249,18 @@ class HaLUrl(StringMixin, Raw):
         self.is_list = isinstance(url_data, list)
 
     def output(self, key, obj, ordered=False, **kwargs):
-        output = {}
-        if self.is_list:
-            assert isinstance(self.url_data, list)
-            output = []
-            for data in self.url_data:
-                output.append(self.generate_link(data, obj))
-        else:
-            assert isinstance(self.url_data, UrlData)
-            output = self.generate_link(self.url_data, obj)
+        with request_phase("links"):
+            output = {}
+            if self.is_list:
+                assert isinstance(self.url_data, list)
+                output = []
+                for data in self.url_data:
+                    output.append(self.generate_link(data, obj))
+            else:
+                assert isinstance(self.url_data, UrlData)
+                output = self.generate_link(self.url_data, obj)
 
-        return output
+            return output
 
     def generate_link(self, url_data: UrlData, obj):
         link = OrderedDict()
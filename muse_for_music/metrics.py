@@ -0,0 +1,399 @@
+"""Request metrics in the Prometheus text format.
+
+Every worker process aggregates its metrics in memory and regularly writes
+them to its own file in the metrics folder (default: instance/metrics).
+The /metrics endpoint merges the files of all workers, so the metrics of
+all gunicorn workers (including workers that were restarted) are summed up.
+The files of exited workers are merged into a single archive file on the
+next scrape, so the folder does not grow with every worker restart.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from atexit import register as register_atexit
+from http import HTTPStatus
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from time import monotonic, time
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover (windows)
+    fcntl = None  # type: ignore
+
+from flask import Flask, Response, current_app
+from flask_jwt_extended import verify_jwt_in_request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt import PyJWTError
+
+from .user_api import RoleEnum, has_roles, log_unauthorized
+from .util import abort
+
+Labels = Tuple[Tuple[str, str], ...]
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+ARCHIVE_FILE = "metrics-archive.json"
+
+# name -> (type, help text, histogram buckets)
+METRICS: Dict[str, Tuple[str, str, Sequence[float]]] = {
+    "m4m_http_requests_total": ("counter", "Finished requests by status code.", ()),
+    "m4m_http_request_duration_seconds": (
+        "histogram",
+        "Request latency.",
+        DURATION_BUCKETS,
+    ),
+    "m4m_db_queries_per_request": (
+        "histogram",
+        "Number of sql queries per request.",
+        QUERY_COUNT_BUCKETS,
+    ),
+    "m4m_db_query_duration_seconds_per_request": (
+        "histogram",
+        "Total time spent in sql queries per request.",
+        DURATION_BUCKETS,
+    ),
+    "m4m_db_queries_total": ("counter", "Sql queries by kind (read or write).", ()),
+    "m4m_http_request_phase_duration_seconds": (
+        "histogram",
+        "Request time by phase (sql, orm, marshal, links, json, other).",
+        DURATION_BUCKETS,
+    ),
+}
+
+
+class MetricsStore:
+    """The metrics of one worker process."""
+
+    def __init__(self, folder: str, flush_interval: float = 5):
+        self.folder = folder
+        self.flush_interval = flush_interval
+        self.file_path = os.path.join(
+            folder, "metrics-{}-{}.json".format(os.getpid(), int(time() * 1000))
+        )
+        self._lock = Lock()
+        self._last_flush = monotonic()
+        self._dirty = False
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        # labels -> bucket counts + [sum, count]
+        self.histograms: Dict[str, Dict[Labels, List[float]]] = {}
+
+    def inc(self, name: str, labels: Labels, value: float = 1):
+        with self._lock:
+            counter = self.counters.setdefault(name, {})
+            counter[labels] = counter.get(labels, 0) + value
+            self._dirty = True
+
+    def observe(self, name: str, labels: Labels, value: float):
+        buckets = METRICS[name][2]
+        with self._lock:
+            histogram = self.histograms.setdefault(name, {})
+            values = histogram.get(labels)
+            if values is None:
+                values = [0] * (len(buckets) + 2)
+                histogram[labels] = values
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    values[index] += 1
+            values[-2] += value
+            values[-1] += 1
+            self._dirty = True
+
+    def flush(self, force: bool = False):
+        """Write the metrics of this process after the flush interval."""
+        now = monotonic()
+        if not self._dirty or (
+            not force and now - self._last_flush < self.flush_interval
+        ):
+            return
+        with self._lock:
+            data = _serialize(self.counters, self.histograms)
+            self._dirty = False
+            self._last_flush = now
+        try:
+            write_metrics_file(self.file_path, data)
+        except OSError:
+            # metrics must never break a request, the next flush retries
+            self._dirty = True
+
+
+def write_metrics_file(file_path: str, data: Dict):
+    """Replace a metrics file atomically (removes the temp file on errors)."""
+    with NamedTemporaryFile(
+        "w", dir=os.path.dirname(file_path), prefix=".metrics-", delete=False
+    ) as tmp:
+        try:
+            json.dump(data, tmp)
+        except BaseException:
+            tmp.close()
+            os.remove(tmp.name)
+            raise
+    try:
+        os.replace(tmp.name, file_path)
+    except OSError:
+        try:
+            os.remove(tmp.name)
+        except OSError:
+            pass
+        raise
+
+
+def get_metrics_store() -> MetricsStore:
+    """Get the metrics store of the current app."""
+    store = current_app.extensions.get("m4m_metrics")
+    if store is None:
+        folder = current_app.config.get("METRICS_PATH") or os.path.join(
+            current_app.instance_path, "metrics"
+        )
+        os.makedirs(folder, exist_ok=True)
+        store = MetricsStore(folder, current_app.config.get("METRICS_FLUSH_INTERVAL", 5))
+        current_app.extensions["m4m_metrics"] = store
+        register_atexit(store.flush, force=True)
+    return store
+
+
+def record_request(
+    endpoint: str,
+    method: str,
+    status: int,
+    duration: float,
+    query_durations: Iterable[Tuple[float, bool]],
+    phases: Dict[str, float] | None = None,
+):
+    """Record the metrics of a finished request.
+
+    Arguments:
+        endpoint: str -- The flask endpoint of the request.
+        method: str -- The http method.
+        status: int -- The status code of the response.
+        duration: float -- The request duration in seconds.
+        query_durations: Iterable[Tuple[float, bool]] -- The duration of every
+            sql query together with a flag for write queries.
+        phases: Dict[str, float] -- The time spent in each phase of the request.
+    """
+    store = get_metrics_store()
+    labels: Labels = (("endpoint", endpoint), ("method", method))
+    store.inc("m4m_http_requests_total", (*labels, ("status", str(status))))
+    store.observe("m4m_http_request_duration_seconds", labels, duration)
+    query_count = 0
+    query_time = 0.0
+    writes = 0
+    for query_duration, write in query_durations:
+        query_count += 1
+        query_time += query_duration
+        writes += 1 if write else 0
+    store.observe("m4m_db_queries_per_request", labels, query_count)
+    store.observe("m4m_db_query_duration_seconds_per_request", labels, query_time)
+    if query_count - writes:
+        read_labels = (("endpoint", endpoint), ("kind", "read"))
+        store.inc("m4m_db_queries_total", read_labels, query_count - writes)
+    if writes:
+        write_labels = (("endpoint", endpoint), ("kind", "write"))
+        store.inc("m4m_db_queries_total", write_labels, writes)
+    for phase, phase_duration in (phases or {}).items():
+        phase_labels = (("endpoint", endpoint), ("phase", phase))
+        store.observe(
+            "m4m_http_request_phase_duration_seconds", phase_labels, phase_duration
+        )
+    store.flush()
+
+
+def _read_metrics_file(file_path: str) -> Dict | None:
+    try:
+        with open(file_path) as metrics_file:
+            return json.load(metrics_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _merge_data(counters: Dict, histograms: Dict, data: Dict):
+    for name, values in data.get("counters", {}).items():
+        merged_counter = counters.setdefault(name, {})
+        for labels, value in values:
+            key = tuple(tuple(label) for label in labels)
+            merged_counter[key] = merged_counter.get(key, 0) + value
+    for name, values in data.get("histograms", {}).items():
+        merged_histogram = histograms.setdefault(name, {})
+        for labels, value in values:
+            key = tuple(tuple(label) for label in labels)
+            merged = merged_histogram.get(key)
+            if merged is None:
+                merged_histogram[key] = list(value)
+            else:
+                merged_histogram[key] = [a + b for a, b in zip(merged, value)]
+
+
+def _serialize(counters: Dict, histograms: Dict) -> Dict:
+    return {
+        "counters": {
+            name: [[list(labels), value] for labels, value in values.items()]
+            for name, values in counters.items()
+        },
+        "histograms": {
+            name: [[list(labels), value] for labels, value in values.items()]
+            for name, values in histograms.items()
+        },
+    }
+
+
+def _is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # e.g. a process of another user
+    return True
+
+
+@contextmanager
+def _archive_lock(folder: str) -> Iterator[bool]:
+    """Lock the archive against concurrent scrapes of other workers.
+
+    Yields False if the platform does not support file locks.
+    """
+    if fcntl is None:
+        yield False
+        return
+    with open(os.path.join(folder, ".metrics.lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _exited_worker_files(folder: str) -> List[str]:
+    """Get the metric files of worker processes that are no longer running."""
+    exited: List[str] = []
+    for file_name in os.listdir(folder):
+        if not file_name.startswith("metrics-") or not file_name.endswith(".json"):
+            continue
+        pid = file_name.split("-")[1]
+        if pid.isdigit() and int(pid) != os.getpid() and not _is_running(int(pid)):
+            exited.append(file_name)
+    return exited
+
+
+def archive_exited_workers(folder: str):
+    """Merge the metric files of exited workers into the archive file."""
+    exited = _exited_worker_files(folder)
+    if not exited:
+        return
+    with _archive_lock(folder) as locked:
+        if not locked:
+            return
+        archive_path = os.path.join(folder, ARCHIVE_FILE)
+        counters: Dict[str, Dict[Labels, float]] = {}
+        histograms: Dict[str, Dict[Labels, List[float]]] = {}
+        _merge_data(counters, histograms, _read_metrics_file(archive_path) or {})
+        archived: List[str] = []
+        for file_name in exited:
+            data = _read_metrics_file(os.path.join(folder, file_name))
+            if data is None:
+                continue  # already archived by another worker
+            _merge_data(counters, histograms, data)
+            archived.append(file_name)
+        if not archived:
+            return
+        try:
+            write_metrics_file(archive_path, _serialize(counters, histograms))
+            for file_name in archived:
+                os.remove(os.path.join(folder, file_name))
+        except OSError:
+            pass  # retried on the next scrape
+
+
+def merge_metrics(folder: str) -> Tuple[Dict, Dict]:
+    """Sum up the metric files of all worker processes."""
+    counters: Dict[str, Dict[Labels, float]] = {}
+    histograms: Dict[str, Dict[Labels, List[float]]] = {}
+    for file_name in sorted(os.listdir(folder)):
+        if not file_name.startswith("metrics-") or not file_name.endswith(".json"):
+            continue
+        data = _read_metrics_file(os.path.join(folder, file_name))
+        if data is not None:
+            _merge_data(counters, histograms, data)
+    return counters, histograms
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    formatted = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for name, value in labels
+    )
+    return "{" + formatted + "}" if formatted else ""
+
+
+def _format_number(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_metrics(counters: Dict, histograms: Dict) -> str:
+    """Render the metrics in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for name, (metric_type, help_text, buckets) in METRICS.items():
+        lines.append("# HELP {} {}".format(name, help_text))
+        lines.append("# TYPE {} {}".format(name, metric_type))
+        if metric_type == "counter":
+            for labels, value in sorted(counters.get(name, {}).items()):
+                lines.append(
+                    "{}{} {}".format(name, _format_labels(labels), _format_number(value))
+                )
+            continue
+        for labels, values in sorted(histograms.get(name, {}).items()):
+            for bound, count in zip((*buckets, "+Inf"), (*values[:-2], values[-1])):
+                le = bound if bound == "+Inf" else _format_number(bound)  # type: ignore
+                lines.append(
+                    "{}_bucket{} {}".format(
+                        name, _format_labels((*labels, ("le", le))), _format_number(count)
+                    )
+                )
+            lines.append(
+                "{}_sum{} {}".format(
+                    name, _format_labels(labels), repr(float(values[-2]))
+                )
+            )
+            lines.append(
+                "{}_count{} {}".format(
+                    name, _format_labels(labels), _format_number(values[-1])
+                )
+            )
+    return "\n".join(lines) + "\n"
+
+
+@has_roles([RoleEnum.admin])
+def _metrics_response():
+    store = get_metrics_store()
+    store.flush(force=True)
+    archive_exited_workers(store.folder)
+    counters, histograms = merge_metrics(store.folder)
+    return Response(
+        render_metrics(counters, histograms),
+        mimetype="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+def metrics_view():
+    if not current_app.config.get("REQUEST_METRICS", True):
+        abort(HTTPStatus.NOT_FOUND)
+    # the jwt error handlers of the app only work inside the restx apis
+    try:
+        verify_jwt_in_request()
+    except (JWTExtendedException, PyJWTError) as err:
+        log_unauthorized(str(err))
+        abort(HTTPStatus.UNAUTHORIZED, str(err))
+    return _metrics_response()
+
+
+def register_metrics(app: Flask):
+    """Add the admin only /metrics endpoint."""
+    app.add_url_rule("/metrics", "metrics", metrics_view)
@@ -18,16 +18,16 @@ class AmbitusGroup(db.Model, GetByID, UpdateableModelMixin, UpdateListMixin):
     id = db.Column(db.Integer, primary_key=True)
 
     highest_pitch_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Grundton.id), nullable=True
+        db.Integer, db.ForeignKey(Grundton.id), nullable=True, index=True
     )
     highest_octave_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Oktave.id), nullable=True
+        db.Integer, db.ForeignKey(Oktave.id), nullable=True, index=True
     )
     lowest_pitch_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Grundton.id), nullable=True
+        db.Integer, db.ForeignKey(Grundton.id), nullable=True, index=True
     )
     lowest_octave_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Oktave.id), nullable=True
+        db.Integer, db.ForeignKey(Oktave.id), nullable=True, index=True
     )
 
     highest_pitch: Mapped[Grundton] = relationship(
@@ -196,7 +196,9 @@ class OpusCitation(db.Model, GetByID, UpdateableModelMixin):
     opus_id: MappedColumn[int | None] = db.Column(
         db.Integer, db.ForeignKey(Opus.id), nullable=True
     )
-    citation_type_id: MappedColumn[int] = db.Column(db.Integer, db.ForeignKey(Zitat.id))
+    citation_type_id: MappedColumn[int] = db.Column(
+        db.Integer, db.ForeignKey(Zitat.id), index=True
+    )
 
     citations: Mapped[Citations] = relationship(
         Citations, back_populates="_opus_citations"
@@ -215,7 +217,7 @@ class EpocheToCitations(db.Model):
         db.Integer, db.ForeignKey(Citations.id), primary_key=True
     )
     epoche_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Epoche.id), primary_key=True
+        db.Integer, db.ForeignKey(Epoche.id), primary_key=True, index=True
     )
 
     citations: Mapped[Citations] = relationship(
@@ -233,7 +235,7 @@ class GattungToCitations(db.Model):
         db.Integer, db.ForeignKey(Citations.id), primary_key=True
     )
     gattung_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Gattung.id), primary_key=True
+        db.Integer, db.ForeignKey(Gattung.id), primary_key=True, index=True
     )
 
     citations: Mapped[Citations] = relationship(
@@ -271,7 +273,7 @@ class InstrumentToCitations(db.Model):
         db.Integer, db.ForeignKey(Citations.id), primary_key=True
     )
     instrument_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Instrument.id), primary_key=True
+        db.Integer, db.ForeignKey(Instrument.id), primary_key=True, index=True
     )
 
     citations: Mapped[Citations] = relationship(
@@ -289,7 +291,7 @@ class ProgrammgegenstandToCitations(db.Model):
         db.Integer, db.ForeignKey(Citations.id), primary_key=True
     )
     programmgegenstand_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Programmgegenstand.id), primary_key=True
+        db.Integer, db.ForeignKey(Programmgegenstand.id), primary_key=True, index=True
     )
 
     citations: Mapped[Citations] = relationship(
@@ -309,7 +311,7 @@ class TonmalereiToCitations(db.Model):
         db.Integer, db.ForeignKey(Citations.id), primary_key=True
     )
     tonmalerei_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Tonmalerei.id), primary_key=True
+        db.Integer, db.ForeignKey(Tonmalerei.id), primary_key=True, index=True
     )
 
     citations: Mapped[Citations] = relationship(
@@ -97,7 +97,7 @@ class CompositionTechniqueToComposition(db.Model):
         db.Integer, db.ForeignKey(Composition.id), primary_key=True
     )
     verarbeitungstechnik_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Verarbeitungstechnik.id), primary_key=True
+        db.Integer, db.ForeignKey(Verarbeitungstechnik.id), primary_key=True, index=True
     )
 
     composition: Mapped[Composition] = relationship(
@@ -121,10 +121,10 @@ class MusicialSequence(db.Model, GetByID):
     tonal_corrected: MappedColumn[bool] = db.Column(db.Boolean, default=False)
     exact_repetition: MappedColumn[bool] = db.Column(db.Boolean, default=False)
     starting_interval_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Intervall.id)
+        db.Integer, db.ForeignKey(Intervall.id), index=True
     )
     flow_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(BewegungImTonraum.id)
+        db.Integer, db.ForeignKey(BewegungImTonraum.id), index=True
     )
     beats: MappedColumn[int | None] = db.Column(db.Integer)
 
@@ -19,22 +19,22 @@ class DramaturgicContext(db.Model, GetByID, UpdateableModelMixin):
     __tablename__ = "dramaturgic_context"
     id = db.Column(db.Integer, primary_key=True)
     ambitus_context_before_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(AmbitusEinbettung.id), nullable=True
+        db.Integer, db.ForeignKey(AmbitusEinbettung.id), nullable=True, index=True
     )
     ambitus_context_after_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(AmbitusEinbettung.id), nullable=True
+        db.Integer, db.ForeignKey(AmbitusEinbettung.id), nullable=True, index=True
     )
     ambitus_change_before_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(AmbitusEntwicklung.id), nullable=True
+        db.Integer, db.ForeignKey(AmbitusEntwicklung.id), nullable=True, index=True
     )
     ambitus_change_after_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(AmbitusEntwicklung.id), nullable=True
+        db.Integer, db.ForeignKey(AmbitusEntwicklung.id), nullable=True, index=True
     )
     melodic_line_before_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Melodiebewegung.id), nullable=True
+        db.Integer, db.ForeignKey(Melodiebewegung.id), nullable=True, index=True
     )
     melodic_line_after_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Melodiebewegung.id), nullable=True
+        db.Integer, db.ForeignKey(Melodiebewegung.id), nullable=True, index=True
     )
 
     ambitus_context_before: Mapped[AmbitusEinbettung] = relationship(
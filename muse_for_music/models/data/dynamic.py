@@ -76,16 +76,16 @@ class DynamicContext(db.Model, GetByID, UpdateableModelMixin):
     id = db.Column(db.Integer, primary_key=True)
 
     loudness_before_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Lautstaerke.id), nullable=True
+        db.Integer, db.ForeignKey(Lautstaerke.id), nullable=True, index=True
     )
     loudness_after_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Lautstaerke.id), nullable=True
+        db.Integer, db.ForeignKey(Lautstaerke.id), nullable=True, index=True
     )
     dynamic_trend_before_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(LautstaerkeEinbettung.id), nullable=True
+        db.Integer, db.ForeignKey(LautstaerkeEinbettung.id), nullable=True, index=True
     )
     dynamic_trend_after_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(LautstaerkeEinbettung.id), nullable=True
+        db.Integer, db.ForeignKey(LautstaerkeEinbettung.id), nullable=True, index=True
     )
 
     loudness_before: Mapped[Lautstaerke] = relationship(
@@ -112,10 +112,10 @@ class DynamicMarking(db.Model, GetByID, UpdateableModelMixin):
     id: MappedColumn[int] = db.Column(db.Integer, primary_key=True)
     dynamic_id: MappedColumn[int] = db.Column(db.Integer, db.ForeignKey(Dynamic.id))
     lautstaerke_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Lautstaerke.id)
+        db.Integer, db.ForeignKey(Lautstaerke.id), index=True
     )
     lautstaerke_zusatz_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(LautstaerkeZusatz.id), nullable=True
+        db.Integer, db.ForeignKey(LautstaerkeZusatz.id), nullable=True, index=True
     )
 
     dynamic: Mapped[Dynamic] = relationship(Dynamic, back_populates="_dynamic_markings")
@@ -135,7 +135,7 @@ class LautstaerkeEntwicklungToDynamic(db.Model):
         db.Integer, db.ForeignKey(Dynamic.id), primary_key=True
     )
     lautstaerke_entwicklung_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(LautstaerkeEntwicklung.id), primary_key=True
+        db.Integer, db.ForeignKey(LautstaerkeEntwicklung.id), primary_key=True, index=True
     )
 
     dynamic: Mapped[Dynamic] = relationship(Dynamic, back_populates="_dynamic_changes")
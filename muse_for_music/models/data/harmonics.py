@@ -46,19 +46,19 @@ class Harmonics(db.Model, GetByID, UpdateListMixin, UpdateableModelMixin):
     id = db.Column(db.Integer, primary_key=True)
     # harmonic_function_modulation_id = db.Column(db.Integer, db.ForeignKey('harmonische_funktion_verwandschaft.id'))
     degree_of_dissonance_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Dissonanzgrad.id)
+        db.Integer, db.ForeignKey(Dissonanzgrad.id), index=True
     )
     numeric_degree_of_dissonance: MappedColumn[float | None] = db.Column(
         db.Float, nullable=True
     )
     harmonic_density_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(HarmonischeDichte.id)
+        db.Integer, db.ForeignKey(HarmonischeDichte.id), index=True
     )
     numeric_harmonic_density: MappedColumn[float | None] = db.Column(
         db.Float, nullable=True
     )
     harmonic_complexity_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(HarmonischeKomplexitaet.id)
+        db.Integer, db.ForeignKey(HarmonischeKomplexitaet.id), index=True
     )
     numeric_harmonic_complexity: MappedColumn[float | None] = db.Column(
         db.Float, nullable=True
@@ -230,16 +230,16 @@ class HarmonicCenter(db.Model, UpdateableModelMixin):
     id: MappedColumn[int] = db.Column(db.Integer, primary_key=True)
     harmonics_id: MappedColumn[int] = db.Column(db.Integer, db.ForeignKey(Harmonics.id))
     grundton_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Grundton.id)
+        db.Integer, db.ForeignKey(Grundton.id), index=True
     )
     tonalitaet_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Tonalitaet.id)
+        db.Integer, db.ForeignKey(Tonalitaet.id), index=True
     )
     harmonische_funktion_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(HarmonischeFunktion.id)
+        db.Integer, db.ForeignKey(HarmonischeFunktion.id), index=True
     )
     harmonische_stufe_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(HarmonischeStufe.id)
+        db.Integer, db.ForeignKey(HarmonischeStufe.id), index=True
     )
 
     harmonics: Mapped[Harmonics] = relationship(
@@ -265,7 +265,7 @@ class HarmonischePhaenomeneToHarmonics(db.Model):
         db.Integer, db.ForeignKey(Harmonics.id), primary_key=True
     )
     harmonische_phaenomene_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(HarmonischePhaenomene.id), primary_key=True
+        db.Integer, db.ForeignKey(HarmonischePhaenomene.id), primary_key=True, index=True
     )
 
     harmonics: Mapped[Harmonics] = relationship(
@@ -285,7 +285,7 @@ class HarmonischeEntwicklungToHarmonics(db.Model):
         db.Integer, db.ForeignKey(Harmonics.id), primary_key=True
     )
     harmonische_entwicklung_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(HarmonischeEntwicklung.id), primary_key=True
+        db.Integer, db.ForeignKey(HarmonischeEntwicklung.id), primary_key=True, index=True
     )
 
     harmonics: Mapped[Harmonics] = relationship(
@@ -305,7 +305,7 @@ class AkkordToHarmonics(db.Model):
         db.Integer, db.ForeignKey(Harmonics.id), primary_key=True
     )
     akkord_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Akkord.id), primary_key=True
+        db.Integer, db.ForeignKey(Akkord.id), primary_key=True, index=True
     )
 
     harmonics: Mapped[Harmonics] = relationship(
@@ -323,7 +323,7 @@ class DissonanzenToHarmonics(db.Model):
         db.Integer, db.ForeignKey(Harmonics.id), primary_key=True
     )
     dissonanzen_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Dissonanzen.id), primary_key=True
+        db.Integer, db.ForeignKey(Dissonanzen.id), primary_key=True, index=True
     )
 
     harmonics: Mapped[Harmonics] = relationship(Harmonics, back_populates="_dissonances")
@@ -342,6 +342,7 @@ class HarmonischeFunktionToHarmonics(db.Model):
         db.Integer,
         db.ForeignKey(HarmonischeFunktionVerwandschaft.id),
         primary_key=True,
+        index=True,
     )
 
     harmonics: Mapped[Harmonics] = relationship(
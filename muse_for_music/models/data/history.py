@@ -1,13 +1,15 @@
 import enum
 from datetime import datetime
 from json import dumps, loads
-from typing import Union
+from typing import Dict, Union
 
 from flask_jwt_extended import get_jwt_identity
 from sqlalchemy.orm import Mapped, MappedColumn, relationship
 from sqlalchemy.sql import func, select
 
 from ... import db
+from ..taxonomies.helper_classes import Taxonomy
+from ..taxonomies.registry import get_taxonomies
 from ..users import User
 from .opus import Opus
 from .part import Part
@@ -20,6 +22,7 @@ class MethodEnum(enum.Enum):
     create = 1
     update = 2
     delete = 3
+    merge = 4
 
 
 class TypeEnum(enum.Enum):
@@ -28,9 +31,10 @@ class TypeEnum(enum.Enum):
     part = 3
     subpart = 4
     voice = 5
+    taxonomy = 6
 
     @staticmethod
-    def fromResource(resource: Union[Person, Opus, Part, SubPart, Voice]):
+    def fromResource(resource: Union[Person, Opus, Part, SubPart, Voice, Taxonomy]):
         if isinstance(resource, Person):
             return TypeEnum.person
         elif isinstance(resource, Opus):
@@ -41,10 +45,24 @@ class TypeEnum(enum.Enum):
             return TypeEnum.subpart
         elif isinstance(resource, Voice):
             return TypeEnum.voice
+        elif isinstance(resource, Taxonomy):
+            return TypeEnum.taxonomy
         else:
             raise TypeError("Resource has wrong Type " + str(type(resource)))
 
 
+class HistoryTaxonomyItem:
+    """The taxonomy item of a history entry (the target item of a merge)."""
+
+    def __init__(
+        self, id: int, taxonomy: str, name: str | None, merged_id: int | None
+    ) -> None:
+        self.id = id
+        self.taxonomy = taxonomy
+        self.name = name
+        self.merged_id = merged_id
+
+
 class History(db.Model):
     id: MappedColumn[int] = db.Column(db.Integer, primary_key=True)
     time = db.Column(db.DateTime, server_default=func.now())
@@ -62,9 +80,19 @@ class History(db.Model):
     def __init__(
         self,
         method: MethodEnum,
-        resource: Union[Person, Opus, Part, SubPart, Voice],
+        resource: Union[Person, Opus, Part, SubPart, Voice, Taxonomy],
         user: Union[str, User, None] = None,
+        details: Dict | None = None,
     ):
+        """Create a new history entry.
+
+        Arguments:
+            method: MethodEnum -- The method applied to the resource.
+            resource -- The changed resource.
+            user: str, User or None -- The user (defaults to the jwt identity).
+            details: Dict | None -- Additional values stored with the resource
+                fingerprint (e.g. the id of a merged taxonomy item).
+        """
         _user_orig = user
         if user is None:
             user = get_jwt_identity()
@@ -83,10 +111,12 @@ class History(db.Model):
             db.session.flush((resource,))
         self.type = TypeEnum.fromResource(resource)
         self.resource = History.fingerprint(resource)
+        if details:
+            self.resource = dumps({**loads(self.resource), **details}, sort_keys=True)
         self._full_resource = None
 
     @staticmethod
-    def fingerprint(resource: Union[Person, Opus, Part, SubPart, Voice]):
+    def fingerprint(resource: Union[Person, Opus, Part, SubPart, Voice, Taxonomy]):
         if isinstance(resource, Person):
             return dumps({"id": resource.id}, sort_keys=True)
         elif isinstance(resource, Opus):
@@ -99,6 +129,10 @@ class History(db.Model):
             return dumps(
                 {"id": resource.id, "subpart_id": resource.subpart_id}, sort_keys=True
             )
+        elif isinstance(resource, Taxonomy):
+            return dumps(
+                {"id": resource.id, "taxonomy": resource.taxonomy_name}, sort_keys=True
+            )
         else:
             raise TypeError("Resource has wrong Type " + str(type(resource)))
 
@@ -126,7 +160,9 @@ class History(db.Model):
         return bool(result)
 
     @property
-    def full_resource(self) -> Union[Person, Opus, Part, SubPart, Voice, None]:
+    def full_resource(
+        self,
+    ) -> Union[Person, Opus, Part, SubPart, Voice, HistoryTaxonomyItem, None]:
         if self._full_resource is not None:
             return self._full_resource
         if not self.resource:
@@ -142,10 +178,25 @@ class History(db.Model):
             self._full_resource = SubPart.get_by_id_or_dict(resource, lazy=True)
         elif self.type == TypeEnum.voice:
             self._full_resource = Voice.get_by_id_or_dict(resource, lazy=True)
+        elif self.type == TypeEnum.taxonomy:
+            self._full_resource = History._taxonomy_item(resource)
         else:
             return None
         return self._full_resource
 
+    @staticmethod
+    def _taxonomy_item(resource: Dict) -> HistoryTaxonomyItem | None:
+        taxonomy = get_taxonomies().get(resource.get("taxonomy", "").upper())
+        if taxonomy is None:
+            return None
+        item = db.session.get(taxonomy, resource["id"])
+        return HistoryTaxonomyItem(
+            id=resource["id"],
+            taxonomy=taxonomy.__name__,
+            name=item.name if item is not None else None,
+            merged_id=resource.get("merged_id"),
+        )
+
 
 class Backup(db.Model):
     id: MappedColumn[int] = db.Column(db.Integer, primary_key=True)
@@ -44,7 +44,7 @@ class InstumentationToInstrument(db.Model):
         db.Integer, db.ForeignKey(Instrumentation.id), primary_key=True
     )
     instrument_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Instrument.id), primary_key=True
+        db.Integer, db.ForeignKey(Instrument.id), primary_key=True, index=True
     )
 
     instrumentation: Mapped[Instrumentation] = relationship(
@@ -72,21 +72,25 @@ class InstrumentationContext(db.Model, GetByID, UpdateableModelMixin):
         db.Integer,
         db.ForeignKey(InstrumentierungEinbettungQuantitaet.id),
         nullable=True,
+        index=True,
     )
     instr_quantity_after_id: MappedColumn[int | None] = db.Column(
         db.Integer,
         db.ForeignKey(InstrumentierungEinbettungQuantitaet.id),
         nullable=True,
+        index=True,
     )
     instr_quality_before_id: MappedColumn[int | None] = db.Column(
         db.Integer,
         db.ForeignKey(InstrumentierungEinbettungQualitaet.id),
         nullable=True,
+        index=True,
     )
     instr_quality_after_id: MappedColumn[int | None] = db.Column(
         db.Integer,
         db.ForeignKey(InstrumentierungEinbettungQualitaet.id),
         nullable=True,
+        index=True,
     )
 
     instrumentation_quantity_before: Mapped[InstrumentierungEinbettungQuantitaet] = (
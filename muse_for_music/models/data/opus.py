@@ -1,5 +1,4 @@
 from sqlalchemy.orm import Mapped, MappedColumn, relationship
-from sqlalchemy.sql import select
 
 from ... import db
 from ..helper_classes import GetByID, UpdateableModelMixin
@@ -47,13 +46,15 @@ class Opus(db.Model, GetByID, UpdateableModelMixin):
     notes: MappedColumn[str | None] = db.Column(db.Text, nullable=True)
     movements: MappedColumn[int | None] = db.Column(db.Integer)
     genre_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(GattungNineteenthCentury.id, ondelete="RESTRICT")
+        db.Integer,
+        db.ForeignKey(GattungNineteenthCentury.id, ondelete="RESTRICT"),
+        index=True,
     )
     grundton_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Grundton.id, ondelete="RESTRICT")
+        db.Integer, db.ForeignKey(Grundton.id, ondelete="RESTRICT"), index=True
     )
     tonalitaet_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Tonalitaet.id, ondelete="RESTRICT")
+        db.Integer, db.ForeignKey(Tonalitaet.id, ondelete="RESTRICT"), index=True
     )
 
     composer: Mapped[Person] = relationship(Person, lazy="selectin")
@@ -114,15 +115,17 @@ class Opus(db.Model, GetByID, UpdateableModelMixin):
                 self.composer = Person(**composer)
                 db.session.add(self.composer)
 
-        if "genre" in kwargs:
-            q = (
-                select(GattungNineteenthCentury)
-                .where(GattungNineteenthCentury.name == kwargs["genre"])
-                .limit(1)
-            )
-            genre = db.session.execute(q).scalar_one_or_none()
-            if genre:
-                self.genre = genre
+        for key, taxonomy in (
+            ("genre", GattungNineteenthCentury),
+            ("grundton", Grundton),
+            ("tonalitaet", Tonalitaet),
+        ):
+            if kwargs.get(key) is None:
+                continue
+            item_id = taxonomy.resolve_reference(kwargs[key])
+            item = taxonomy.get_by_id_or_dict(item_id, lazy=True)
+            if item is not None:
+                setattr(self, key, item)
 
     def __repr__(self):
         return "<Werk %r>" % self.name
@@ -227,6 +227,7 @@ class FormaleFunktionToPart(db.Model):
             FormaleFunktion.id, name="fk_formale_funktion_to_part_formale_funktion_id"
         ),
         primary_key=True,
+        index=True,
     )
 
     part: Mapped[Part] = relationship(
@@ -251,6 +252,7 @@ class AuftretenSatzToPart(db.Model):
             AuftretenSatz.id, name="fk_auftreten_satz_to_part_auftreten_satz_id"
         ),
         primary_key=True,
+        index=True,
     )
 
     part: Mapped[Part] = relationship(
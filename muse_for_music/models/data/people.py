@@ -5,6 +5,7 @@ from sqlalchemy.orm import MappedColumn
 
 from ... import db
 from ..helper_classes import GetByID, UpdateableModelMixin
+from ..taxonomies.version import track_model_changes
 
 
 class GenderEnum(enum.Enum):
@@ -55,3 +56,7 @@ class Person(db.Model, GetByID, UpdateableModelMixin):
 
     def __repr__(self):
         return "<Person %r>" % self.name
+
+
+# the version is used to rebuild the person autocomplete index
+track_model_changes(Person, "Person")
@@ -92,7 +92,7 @@ class AusdruckToRendition(db.Model):
         db.Integer, db.ForeignKey(Rendition.id), primary_key=True
     )
     ausdruck_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Ausdruck.id), primary_key=True
+        db.Integer, db.ForeignKey(Ausdruck.id), primary_key=True, index=True
     )
 
     rendition: Mapped[Rendition] = relationship(
@@ -110,7 +110,7 @@ class ArtikulationToRendition(db.Model):
         db.Integer, db.ForeignKey(Rendition.id), primary_key=True
     )
     artikulation_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Artikulation.id), primary_key=True
+        db.Integer, db.ForeignKey(Artikulation.id), primary_key=True, index=True
     )
 
     rendition: Mapped[Rendition] = relationship(
@@ -128,7 +128,7 @@ class SpielanweisungToRendition(db.Model):
         db.Integer, db.ForeignKey(Rendition.id), primary_key=True
     )
     spielanweisung_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Spielanweisung.id), primary_key=True
+        db.Integer, db.ForeignKey(Spielanweisung.id), primary_key=True, index=True
     )
 
     rendition: Mapped[Rendition] = relationship(
@@ -87,7 +87,7 @@ class TaktartToRhythm(db.Model):
         db.Integer, db.ForeignKey(Rhythm.id), primary_key=True
     )
     taktart_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Taktart.id), primary_key=True
+        db.Integer, db.ForeignKey(Taktart.id), primary_key=True, index=True
     )
 
     rhythm: Mapped[Rhythm] = relationship(Rhythm, back_populates="_measure_times")
@@ -103,7 +103,7 @@ class RhythmustypToRhythm(db.Model):
         db.Integer, db.ForeignKey(Rhythm.id), primary_key=True
     )
     rhythmustyp_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Rhythmustyp.id), primary_key=True
+        db.Integer, db.ForeignKey(Rhythmustyp.id), primary_key=True, index=True
     )
 
     rhythm: Mapped[Rhythm] = relationship(Rhythm, back_populates="_rhythm_types")
@@ -119,7 +119,7 @@ class RhythmischesPhaenomenToRhythm(db.Model):
         db.Integer, db.ForeignKey(Rhythm.id), primary_key=True
     )
     rhythmisches_phaenomen_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(RhythmischesPhaenomen.id), primary_key=True
+        db.Integer, db.ForeignKey(RhythmischesPhaenomen.id), primary_key=True, index=True
     )
 
     rhythm: Mapped[Rhythm] = relationship(Rhythm, back_populates="_rhythmic_phenomenons")
@@ -80,7 +80,7 @@ class SatzartAllgemeinToSatz(db.Model):
         db.Integer, db.ForeignKey(Satz.id), primary_key=True
     )
     satzart_allgemein_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(SatzartAllgemein.id), primary_key=True
+        db.Integer, db.ForeignKey(SatzartAllgemein.id), primary_key=True, index=True
     )
 
     satz: Mapped[Satz] = relationship(Satz, back_populates="_satzart_allgemein")
@@ -98,7 +98,7 @@ class SatzartSpeziellToSatz(db.Model):
         db.Integer, db.ForeignKey(Satz.id), primary_key=True
     )
     satzart_speziell_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(SatzartSpeziell.id), primary_key=True
+        db.Integer, db.ForeignKey(SatzartSpeziell.id), primary_key=True, index=True
     )
 
     satz: Mapped[Satz] = relationship(Satz, back_populates="_satzart_speziell")
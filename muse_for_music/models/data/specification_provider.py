@@ -108,10 +108,13 @@ class SpecificationProviderMixin:
                 "path": db.Column(db.Text),
                 "parent_id": db.Column(db.Integer, db.ForeignKey(f"{tablename}.id")),
                 "share_id": db.Column(
-                    db.Integer, db.ForeignKey(SpecAnteil.id), nullable=True
+                    db.Integer, db.ForeignKey(SpecAnteil.id), nullable=True, index=True
                 ),
                 "occurence_id": db.Column(
-                    db.Integer, db.ForeignKey(SpecAuftreten.id), nullable=True
+                    db.Integer,
+                    db.ForeignKey(SpecAuftreten.id),
+                    nullable=True,
+                    index=True,
                 ),
                 # relationships
                 "share": relationship(SpecAnteil, lazy="selectin"),
@@ -157,7 +160,10 @@ class SpecificationProviderMixin:
                         primary_key=True,
                     ),
                     "spezifikation_instrument_id": db.Column(
-                        db.Integer, db.ForeignKey(SpecInstrument.id), primary_key=True
+                        db.Integer,
+                        db.ForeignKey(SpecInstrument.id),
+                        primary_key=True,
+                        index=True,
                     ),
                     # relations
                     "specifications": relationship(
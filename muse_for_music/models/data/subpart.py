@@ -40,10 +40,10 @@ class SubPart(
     label: MappedColumn[str] = db.Column(db.String(191), nullable=False, default="A")
     measures: MappedColumn[str | None] = db.Column(db.Text, nullable=True)
     occurence_in_part_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(AuftretenWerkausschnitt.id), nullable=True
+        db.Integer, db.ForeignKey(AuftretenWerkausschnitt.id), nullable=True, index=True
     )
     share_of_part_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Anteil.id), nullable=True
+        db.Integer, db.ForeignKey(Anteil.id), nullable=True, index=True
     )
     instrumentation_id: MappedColumn[int | None] = db.Column(
         db.Integer, db.ForeignKey(Instrumentation.id)
@@ -20,16 +20,16 @@ class TempoContext(db.Model, GetByID, UpdateableModelMixin):
     id = db.Column(db.Integer, primary_key=True)
 
     tempo_context_before_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(TempoEinbettung.id), nullable=True
+        db.Integer, db.ForeignKey(TempoEinbettung.id), nullable=True, index=True
     )
     tempo_context_after_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(TempoEinbettung.id), nullable=True
+        db.Integer, db.ForeignKey(TempoEinbettung.id), nullable=True, index=True
     )
     tempo_trend_before_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(TempoEntwicklung.id), nullable=True
+        db.Integer, db.ForeignKey(TempoEntwicklung.id), nullable=True, index=True
     )
     tempo_trend_after_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(TempoEntwicklung.id), nullable=True
+        db.Integer, db.ForeignKey(TempoEntwicklung.id), nullable=True, index=True
     )
 
     tempo_context_before: Mapped[TempoEinbettung] = relationship(
@@ -103,7 +103,7 @@ class TempoToTempoGroup(db.Model):
         db.Integer, db.ForeignKey(TempoGroup.id), primary_key=True
     )
     tempo_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Tempo.id), primary_key=True
+        db.Integer, db.ForeignKey(Tempo.id), primary_key=True, index=True
     )
 
     tempo_group: Mapped[TempoGroup] = relationship(
@@ -121,7 +121,7 @@ class TempoEntwicklungToTempoGroup(db.Model):
         db.Integer, db.ForeignKey(TempoGroup.id), primary_key=True
     )
     tempo_entwicklung_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(TempoEntwicklung.id), primary_key=True
+        db.Integer, db.ForeignKey(TempoEntwicklung.id), primary_key=True, index=True
     )
 
     tempo_group: Mapped[TempoGroup] = relationship(
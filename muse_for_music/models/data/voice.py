@@ -84,14 +84,14 @@ class Voice(
     # stimmverlauf
     has_melody: MappedColumn[bool] = db.Column(db.Boolean, default=False)
     melody_form_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Melodieform.id), nullable=True
+        db.Integer, db.ForeignKey(Melodieform.id), nullable=True, index=True
     )
     # Einsatz der Stimme
     share_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(Anteil.id), nullable=True
+        db.Integer, db.ForeignKey(Anteil.id), nullable=True, index=True
     )
     occurence_in_part_id: MappedColumn[int | None] = db.Column(
-        db.Integer, db.ForeignKey(AuftretenWerkausschnitt.id), nullable=True
+        db.Integer, db.ForeignKey(AuftretenWerkausschnitt.id), nullable=True, index=True
     )
     composition_id: MappedColumn[int | None] = db.Column(
         db.Integer, db.ForeignKey(Composition.id), nullable=True
@@ -343,6 +343,7 @@ class MusikalischeWendungToVoice(db.Model):
             name="fk_musikalische_wendung_to_voice_musikalische_wendung_id",
         ),
         primary_key=True,
+        index=True,
     )
 
     voice: Mapped[Voice] = relationship(Voice, back_populates="_musicial_figures")
@@ -360,7 +361,7 @@ class MusikalischeFunktionToVoice(db.Model):
         db.Integer, db.ForeignKey(Voice.id), primary_key=True
     )
     musikalische_funktion_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(MusikalischeFunktion.id), primary_key=True
+        db.Integer, db.ForeignKey(MusikalischeFunktion.id), primary_key=True, index=True
     )
 
     voice: Mapped[Voice] = relationship(Voice, back_populates="_musicial_function")
@@ -380,7 +381,7 @@ class VerzierungToVoice(db.Model):
         db.Integer, db.ForeignKey(Voice.id), primary_key=True
     )
     verzierung_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Verzierung.id), primary_key=True
+        db.Integer, db.ForeignKey(Verzierung.id), primary_key=True, index=True
     )
 
     voice: Mapped[Voice] = relationship(Voice, back_populates="_ornaments")
@@ -396,7 +397,7 @@ class NotenwertToVoice(db.Model):
         db.Integer, db.ForeignKey(Voice.id), primary_key=True
     )
     notenwert_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Notenwert.id), primary_key=True
+        db.Integer, db.ForeignKey(Notenwert.id), primary_key=True, index=True
     )
 
     voice: Mapped[Voice] = relationship(Voice, back_populates="_dominant_note_values")
@@ -412,7 +413,7 @@ class IntervallikToVoice(db.Model):
         db.Integer, db.ForeignKey(Voice.id), primary_key=True
     )
     intervallik_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(Intervallik.id), primary_key=True
+        db.Integer, db.ForeignKey(Intervallik.id), primary_key=True, index=True
     )
 
     voice: Mapped[Voice] = relationship(Voice, back_populates="_intervallik")
@@ -435,7 +436,7 @@ class RelatedVoices(db.Model, GetByID, UpdateableModelMixin):
     voice_id: MappedColumn[int] = db.Column(db.Integer, db.ForeignKey(Voice.id))
     related_voice_id: MappedColumn[int] = db.Column(db.Integer, db.ForeignKey(Voice.id))
     type_of_relationship_id: MappedColumn[int] = db.Column(
-        db.Integer, db.ForeignKey(VoiceToVoiceRelation.id)
+        db.Integer, db.ForeignKey(VoiceToVoiceRelation.id), index=True
     )
 
     voice: Mapped[Voice] = relationship(
@@ -70,6 +70,26 @@ class GetByID:
             )
         )
 
+    @classmethod
+    def get_id_by_name(cls, name: str) -> int | None:
+        """Resolve a reference by name (only supported by taxonomies)."""
+        raise ValidationError("{} can not be referenced by name!".format(cls.__name__))
+
+    @classmethod
+    def resolve_reference(cls, reference: Union[int, dict, str, X, None]):
+        """Resolve a name reference to the item id.
+
+        Other references are returned unchanged.
+        """
+        if not isinstance(reference, str):
+            return reference
+        item_id = cls.get_id_by_name(reference)
+        if item_id is None:
+            raise ValidationError(
+                '{} "{}" does not exist.'.format(cls.__name__, reference)
+            )
+        return item_id
+
     @classmethod
     def get_by_id_or_dict(
         cls: Type[Self], id_: Union[int, dict, Self], lazy: bool = False
@@ -139,6 +159,7 @@ class UpdateableModelMixin:
                     setattr(self, name, None)
                     continue
                 cls = cast(GetByID, cls)
+                value = cls.resolve_reference(value)
                 if cls.get_id_from_object(getattr(self, name)) == cls.get_id_from_object(
                     value
                 ):
@@ -242,6 +263,7 @@ class UpdateListMixin:
                 item = item.get("id")
                 if item is None:
                     continue
+            item = item_cls.resolve_reference(item)
             item = cast(int, item)
             if item in old_items:
                 del old_items[item]
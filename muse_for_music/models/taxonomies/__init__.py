@@ -2,14 +2,14 @@ import csv
 import sys
 import traceback
 from glob import glob
-from inspect import getmembers, isclass
-from os import makedirs, path
-from typing import Dict, Type
+from os import path
+from typing import Dict, List, Tuple, Type
 
 import click
 from flask import current_app
 from flask.cli import with_appcontext
 from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.sql import delete, select
 from sqlalchemy.sql.functions import count
 
@@ -17,25 +17,38 @@ from .. import DB_CLI, DB_COMMAND_LOGGER, db
 
 # Import taxonomy models:
 from .ambitus import *  # noqa
+from .bulk import bulk_load_taxonomies, parse_taxonomy_files
 from .chords import *  # noqa
 from .citation import *  # noqa
+from .closure import TaxonomyClosure  # noqa
 from .composition import *  # noqa
 from .dissonance import *  # noqa
 from .dynamic import *  # noqa
 from .epoch import *  # noqa
+from .export import (
+    ExportedTaxonomy,
+    archive_format,
+    export_taxonomies,
+    write_to_archive,
+    write_to_folder,
+)
 from .form import *  # noqa
 from .gattung import *  # noqa
 from .harmonics import *  # noqa
 from .helper_classes import ListTaxonomy, Taxonomy, TreeTaxonomy  # noqa
 from .instruments import *  # noqa
+from .journal import TaxonomyChange, compact_journal  # noqa
 from .melody import *  # noqa
 from .misc import *  # noqa
 from .notes import *  # noqa
+from .registry import TaxonomyInfo, get_taxonomies, get_taxonomy_info  # noqa
 from .rendition import *  # noqa
 from .rhythm import *  # noqa
 from .satz import *  # noqa
 from .specifications import *  # noqa
+from .sync import TaxonomyDiff, apply_taxonomy_diff, diff_taxonomy
 from .tempo import *  # noqa
+from .version import TaxonomyVersion, get_taxonomy_versions  # noqa
 from .voices import *  # noqa
 
 
@@ -67,6 +80,7 @@ def generate_na_elements(output: bool = False):
             if output:
                 click.echo(f'Add NA item for "{name}".')
             db.session.add(taxonomy(name="na", description=None))
+            taxonomy.mark_changed()
         else:
             if output:
                 click.echo(f'"{name}" already has NA item.')
@@ -78,9 +92,9 @@ def remove_unreachable_elements(output: bool = False):
     for name, taxonomy in taxonomies.items():
         if not issubclass(taxonomy, TreeTaxonomy):
             continue
-        root = taxonomy.get_root()
-        all_item_ids_q = select(taxonomy.id).where(taxonomy.name != "na")
-        all_item_ids = set(db.session.execute(all_item_ids_q).scalars().all())
+        nodes = taxonomy.get_nodes()
+        root = next((node for node in nodes.values() if node.name == "root"), None)
+        all_item_ids = {node.id for node in nodes.values() if node.name != "na"}
         stack = [root]
         while stack:
             current = stack.pop()
@@ -94,14 +108,31 @@ def remove_unreachable_elements(output: bool = False):
                 )
             del_q = delete(taxonomy).where(taxonomy.id.in_(all_item_ids))
             db.session.execute(del_q)
+            # bulk deletes bypass the orm events maintaining the closure table
+            taxonomy.rebuild_closure()
+            taxonomy.mark_changed()
     db.session.commit()
 
 
 @DB_CLI.cli.command("init_taxonomies")
 @click.option("-r", "--reload", default=False, is_flag=True)
+@click.option(
+    "-b",
+    "--bulk",
+    default=False,
+    is_flag=True,
+    help="Load all taxonomies with bulk inserts in a single transaction.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Parse the csv files in this many processes (implies --bulk).",
+)
 @click.argument("folder_path")
 @with_appcontext
-def init_taxonomies(reload, folder_path: str):
+def init_taxonomies(reload, bulk, jobs, folder_path: str):
     """Init all taxonomies."""
     if not path.isdir(folder_path):
         click.echo("Please provide a path to a folder!")
@@ -112,6 +143,9 @@ def init_taxonomies(reload, folder_path: str):
     click.echo('Scanning folder "{}"'.format(folder_path))
     files = glob(path.join(folder_path, "*.csv"))
     taxonomies: dict[str, Type[Taxonomy]] = get_taxonomies()
+    if bulk or jobs > 1:
+        bulk_init_taxonomies(reload, jobs, files, taxonomies)
+        return
     unmatched_csv_files = []
     for file in files:
         name = path.splitext(path.basename(file))[0].upper()
@@ -137,6 +171,105 @@ def init_taxonomies(reload, folder_path: str):
         click.echo('No taxonomy table found for name "{}"'.format(name))
 
 
+def match_taxonomy_files(
+    files: List[str], taxonomies: Dict[str, Type[Taxonomy]]
+) -> Tuple[List[str], List[str]]:
+    """Split csv files into files matching a taxonomy and unmatched names."""
+    matched_files = []
+    unmatched_csv_files = []
+    for file in files:
+        name = path.splitext(path.basename(file))[0].upper()
+        if name in taxonomies:
+            matched_files.append(file)
+        else:
+            unmatched_csv_files.append(name)
+    return matched_files, unmatched_csv_files
+
+
+def bulk_init_taxonomies(
+    reload: bool, jobs: int, files: List[str], taxonomies: Dict[str, Type[Taxonomy]]
+):
+    matched_files, unmatched_csv_files = match_taxonomy_files(files, taxonomies)
+    click.echo("Parsing {} taxonomy files".format(len(matched_files)))
+    parsed_taxonomies = parse_taxonomy_files(matched_files, jobs=jobs)
+    click.echo("Loading taxonomies")
+    if not bulk_load_taxonomies(
+        parsed_taxonomies, taxonomies, DB_COMMAND_LOGGER, reload=reload
+    ):
+        click.echo("Loading taxonomies failed, no taxonomy was changed.", err=True)
+        return
+    click.echo("Finished processing all taxonomies.")
+    for name in unmatched_csv_files:
+        click.echo('No taxonomy table found for name "{}"'.format(name))
+
+
+def _apply_taxonomy_diffs(diffs: List[TaxonomyDiff]) -> bool:
+    """Apply and commit all diffs, roll back and report the error on failure."""
+    try:
+        for diff in diffs:
+            apply_taxonomy_diff(diff)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        click.echo(
+            "Some deleted taxonomy items are still in use, no taxonomy was changed.",
+            err=True,
+        )
+        return False
+    except ValueError as err:
+        db.session.rollback()
+        click.echo("{} No taxonomy was changed.".format(err), err=True)
+        return False
+    return True
+
+
+@DB_CLI.cli.command("sync_taxonomies")
+@click.option("--dry-run", default=False, is_flag=True, help="Only report the changes.")
+@click.option(
+    "-j",
+    "--jobs",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Parse the csv files in this many processes.",
+)
+@click.argument("folder_path")
+@with_appcontext
+def sync_taxonomies(dry_run, jobs, folder_path: str):
+    """Update all taxonomies to match the csv files while keeping item ids."""
+    if not path.isdir(folder_path):
+        click.echo("Please provide a path to a folder!")
+        return
+    folder_path = path.abspath(folder_path)
+    click.echo('Scanning folder "{}"'.format(folder_path))
+    files = glob(path.join(folder_path, "*.csv"))
+    taxonomies: dict[str, Type[Taxonomy]] = get_taxonomies()
+    matched_files, unmatched_csv_files = match_taxonomy_files(files, taxonomies)
+    diffs: List[TaxonomyDiff] = []
+    for parsed in parse_taxonomy_files(matched_files, jobs=jobs):
+        diff = diff_taxonomy(taxonomies[parsed.name], parsed.rows, DB_COMMAND_LOGGER)
+        if diff is None:
+            click.echo(
+                'Taxonomy "{}" could not be read, no taxonomy was changed.'.format(
+                    parsed.name
+                ),
+                err=True,
+            )
+            return
+        if diff:
+            click.echo('Changes for taxonomy "{}": '.format(parsed.name), nl=False)
+            click.echo("\n".join(diff.report()))
+            diffs.append(diff)
+    if not dry_run and not _apply_taxonomy_diffs(diffs):
+        return
+    click.echo(
+        "Finished syncing all taxonomies, {} taxonomies {}.".format(
+            len(diffs), "would change" if dry_run else "changed"
+        )
+    )
+    for name in unmatched_csv_files:
+        click.echo('No taxonomy table found for name "{}"'.format(name))
+
+
 @DB_CLI.cli.command("add_na_elements")
 @with_appcontext
 def add_na_elements():
@@ -154,35 +287,83 @@ def clean_disconnected_elements():
     click.echo("Finished removing all disconnected elements.")
 
 
+@DB_CLI.cli.command("rebuild_taxonomy_closure")
+@with_appcontext
+def rebuild_taxonomy_closure():
+    """Rebuild the closure tables of all tree taxonomies."""
+    for name, taxonomy in get_taxonomies().items():
+        if not issubclass(taxonomy, TreeTaxonomy):
+            continue
+        click.echo('Rebuilding closure table for "{}"'.format(name))
+        taxonomy.rebuild_closure()
+    db.session.commit()
+    click.echo("Finished rebuilding all closure tables.")
+
+
+@DB_CLI.cli.command("compact_taxonomy_journal")
+@click.option(
+    "-k",
+    "--keep",
+    default=100,
+    type=click.IntRange(min=0),
+    help="Keep the changes of this many versions per taxonomy.",
+)
+@with_appcontext
+def compact_taxonomy_journal(keep: int):
+    """Remove old entries from the taxonomy change journal.
+
+    Clients knowing an older version get a full snapshot instead of a delta.
+    """
+    removed = compact_journal(keep)
+    db.session.commit()
+    click.echo("Removed {} journal entries.".format(removed))
+
+
 @DB_CLI.cli.command("export_taxonomies")
-@click.argument("folder_path")
+@click.option(
+    "-t",
+    "--taxonomy",
+    "selected",
+    multiple=True,
+    help="Only export this taxonomy (can be used multiple times).",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    default=4,
+    type=click.IntRange(min=1),
+    help="Serialize the taxonomies in this many threads.",
+)
+@click.argument("target_path")
 @with_appcontext
-def save_taxonomies(folder_path: str):
-    """Export all taxonomies."""
-    folder_path = path.abspath(folder_path)
-    if path.isfile(folder_path):
-        click.echo("Please provide a path to a folder!")
-        return
-    makedirs(folder_path, exist_ok=True)
+def save_taxonomies(selected, jobs, target_path: str):
+    """Export all taxonomies into a folder or a single archive.
+
+    If the target path ends with .zip, .tar, .tar.gz or .tgz all csv files
+    are written into one archive together with a manifest.json.
+    """
+    target_path = path.abspath(target_path)
     taxonomies: Dict[str, Type[Taxonomy]] = get_taxonomies()
-    click.echo('Exporting taxonomies into folder "{}"'.format(folder_path))
-    for name, taxonomy in taxonomies.items():
-        filepath = path.join(folder_path, taxonomy.__name__ + ".csv")
-        click.echo('Preparing taxonomy "{}" for export'.format(name))
-        with open(filepath, mode="w") as csv_file:
-            writer = csv.DictWriter(
-                csv_file, ["name", "parent", "description"], dialect=csv.excel
-            )
-            taxonomy.save(writer, DB_COMMAND_LOGGER)
-        click.echo('Finished exporting taxonomy "{}"'.format(name))
-    click.echo("Finished exporting all taxonomies.")
+    if selected:
+        unknown = [name for name in selected if name.upper() not in taxonomies]
+        if unknown:
+            click.echo("Unknown taxonomies: {}".format(", ".join(unknown)), err=True)
+            sys.exit(1)
+        taxonomies = {name.upper(): taxonomies[name.upper()] for name in selected}
+    exported = export_taxonomies(list(taxonomies.values()), jobs, DB_COMMAND_LOGGER)
 
+    def on_written(taxonomy: ExportedTaxonomy):
+        click.echo(
+            'Exported taxonomy "{}" ({} rows)'.format(taxonomy.name, taxonomy.row_count)
+        )
 
-def get_taxonomies() -> Dict[str, Type[Taxonomy]]:
-    temp = {}
-    for name, member in getmembers(sys.modules[__name__], isclass):
-        if member is Taxonomy or member is TreeTaxonomy or member is ListTaxonomy:
-            continue
-        if issubclass(member, Taxonomy):
-            temp[name.upper()] = member
-    return temp
+    if archive_format(target_path) is not None:
+        click.echo('Exporting taxonomies into archive "{}"'.format(target_path))
+        write_to_archive(target_path, exported, on_written)
+    else:
+        if path.isfile(target_path):
+            click.echo("Please provide a path to a folder or an archive!")
+            return
+        click.echo('Exporting taxonomies into folder "{}"'.format(target_path))
+        write_to_folder(target_path, exported, on_written)
+    click.echo("Finished exporting all taxonomies.")
@@ -0,0 +1,337 @@
+"""Module containing the bulk csv import and batch inserts of taxonomies."""
+
+import csv
+import re
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from logging import Logger
+from os import path
+from typing import Any, Deque, Dict, List, NamedTuple, Sequence, Tuple, Type
+
+from sqlalchemy.sql import delete, func, insert, null, select, update
+
+from ... import db
+from .closure import insert_closure_items
+from .helper_classes import ListTaxonomy, Taxonomy, TreeTaxonomy
+from .journal import ChangeEnum, record_item_changes
+
+NAME_PREFIX_PATTERN = re.compile(r"^(\d+|\(\d+\)|\[\d+\]|\{\d+\}|<\d+>),?\s+")
+
+
+class ParsedTaxonomy(NamedTuple):
+    """The rows of a taxonomy csv file."""
+
+    name: str
+    file_path: str
+    rows: List[Dict[str, str]]
+
+
+class TreeRow(NamedTuple):
+    key: str
+    parent_key: str | None
+    name: str
+    description: str | None
+
+
+def parse_taxonomy_file(file_path: str) -> ParsedTaxonomy:
+    """Parse a taxonomy csv file.
+
+    The name of the taxonomy is the upper cased file name.
+    """
+    name = path.splitext(path.basename(file_path))[0].upper()
+    with open(file_path) as csv_file:
+        dialect = csv.Sniffer().sniff(csv_file.readline())
+        csv_file.seek(0)
+        rows = list(csv.DictReader(csv_file, dialect=dialect))
+    return ParsedTaxonomy(name, file_path, rows)
+
+
+def parse_taxonomy_files(files: Sequence[str], jobs: int = 1) -> List[ParsedTaxonomy]:
+    """Parse multiple taxonomy csv files.
+
+    Arguments:
+        files: Sequence[str] -- The paths of the csv files.
+        jobs: int -- Parse the files in this many worker processes if > 1.
+
+    Returns:
+        List[ParsedTaxonomy] -- The parsed files in the order of the paths.
+    """
+    if jobs <= 1 or len(files) <= 1:
+        return [parse_taxonomy_file(file_path) for file_path in files]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(parse_taxonomy_file, files, chunksize=4))
+
+
+def list_rows(
+    tax: Type[ListTaxonomy], rows: Sequence[Dict[str, str]], logger: Logger
+) -> List[Dict] | None:
+    """Validate the rows of a list taxonomy (see ListTaxonomy.load)."""
+    items: Dict[str, Dict] = {}
+    for row in rows:
+        name = row["name"]
+        if name.upper() == "ROOT":
+            continue
+        if name in items:
+            logger.warning(
+                'Duplicate names are not allowed! Found "%s" but name is already used.',
+                name,
+            )
+            return None
+        items[name] = {"name": name, "description": row.get("description")}
+    return list(items.values())
+
+
+def tree_levels(
+    tax: Type[TreeTaxonomy], rows: Sequence[Dict[str, str]], logger: Logger
+) -> List[List[TreeRow]] | None:
+    """Validate the rows of a tree taxonomy and group them by depth.
+
+    Items without parent that are not the root or the na item are dropped
+    together with their children as they would not be reachable from the
+    root (see remove_unreachable_elements).
+    """
+    depths: Dict[str, int] = {}
+    levels: List[List[TreeRow]] = []
+    root_key: str | None = None
+    for row in rows:
+        key = row["name"]
+        if key in depths:
+            logger.warning(
+                'Duplicate names are not allowed! Found "%s" but name is already used.',
+                key,
+            )
+            return None
+        parent_key = row.get("parent") or None
+        name = NAME_PREFIX_PATTERN.sub("", key)
+        if parent_key is None:
+            if name == "root" and root_key is None:
+                root_key = key
+            elif name != "na":
+                logger.warning('Item "%s" is not connected to the root.', key)
+                depths[key] = -1
+                continue
+            # items without parent get no description (see TreeTaxonomy.load)
+            tree_row = TreeRow(key, None, name, None)
+            depth = 0
+        else:
+            if parent_key not in depths:
+                logger.warning('Child "%s" defined before Parent "%s"!', key, parent_key)
+                return None
+            if depths[parent_key] < 0:
+                depths[key] = -1
+                continue
+            tree_row = TreeRow(key, parent_key, name, row.get("description"))
+            depth = depths[parent_key] + 1
+        depths[key] = depth
+        if depth == len(levels):
+            levels.append([])
+        levels[depth].append(tree_row)
+    if root_key is None:
+        logger.warning('Taxonomy "%s" has no root item!', tax.__name__)
+        return None
+    return levels
+
+
+def insert_selecting_ids(tax: Type[Taxonomy], values: List[Dict]) -> List[int]:
+    """Insert the items with executemany and select their ids afterwards.
+
+    For dbs without insert returning (e.g. mysql). The new rows are mapped
+    back to the values by parent and name in the order of their ids.
+    """
+    max_id = db.session.execute(select(func.max(tax.id))).scalar() or 0
+    db.session.execute(insert(tax), values)
+    has_parent = "parent_id" in values[0]
+    columns = [tax.id, tax.name, tax.parent_id if has_parent else null()]  # type: ignore
+    q = select(*columns).where(tax.id > max_id).order_by(tax.id)
+    new_ids: Dict[Tuple[str, int | None], Deque[int]] = defaultdict(deque)
+    for item_id, name, parent_id in db.session.execute(q):
+        new_ids[(name, parent_id)].append(item_id)
+    return [new_ids[(v["name"], v.get("parent_id"))].popleft() for v in values]
+
+
+def insert_returning_ids(tax: Type[Taxonomy], values: List[Dict]) -> List[int]:
+    """Insert the items in one statement and get their ids in the same order."""
+    if not values:
+        return []
+    dialect = db.session.get_bind().dialect
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        insert_q = insert(tax).returning(tax.id, sort_by_parameter_order=True)
+        return list(db.session.scalars(insert_q, values))
+    return insert_selecting_ids(tax, values)
+
+
+def bulk_load_list_taxonomy(
+    tax: Type[ListTaxonomy], rows: List[Dict], add_na: bool
+) -> int:
+    if rows and add_na and not any(row["name"] == "na" for row in rows):
+        rows = [*rows, {"name": "na", "description": None}]
+    if rows:
+        db.session.execute(insert(tax), rows)
+    return len(rows)
+
+
+def bulk_load_tree_taxonomy(
+    tax: Type[TreeTaxonomy], levels: List[List[TreeRow]], add_na: bool
+) -> int:
+    if add_na and not any(row.name == "na" for row in levels[0]):
+        levels[0].append(TreeRow("na", None, "na", None))
+    ids: Dict[str, int] = {}
+    item_count = 0
+    for level in levels:
+        values = [
+            {
+                "name": row.name,
+                "description": row.description,
+                "parent_id": ids[row.parent_key] if row.parent_key else None,
+            }
+            for row in level
+        ]
+        new_ids = insert_returning_ids(tax, values)
+        ids.update(zip((row.key for row in level), new_ids))
+        item_count += len(values)
+    tax.rebuild_closure()
+    return item_count
+
+
+def bulk_load_taxonomies(
+    parsed_taxonomies: Sequence[ParsedTaxonomy],
+    taxonomies: Dict[str, Type[Taxonomy]],
+    logger: Logger,
+    reload: bool = False,
+) -> bool:
+    """Load parsed taxonomies with set based inserts in a single transaction.
+
+    Missing na items are created together with the other items. Nothing is
+    written if any taxonomy could not be loaded.
+
+    Arguments:
+        parsed_taxonomies: Sequence[ParsedTaxonomy] -- The parsed csv files.
+        taxonomies: Dict[str, Type[Taxonomy]] -- All taxonomies by upper
+            cased name (see get_taxonomies).
+        logger: Logger -- The logger for progress and validation messages.
+        reload: bool -- Delete the existing items of the loaded taxonomies.
+
+    Returns:
+        bool -- True if all taxonomies were loaded.
+    """
+    try:
+        for parsed in parsed_taxonomies:
+            tax = taxonomies[parsed.name]
+            if reload:
+                # closure tables are rebuilt after the insert
+                if issubclass(tax, TreeTaxonomy):
+                    # the parent foreign key would block deleting parents
+                    # before their children (e.g. on mysql)
+                    db.session.execute(update(tax).values(parent_id=None))
+                db.session.execute(delete(tax))
+                add_na = True
+            else:
+                na_q = select(tax.id).where(tax.name == "na").limit(1)
+                add_na = db.session.execute(na_q).first() is None
+            if issubclass(tax, TreeTaxonomy):
+                levels = tree_levels(tax, parsed.rows, logger)
+                if levels is None:
+                    logger.error('Taxonomy "%s" could not be loaded!', tax.__name__)
+                    db.session.rollback()
+                    return False
+                item_count = bulk_load_tree_taxonomy(tax, levels, add_na)
+            else:
+                assert issubclass(tax, ListTaxonomy)
+                rows = list_rows(tax, parsed.rows, logger)
+                if rows is None:
+                    logger.error('Taxonomy "%s" could not be loaded!', tax.__name__)
+                    db.session.rollback()
+                    return False
+                item_count = bulk_load_list_taxonomy(tax, rows, add_na)
+            tax.mark_changed()
+            logger.info('Loaded %d items into taxonomy "%s".', item_count, parsed.name)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return True
+
+
+RESERVED_NAMES = ("root", "na")
+
+
+def _batch_levels(
+    items: Sequence[Any],
+) -> Tuple[List[List[Tuple[int, int | None, Dict]]], int]:
+    """Validate nested new items and group them by depth.
+
+    Returns:
+        Tuple -- The levels of (pre order index, parent index, values) and the
+            total number of items.
+    """
+    levels: List[List[Tuple[int, int | None, Dict]]] = []
+    count = 0
+    stack: List[Tuple[Any, int | None, int]] = [
+        (item, None, 0) for item in reversed(items)
+    ]
+    while stack:
+        item, parent_index, depth = stack.pop()
+        if not isinstance(item, dict):
+            raise ValueError("Every item must be an object!")
+        name = item.get("name")
+        if not isinstance(name, str) or not name:
+            raise ValueError("Every item needs a name!")
+        if name in RESERVED_NAMES:
+            raise ValueError('Name "{}" is forbidden!'.format(name))
+        description = item.get("description")
+        if description is not None and not isinstance(description, str):
+            raise ValueError('The description of "{}" must be a string!'.format(name))
+        children = item.get("children", [])
+        if not isinstance(children, list):
+            raise ValueError('The children of "{}" must be a list!'.format(name))
+        index = count
+        count += 1
+        if depth == len(levels):
+            levels.append([])
+        levels[depth].append(
+            (index, parent_index, {"name": name, "description": description})
+        )
+        stack.extend((child, index, depth + 1) for child in reversed(children))
+    return levels, count
+
+
+def insert_tree_items(
+    tax: Type[TreeTaxonomy], parent_id: int, items: Sequence[Any]
+) -> List[int]:
+    """Insert nested new items below an existing item with set based inserts.
+
+    The items are inserted level by level (one insert per level) together
+    with their closure table rows. The caller commits the transaction.
+
+    Arguments:
+        tax: Type[TreeTaxonomy] -- The taxonomy to insert the items into.
+        parent_id: int -- The id of the existing parent item.
+        items: Sequence[Dict] -- The new items with name, description and
+            (optional) nested children.
+
+    Raises:
+        ValueError: If an item is malformed or uses a reserved name.
+
+    Returns:
+        List[int] -- The ids of the new items in pre order.
+    """
+    levels, count = _batch_levels(items)
+    ids: List[int] = [0] * count
+    closure_items: List[Tuple[int, int | None]] = []
+    for level in levels:
+        values = [
+            {
+                **item_values,
+                "parent_id": parent_id if parent_index is None else ids[parent_index],
+            }
+            for _, parent_index, item_values in level
+        ]
+        for (index, _, _), item_values, new_id in zip(
+            level, values, insert_returning_ids(tax, values)
+        ):
+            ids[index] = new_id
+            closure_items.append((new_id, item_values["parent_id"]))
+    insert_closure_items(db.session.connection(), tax.__tablename__, closure_items)
+    record_item_changes(tax, ChangeEnum.insert, ids)
+    tax.mark_changed()
+    return ids
@@ -0,0 +1,230 @@
+"""Module containing the closure table index of all tree taxonomies."""
+
+from collections import defaultdict
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+from sqlalchemy import event, inspect, literal, true
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapper, MappedColumn
+from sqlalchemy.sql import delete, insert, select
+
+from ... import db
+
+
+class TaxonomyClosure(db.Model):
+    """DB Model for the ancestor/descendant relation of tree taxonomy items.
+
+    Every item has one row for each of its ancestors (including itself with
+    depth 0). This allows subtree queries with a single indexed predicate.
+    """
+
+    __tablename__ = "taxonomy_closure"
+
+    taxonomy: MappedColumn[str] = db.Column(db.String(120), primary_key=True)
+    ancestor_id: MappedColumn[int] = db.Column(db.Integer, primary_key=True)
+    descendant_id: MappedColumn[int] = db.Column(db.Integer, primary_key=True)
+    depth: MappedColumn[int] = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_taxonomy_closure_descendant", "taxonomy", "descendant_id"),
+    )
+
+
+def closure_rows(taxonomy: str, parents: Mapping[int, int | None]) -> List[Dict]:
+    """Compute the closure table rows of a tree.
+
+    Arguments:
+        taxonomy: str -- The table name of the tree taxonomy.
+        parents: Mapping[int, int | None] -- The parent id of every item id.
+
+    Returns:
+        List[Dict] -- The rows for the closure table.
+    """
+    rows = []
+    for item_id in parents:
+        ancestor_id: int | None = item_id
+        depth = 0
+        seen = set()
+        while ancestor_id is not None and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            rows.append(
+                {
+                    "taxonomy": taxonomy,
+                    "ancestor_id": ancestor_id,
+                    "descendant_id": item_id,
+                    "depth": depth,
+                }
+            )
+            ancestor_id = parents.get(ancestor_id)
+            depth += 1
+    return rows
+
+
+def subtree_ids_query(taxonomy: str, item_id: int):
+    """Select the ids of an item and all of its descendants."""
+    return select(TaxonomyClosure.descendant_id).where(
+        TaxonomyClosure.taxonomy == taxonomy,
+        TaxonomyClosure.ancestor_id == item_id,
+    )
+
+
+def delete_closure_subtree(connection: Connection, taxonomy: str, subtree: Sequence[int]):
+    """Remove all closure rows of the given (deleted) items."""
+    if not subtree:
+        return
+    connection.execute(
+        delete(TaxonomyClosure).where(
+            TaxonomyClosure.taxonomy == taxonomy,
+            TaxonomyClosure.descendant_id.in_(subtree),
+        )
+    )
+
+
+def insert_closure_items(
+    connection: Connection, taxonomy: str, items: Sequence[Tuple[int, int | None]]
+):
+    """Add the closure rows of new items with a single insert.
+
+    The paths of the existing parents are read with one select, the paths of
+    the new items are computed in python from their parents.
+
+    Arguments:
+        connection: Connection -- The connection of the current transaction.
+        taxonomy: str -- The table name of the tree taxonomy.
+        items: Sequence[Tuple[int, int | None]] -- The (id, parent_id) pairs
+            of the new items, parents before their children.
+    """
+    if not items:
+        return
+    new_ids = {item_id for item_id, _ in items}
+    existing_parents = {
+        parent_id
+        for _, parent_id in items
+        if parent_id is not None and parent_id not in new_ids
+    }
+    # ancestor paths (ancestor_id, depth) of every item, including itself
+    paths: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+    if existing_parents:
+        ancestors_q = select(
+            TaxonomyClosure.descendant_id,
+            TaxonomyClosure.ancestor_id,
+            TaxonomyClosure.depth,
+        ).where(
+            TaxonomyClosure.taxonomy == taxonomy,
+            TaxonomyClosure.descendant_id.in_(existing_parents),
+        )
+        for descendant_id, ancestor_id, depth in connection.execute(ancestors_q):
+            paths[descendant_id].append((ancestor_id, depth))
+    rows = []
+    for item_id, parent_id in items:
+        item_paths = paths[item_id]
+        item_paths.append((item_id, 0))
+        if parent_id is not None:
+            item_paths.extend(
+                (ancestor_id, depth + 1) for ancestor_id, depth in paths[parent_id]
+            )
+        rows.extend(
+            {
+                "taxonomy": taxonomy,
+                "ancestor_id": ancestor_id,
+                "descendant_id": item_id,
+                "depth": depth,
+            }
+            for ancestor_id, depth in item_paths
+        )
+    connection.execute(insert(TaxonomyClosure), rows)
+
+
+def insert_closure_item(connection: Connection, taxonomy: str, item_id: int, parent_id):
+    """Add the closure rows of a new leaf item below the given parent."""
+    connection.execute(
+        insert(TaxonomyClosure).values(
+            taxonomy=taxonomy, ancestor_id=item_id, descendant_id=item_id, depth=0
+        )
+    )
+    if parent_id is None:
+        return
+    ancestors_q = select(
+        literal(taxonomy),
+        TaxonomyClosure.ancestor_id,
+        literal(item_id),
+        TaxonomyClosure.depth + 1,
+    ).where(
+        TaxonomyClosure.taxonomy == taxonomy,
+        TaxonomyClosure.descendant_id == parent_id,
+    )
+    connection.execute(
+        insert(TaxonomyClosure).from_select(
+            ["taxonomy", "ancestor_id", "descendant_id", "depth"], ancestors_q
+        )
+    )
+
+
+def move_closure_item(connection: Connection, taxonomy: str, item_id: int, parent_id):
+    """Update the closure rows of a subtree moved below a new parent."""
+    subtree = connection.execute(subtree_ids_query(taxonomy, item_id)).scalars().all()
+    # remove all paths from old ancestors into the subtree
+    connection.execute(
+        delete(TaxonomyClosure).where(
+            TaxonomyClosure.taxonomy == taxonomy,
+            TaxonomyClosure.descendant_id.in_(subtree),
+            TaxonomyClosure.ancestor_id.not_in(subtree),
+        )
+    )
+    if parent_id is None:
+        return
+    if parent_id in subtree:
+        raise ValueError("A taxonomy item cannot be moved below its own descendant!")
+    new_ancestors = TaxonomyClosure.__table__.alias("new_ancestors")
+    subtree_paths = TaxonomyClosure.__table__.alias("subtree_paths")
+    # cross join every new ancestor with every item of the moved subtree
+    paths_q = (
+        select(
+            literal(taxonomy),
+            new_ancestors.c.ancestor_id,
+            subtree_paths.c.descendant_id,
+            new_ancestors.c.depth + subtree_paths.c.depth + 1,
+        )
+        .select_from(new_ancestors.join(subtree_paths, true()))
+        .where(
+            new_ancestors.c.taxonomy == taxonomy,
+            new_ancestors.c.descendant_id == parent_id,
+            subtree_paths.c.taxonomy == taxonomy,
+            subtree_paths.c.ancestor_id == item_id,
+        )
+    )
+    connection.execute(
+        insert(TaxonomyClosure).from_select(
+            ["taxonomy", "ancestor_id", "descendant_id", "depth"], paths_q
+        )
+    )
+
+
+def register_closure_maintenance(tree_taxonomy_cls: type):
+    """Keep the closure table in sync with ORM writes to tree taxonomies.
+
+    Items deleted by the db through cascading foreign keys are removed
+    together with the deleted subtree root.
+    """
+
+    @event.listens_for(tree_taxonomy_cls, "after_insert", propagate=True)
+    def closure_after_insert(mapper: Mapper, connection: Connection, target):
+        insert_closure_item(
+            connection, mapper.local_table.name, target.id, target.parent_id
+        )
+
+    @event.listens_for(tree_taxonomy_cls, "after_update", propagate=True)
+    def closure_after_update(mapper: Mapper, connection: Connection, target):
+        if not inspect(target).attrs.parent_id.history.has_changes():
+            return
+        move_closure_item(
+            connection, mapper.local_table.name, target.id, target.parent_id
+        )
+
+    @event.listens_for(tree_taxonomy_cls, "after_delete", propagate=True)
+    def closure_after_delete(mapper: Mapper, connection: Connection, target):
+        taxonomy = mapper.local_table.name
+        subtree = (
+            connection.execute(subtree_ids_query(taxonomy, target.id)).scalars().all()
+        )
+        delete_closure_subtree(connection, taxonomy, subtree)
@@ -0,0 +1,183 @@
+"""Module containing the parallel export of taxonomies to csv files."""
+
+import csv
+import io
+import json
+import tarfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from logging import Logger
+from os import makedirs, path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Sequence,
+    Type,
+)
+
+from .helper_classes import Taxonomy
+
+CSV_FIELDS = ["name", "parent", "description"]
+
+ARCHIVE_FORMATS = {
+    ".zip": "zip",
+    ".tar": "tar",
+    ".tar.gz": "gztar",
+    ".tgz": "gztar",
+}
+
+
+class ExportedTaxonomy(NamedTuple):
+    """A serialized taxonomy csv file."""
+
+    name: str
+    file_name: str
+    taxonomy_type: str
+    version: int
+    row_count: int
+    content: bytes
+
+
+def archive_format(target_path: str) -> str | None:
+    """Get the archive format from the file extension of the target path."""
+    for extension, archive_type in ARCHIVE_FORMATS.items():
+        if target_path.lower().endswith(extension):
+            return archive_type
+    return None
+
+
+def serialize_rows(rows: Iterator[Dict[str, str | None]]) -> tuple[bytes, int]:
+    """Write the rows exactly like the csv export of a single taxonomy.
+
+    Returns:
+        tuple[bytes, int] -- The encoded csv file and the number of rows
+            (without the header).
+    """
+    output = io.StringIO(newline="")
+    writer = csv.DictWriter(output, CSV_FIELDS, dialect=csv.excel)
+    writer.writeheader()
+    row_count = 0
+    for row in rows:
+        writer.writerow(row)
+        row_count += 1
+    return output.getvalue().encode(), row_count
+
+
+def _serialize(
+    tax: Type[Taxonomy], version: int, data: Any, logger: Logger
+) -> ExportedTaxonomy:
+    content, row_count = serialize_rows(tax.export_rows(data, logger))
+    return ExportedTaxonomy(
+        tax.__name__,
+        tax.__name__ + ".csv",
+        tax.taxonomy_type,
+        version,
+        row_count,
+        content,
+    )
+
+
+def export_taxonomies(
+    taxonomies: Sequence[Type[Taxonomy]], jobs: int, logger: Logger
+) -> Iterator[ExportedTaxonomy]:
+    """Serialize taxonomies concurrently.
+
+    The data of every taxonomy is loaded with a single query in the calling
+    thread (the db session is bound to the app context) and handed to the
+    thread pool right away. Finished csv files are yielded in the order of
+    the taxonomies while the next taxonomies load, at most `jobs` loaded
+    taxonomies are waiting to be yielded.
+    """
+    pending: Deque[Future[ExportedTaxonomy]] = deque()
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for tax in taxonomies:
+            pending.append(
+                executor.submit(
+                    _serialize, tax, tax.get_version(), tax.export_data(), logger
+                )
+            )
+            while pending and (pending[0].done() or len(pending) > jobs):
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def manifest(exported: List[ExportedTaxonomy]) -> bytes:
+    """Describe the exported files with their versions and row counts."""
+    content = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "taxonomies": [
+            {
+                "name": taxonomy.name,
+                "file": taxonomy.file_name,
+                "type": taxonomy.taxonomy_type,
+                "version": taxonomy.version,
+                "rows": taxonomy.row_count,
+            }
+            for taxonomy in exported
+        ],
+    }
+    return json.dumps(content, indent=2).encode()
+
+
+def write_to_folder(
+    folder_path: str,
+    taxonomies: Iterator[ExportedTaxonomy],
+    on_written: Callable[[ExportedTaxonomy], None] | None = None,
+) -> List[ExportedTaxonomy]:
+    """Write the csv files into a folder (without a manifest)."""
+    makedirs(folder_path, exist_ok=True)
+    written = []
+    for taxonomy in taxonomies:
+        with open(path.join(folder_path, taxonomy.file_name), mode="wb") as csv_file:
+            csv_file.write(taxonomy.content)
+        written.append(taxonomy._replace(content=b""))
+        if on_written:
+            on_written(taxonomy)
+    return written
+
+
+def write_to_archive(
+    archive_path: str,
+    taxonomies: Iterator[ExportedTaxonomy],
+    on_written: Callable[[ExportedTaxonomy], None] | None = None,
+) -> List[ExportedTaxonomy]:
+    """Stream the csv files into a zip or tar archive with a manifest.json."""
+    archive_type = archive_format(archive_path)
+    if archive_type is None:
+        raise ValueError('Unknown archive format of "{}"!'.format(archive_path))
+    written: List[ExportedTaxonomy] = []
+    if archive_type == "zip":
+        with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for taxonomy in taxonomies:
+                archive.writestr(taxonomy.file_name, taxonomy.content)
+                written.append(taxonomy._replace(content=b""))
+                if on_written:
+                    on_written(taxonomy)
+            archive.writestr("manifest.json", manifest(written))
+        return written
+
+    mode = "w:gz" if archive_type == "gztar" else "w"
+    with tarfile.open(archive_path, mode) as archive:  # type: ignore
+
+        def add_file(name: str, content: bytes):
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            info.mtime = int(time.time())
+            archive.addfile(info, io.BytesIO(content))
+
+        for taxonomy in taxonomies:
+            add_file(taxonomy.file_name, taxonomy.content)
+            written.append(taxonomy._replace(content=b""))
+            if on_written:
+                on_written(taxonomy)
+        add_file("manifest.json", manifest(written))
+    return written
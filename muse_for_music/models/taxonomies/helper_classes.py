@@ -2,14 +2,22 @@ import re
 from collections import OrderedDict
 from csv import DictReader, DictWriter
 from logging import Logger
-from typing import ClassVar, List, Sequence, Type, Union
+from typing import ClassVar, Dict, Iterator, List, Sequence, Tuple, Type, Union
 
 from sqlalchemy.orm import Mapped, MappedColumn, selectinload
-from sqlalchemy.sql import select
+from sqlalchemy.sql import ColumnElement, and_, case, delete, func, insert, select
 from typing_extensions import Self
 
 from ... import db
 from ..helper_classes import GetByID
+from .closure import (
+    TaxonomyClosure,
+    closure_rows,
+    register_closure_maintenance,
+    subtree_ids_query,
+)
+from .registry import get_taxonomy_info, register_taxonomy
+from .version import get_taxonomy_versions, mark_taxonomy_changed
 
 
 class Taxonomy(GetByID):
@@ -24,17 +32,43 @@ class Taxonomy(GetByID):
     description: MappedColumn[str | None]
     mapping: MappedColumn[str | None]
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if issubclass(cls, db.Model):  # skip the abstract base classes
+            register_taxonomy(cls)
+
     def __init__(self, name: str, description: str | None) -> None:
         """Create new List Taxonomy object."""
         self.name = name
         self.description = description
 
+    @property
+    def taxonomy_name(self) -> str:
+        """Get the name of the taxonomy of this item."""
+        return type(self).__name__
+
+    @classmethod
+    def get_version(cls) -> int:
+        """Get the current content version of the taxonomy."""
+        return get_taxonomy_versions().get(cls.__name__, 0)
+
+    @classmethod
+    def mark_changed(cls):
+        """Mark the taxonomy content as changed.
+
+        Must be called by every code path writing to the taxonomy. The version
+        is bumped in the db when the current transaction is committed.
+        """
+        mark_taxonomy_changed(cls.__name__)
+        get_taxonomy_info(cls).forget_cached_items()
+
     @classmethod
     def clear_all(cls, logger: Logger):
         q = select(cls)
         objects = db.session.execute(q).scalars().all()
         for obj in objects:
             db.session.delete(obj)
+        cls.mark_changed()
         db.session.commit()
 
     @classmethod
@@ -43,16 +77,46 @@ class Taxonomy(GetByID):
 
     @classmethod
     def save(cls, output_data: DictWriter, logger: Logger):
+        output_data.writeheader()
+        output_data.writerows(cls.export_rows(cls.export_data(), logger))
+
+    @classmethod
+    def export_data(cls):
+        """Load everything needed for the export with a single query."""
+        raise NotImplementedError
+
+    @classmethod
+    def export_rows(cls, data, logger: Logger) -> Iterator[Dict[str, str | None]]:
+        """Get the csv rows of the export data.
+
+        Does not access the db, so it can run outside of the app context.
+        """
         raise NotImplementedError
 
     @classmethod
     def items(cls) -> Union[Sequence[Self], Self, None]:
         raise NotImplementedError
 
+    @classmethod
+    def get_id_by_name(cls, name: str) -> int | None:
+        """Get the id of the item with the given name from the cached names."""
+        return get_taxonomy_info(cls).name_ids.get(name)
+
+    @classmethod
+    def get_by_name(cls: Type[Self], name: str) -> Self | None:
+        """Get the item with the given name.
+
+        Uses the cached name map and the identity map of the session, so no
+        query is issued for items already loaded in this session.
+        """
+        item_id = cls.get_id_by_name(name)
+        if item_id is None:
+            return None
+        return db.session.get(cls, item_id)
+
     @classmethod
     def not_applicable_item(cls):
-        q = select(cls).where(cls.name == "na").limit(1)
-        return db.session.execute(q).scalar_one_or_none()
+        return cls.get_by_name("na")
 
 
 class ListTaxonomy(Taxonomy):
@@ -90,33 +154,85 @@ class ListTaxonomy(Taxonomy):
         else:
             for value in items.values():
                 db.session.add(value)
+            cls.mark_changed()
             db.session.commit()
             return
         logger.error('Taxonomy "{}" could not be loaded!'.format(cls.__name__))
 
     @classmethod
-    def save(cls, output_data: DictWriter, logger: Logger):
-        output_data.writeheader()
-        output_data.writerow(
-            {
-                "name": "root",
-                "parent": "",
-                "description": "",
+    def export_data(cls) -> Sequence[Tuple[str, str | None]]:
+        q = select(cls.name, cls.description).where(cls.name != "na")
+        return [tuple(row) for row in db.session.execute(q)]
+
+    @classmethod
+    def export_rows(
+        cls, data: Sequence[Tuple[str, str | None]], logger: Logger
+    ) -> Iterator[Dict[str, str | None]]:
+        yield {
+            "name": "root",
+            "parent": "",
+            "description": "",
+        }
+        names = set()
+        for name, description in data:
+            if name in names:
+                logger.warning('An item with name "%s" was already exported!', name)
+            names.add(name)
+            yield {
+                "name": name,
+                "parent": "root",
+                "description": description,
             }
+
+
+class TreeTaxonomyNode:
+    """Lightweight node of a tree taxonomy item.
+
+    Nodes are not attached to the db session. They provide the attributes
+    needed to marshal or export a tree without any lazy loading.
+    """
+
+    __slots__ = (
+        "taxonomy_name",
+        "id",
+        "parent_id",
+        "name",
+        "description",
+        "mapping",
+        "parent",
+        "children",
+        "child_count",
+        "descendant_count",
+    )
+
+    taxonomy_type = "tree"
+
+    def __init__(
+        self,
+        taxonomy_name: str,
+        id: int,
+        parent_id: int | None,
+        name: str,
+        description: str | None,
+        mapping: str | None,
+    ) -> None:
+        self.taxonomy_name = taxonomy_name
+        self.id = id
+        self.parent_id = parent_id
+        self.name = name
+        self.description = description
+        self.mapping = mapping
+        self.parent: TreeTaxonomyNode | None = None
+        self.children: List[TreeTaxonomyNode] = []
+        # only set for subtrees loaded with a depth limit (see get_subtree)
+        self.child_count: int | None = None
+        self.descendant_count: int | None = None
+
+    def __repr__(self):
+        """Get repr of node."""
+        return '<{} node "{}", {} children>'.format(
+            self.taxonomy_name, self.name, len(self.children)
         )
-        items = cls.get_all()
-        names = set()
-        for item in items:
-            if item.name in names:
-                logger.warning('An item with name "%s" was already exported!', item.name)
-            names.add(item.name)
-            output_data.writerow(
-                {
-                    "name": item.name,
-                    "parent": "root",
-                    "description": item.description,
-                }
-            )
 
 
 class TreeTaxonomy(Taxonomy):
@@ -157,7 +273,154 @@ class TreeTaxonomy(Taxonomy):
                 return item
         return None
 
-    items = get_root
+    @classmethod
+    def get_nodes(
+        cls, root_id: int | None = None, max_depth: int | None = None
+    ) -> Dict[int, TreeTaxonomyNode]:
+        """Load the items with a single query and link them as tree nodes.
+
+        Arguments:
+            root_id: int | None -- Only load the subtree of this item if given.
+            max_depth: int | None -- Only load descendants of the subtree root
+                up to this depth (requires root_id).
+
+        Returns:
+            Dict[int, TreeTaxonomyNode] -- The linked nodes by item id.
+        """
+        q = select(cls.id, cls.parent_id, cls.name, cls.description, cls.mapping)
+        if root_id is not None and max_depth is not None:
+            # the closure table primary key index covers this lookup
+            q = q.join(
+                TaxonomyClosure,
+                and_(
+                    TaxonomyClosure.taxonomy == cls.__tablename__,
+                    TaxonomyClosure.descendant_id == cls.id,
+                ),
+            ).where(
+                TaxonomyClosure.ancestor_id == root_id,
+                TaxonomyClosure.depth <= max_depth,
+            )
+        elif root_id is not None:
+            q = q.where(cls.in_subtree(cls.id, root_id))
+        q = q.order_by(cls.id)
+        nodes = {
+            row.id: TreeTaxonomyNode(cls.__name__, *row) for row in db.session.execute(q)
+        }
+        for node in nodes.values():
+            if node.parent_id is None:
+                continue
+            parent = nodes.get(node.parent_id)
+            if parent is not None:
+                node.parent = parent
+                parent.children.append(node)
+        return nodes
+
+    @classmethod
+    def get_tree(cls, root_id: int | None = None) -> TreeTaxonomyNode | None:
+        """Get the root node of the taxonomy (or the given subtree).
+
+        Arguments:
+            root_id: int | None -- The id of the subtree root. Defaults to the
+                root of the taxonomy.
+
+        Returns:
+            TreeTaxonomyNode | None -- The root node with all descendants.
+        """
+        nodes = cls.get_nodes(root_id)
+        if root_id is not None:
+            return nodes.get(root_id)
+        for node in nodes.values():
+            if node.name == "root":
+                return node
+        return None
+
+    items = get_tree
+
+    @classmethod
+    def get_subtree(cls, root_id: int, max_depth: int) -> TreeTaxonomyNode | None:
+        """Get an item with its descendants up to the given depth.
+
+        Every returned node gets a child_count and a descendant_count. Only
+        the counts of nodes without loaded children are queried, the other
+        counts are summed up from the loaded nodes.
+
+        Arguments:
+            root_id: int -- The id of the subtree root.
+            max_depth: int -- The depth of the deepest returned descendants.
+
+        Returns:
+            TreeTaxonomyNode | None -- The root node of the truncated subtree.
+        """
+        nodes = cls.get_nodes(root_id, max_depth)
+        root = nodes.get(root_id)
+        if root is None:
+            return None
+        boundary = [node.id for node in nodes.values() if not node.children]
+        counts_q = (
+            select(
+                TaxonomyClosure.ancestor_id,
+                func.sum(case((TaxonomyClosure.depth == 1, 1), else_=0)),
+                func.count(),
+            )
+            .where(
+                TaxonomyClosure.taxonomy == cls.__tablename__,
+                TaxonomyClosure.ancestor_id.in_(boundary),
+                TaxonomyClosure.depth > 0,
+            )
+            .group_by(TaxonomyClosure.ancestor_id)
+        )
+        counts = {
+            item_id: (child_count, descendant_count)
+            for item_id, child_count, descendant_count in db.session.execute(counts_q)
+        }
+        stack = [(root, False)]
+        while stack:  # fill in the counts bottom up
+            node, children_done = stack.pop()
+            if not node.children:
+                node.child_count, node.descendant_count = counts.get(node.id, (0, 0))
+            elif children_done:
+                node.child_count = len(node.children)
+                node.descendant_count = sum(
+                    1 + child.descendant_count for child in node.children
+                )
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children)
+        return root
+
+    @classmethod
+    def subtree_ids(cls, item_id: int):
+        """Select the ids of the item and all its descendants."""
+        return subtree_ids_query(cls.__tablename__, item_id)  # type: ignore
+
+    @classmethod
+    def in_subtree(cls, column, item_id: int) -> ColumnElement[bool]:
+        """Filter for item ids in the subtree of the given item.
+
+        Arguments:
+            column -- The column containing item ids of this taxonomy.
+            item_id: int -- The id of the subtree root (part of the subtree).
+
+        Returns:
+            ColumnElement[bool] -- The filter predicate.
+        """
+        return column.in_(cls.subtree_ids(item_id))
+
+    @classmethod
+    def rebuild_closure(cls):
+        """Rebuild the closure table rows of this taxonomy from scratch."""
+        taxonomy: str = cls.__tablename__  # type: ignore
+        parents_q = select(cls.id, cls.parent_id)
+        parents = {
+            item_id: parent_id
+            for item_id, parent_id in db.session.execute(parents_q).all()
+        }
+        db.session.execute(
+            delete(TaxonomyClosure).where(TaxonomyClosure.taxonomy == taxonomy)
+        )
+        rows = closure_rows(taxonomy, parents)
+        if rows:
+            db.session.execute(insert(TaxonomyClosure), rows)
 
     @classmethod
     def load(cls, input_data: DictReader, logger: Logger):
@@ -187,15 +450,21 @@ class TreeTaxonomy(Taxonomy):
         else:
             for value in items.values():
                 db.session.add(value)
+            cls.mark_changed()
             db.session.commit()
             return
         logger.error('Taxonomy "{}" could not be loaded!'.format(cls.__name__))
 
     @classmethod
-    def save(cls, output_data: DictWriter, logger: Logger):
-        output_data.writeheader()
+    def export_data(cls) -> TreeTaxonomyNode | None:
+        return cls.get_tree()
+
+    @classmethod
+    def export_rows(
+        cls, data: TreeTaxonomyNode | None, logger: Logger
+    ) -> Iterator[Dict[str, str | None]]:
         stack = []
-        stack.append(cls.get_root())
+        stack.append(data)
         names = {}
         name_mappings = {}
         while len(stack) > 0:
@@ -208,16 +477,17 @@ class TreeTaxonomy(Taxonomy):
                 name_mappings[item.id] = "({count}) {name}".format(
                     count=count, name=item.name
                 )
-            output_data.writerow(
-                {
-                    "name": name_mappings.get(item.id, item.name),
-                    "parent": (
-                        ""
-                        if item.name.upper() == "ROOT"
-                        else name_mappings.get(item.parent.id, item.parent.name)
-                    ),
-                    "description": item.description,
-                }
-            )
+            yield {
+                "name": name_mappings.get(item.id, item.name),
+                "parent": (
+                    ""
+                    if item.name.upper() == "ROOT"
+                    else name_mappings.get(item.parent.id, item.parent.name)
+                ),
+                "description": item.description,
+            }
             for child in reversed(item.children):
                 stack.append(child)
+
+
+register_closure_maintenance(TreeTaxonomy)
@@ -0,0 +1,222 @@
+"""Module containing the change journal of the taxonomy items.
+
+Every committed version of a taxonomy gets journal rows for the items that
+were inserted, updated or deleted in that version. Writes through the ORM
+are recorded automatically, bulk statements have to record their changes
+with record_item_changes. A version without recorded item changes (e.g. a
+bulk import) is journaled as a reset that can only be answered with a full
+snapshot of the taxonomy.
+"""
+
+import enum
+from typing import Dict, Iterable, List, NamedTuple, Type
+
+from sqlalchemy import event
+from sqlalchemy.orm import MappedColumn, Session
+from sqlalchemy.sql import delete, insert, select
+from sqlalchemy.sql.functions import max as sql_max
+from sqlalchemy.sql.functions import min as sql_min
+
+from ... import db
+from .closure import TaxonomyClosure
+from .helper_classes import Taxonomy, TreeTaxonomy
+from .registry import get_taxonomies
+from .version import CHANGED_TAXONOMIES_KEY, TaxonomyVersion
+
+JOURNAL_KEY = "m4m_taxonomy_journal"
+DELETED_SUBTREES_KEY = "m4m_taxonomy_deleted_subtrees"
+
+
+class ChangeEnum(enum.Enum):
+    insert = 1
+    update = 2
+    delete = 3
+    reset = 4
+
+
+class TaxonomyChange(db.Model):
+    """DB Model for the journal of taxonomy item changes."""
+
+    __tablename__ = "taxonomy_change"
+
+    id: MappedColumn[int] = db.Column(db.Integer, primary_key=True)
+    taxonomy: MappedColumn[str] = db.Column(db.String(120), nullable=False)
+    version: MappedColumn[int] = db.Column(db.Integer, nullable=False)
+    # None for resets
+    item_id: MappedColumn[int | None] = db.Column(db.Integer, nullable=True)
+    change: MappedColumn[ChangeEnum] = db.Column(db.Enum(ChangeEnum), nullable=False)
+
+    __table_args__ = (db.Index("ix_taxonomy_change_version", "taxonomy", "version"),)
+
+
+class TaxonomyDelta(NamedTuple):
+    """The item changes of a taxonomy between two versions."""
+
+    since: int
+    version: int
+    # False if the journal can not answer the request (full snapshot needed)
+    complete: bool
+    changed: List[int]
+    deleted: List[int]
+
+
+def _pending_changes(session: Session) -> Dict[str, Dict[int, ChangeEnum]]:
+    return session.info.setdefault(JOURNAL_KEY, {})
+
+
+def _record(session: Session, name: str, item_id: int, change: ChangeEnum):
+    changes = _pending_changes(session).setdefault(name, {})
+    if changes.get(item_id) == ChangeEnum.insert and change == ChangeEnum.update:
+        return  # still new for clients
+    changes[item_id] = change
+
+
+def record_item_changes(tax: Type[Taxonomy], change: ChangeEnum, ids: Iterable[int]):
+    """Record item changes made with bulk statements in the current transaction.
+
+    Arguments:
+        tax: Type[Taxonomy] -- The changed taxonomy.
+        change: ChangeEnum -- The kind of change (insert, update or delete).
+        ids: Iterable[int] -- The ids of the changed items.
+    """
+    for item_id in ids:
+        _record(db.session, tax.__name__, item_id, change)
+
+
+@event.listens_for(Session, "before_flush")
+def remember_deleted_subtrees(session: Session, flush_context, instances):
+    # the db deletes the children of deleted tree items with cascading
+    # foreign keys, so the subtrees are read before they are gone
+    deleted = [obj for obj in session.deleted if isinstance(obj, TreeTaxonomy)]
+    if not deleted:
+        return
+    subtrees = session.info.setdefault(DELETED_SUBTREES_KEY, {})
+    with session.no_autoflush:
+        for obj in deleted:
+            subtree_q = select(TaxonomyClosure.descendant_id).where(
+                TaxonomyClosure.taxonomy == type(obj).__tablename__,
+                TaxonomyClosure.ancestor_id == obj.id,
+            )
+            subtrees[id(obj)] = session.execute(subtree_q).scalars().all()
+
+
+@event.listens_for(Session, "after_flush")
+def record_orm_item_changes(session: Session, flush_context):
+    subtrees = session.info.pop(DELETED_SUBTREES_KEY, {})
+    for obj in session.new:
+        if isinstance(obj, Taxonomy):
+            _record(session, type(obj).__name__, obj.id, ChangeEnum.insert)
+    for obj in session.dirty:
+        if isinstance(obj, Taxonomy) and session.is_modified(obj):
+            _record(session, type(obj).__name__, obj.id, ChangeEnum.update)
+    for obj in session.deleted:
+        if isinstance(obj, Taxonomy):
+            name = type(obj).__name__
+            for item_id in subtrees.get(id(obj), [obj.id]):
+                _record(session, name, item_id, ChangeEnum.delete)
+
+
+# registered after the hook in version.py (imported above), so the version
+# counters are already bumped when the journal is written
+@event.listens_for(Session, "before_commit")
+def write_journal(session: Session):
+    if session.new or session.dirty or session.deleted:
+        session.flush()  # the commit only flushes after this hook
+    changed: set[str] = session.info.get(CHANGED_TAXONOMIES_KEY, set())
+    pending = session.info.pop(JOURNAL_KEY, {})
+    taxonomies = get_taxonomies()
+    rows: List[Dict] = []
+    for name in sorted(changed):
+        if name.upper() not in taxonomies:
+            continue  # other version counters have no journal
+        version_q = select(TaxonomyVersion.version).where(TaxonomyVersion.name == name)
+        version = session.execute(version_q).scalar_one()
+        changes = pending.get(name)
+        if not changes:
+            rows.append(
+                {
+                    "taxonomy": name,
+                    "version": version,
+                    "item_id": None,
+                    "change": ChangeEnum.reset,
+                }
+            )
+            continue
+        rows.extend(
+            {"taxonomy": name, "version": version, "item_id": item_id, "change": change}
+            for item_id, change in changes.items()
+        )
+    if rows:
+        session.execute(insert(TaxonomyChange), rows)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_journal(session: Session):
+    session.info.pop(JOURNAL_KEY, None)
+    session.info.pop(DELETED_SUBTREES_KEY, None)
+
+
+def get_taxonomy_delta(tax: Type[Taxonomy], since: int) -> TaxonomyDelta:
+    """Get the ids of the items changed after the given version.
+
+    An item that was changed and deleted again is only listed as deleted.
+
+    Arguments:
+        tax: Type[Taxonomy] -- The taxonomy.
+        since: int -- The version known by the client.
+
+    Returns:
+        TaxonomyDelta -- The changed and deleted item ids. If the journal does
+            not cover all versions after since, complete is False.
+    """
+    name = tax.__name__
+    version = tax.get_version()
+    if since == version:
+        return TaxonomyDelta(since, version, True, [], [])
+    if since > version or since < 0:
+        return TaxonomyDelta(since, version, False, [], [])
+    bounds_q = select(
+        sql_min(TaxonomyChange.version), sql_max(TaxonomyChange.version)
+    ).where(TaxonomyChange.taxonomy == name)
+    first_version, last_version = db.session.execute(bounds_q).one()
+    # every journaled version has at least one row, versions before the first
+    # row were compacted (or committed before the journal existed)
+    if first_version is None or first_version > since + 1 or last_version < version:
+        return TaxonomyDelta(since, version, False, [], [])
+    changes_q = (
+        select(TaxonomyChange.item_id, TaxonomyChange.change)
+        .where(
+            TaxonomyChange.taxonomy == name,
+            TaxonomyChange.version > since,
+            TaxonomyChange.version <= version,
+        )
+        .order_by(TaxonomyChange.version, TaxonomyChange.id)
+    )
+    last_changes: Dict[int, ChangeEnum] = {}
+    for item_id, change in db.session.execute(changes_q):
+        if change == ChangeEnum.reset:
+            return TaxonomyDelta(since, version, False, [], [])
+        last_changes[item_id] = change
+    changed = sorted(i for i, c in last_changes.items() if c != ChangeEnum.delete)
+    deleted = sorted(i for i, c in last_changes.items() if c == ChangeEnum.delete)
+    return TaxonomyDelta(since, version, True, changed, deleted)
+
+
+def compact_journal(keep_versions: int) -> int:
+    """Remove the journal rows of all but the last versions of every taxonomy.
+
+    Returns:
+        int -- The number of removed rows.
+    """
+    removed = 0
+    for name, version in db.session.execute(
+        select(TaxonomyVersion.name, TaxonomyVersion.version)
+    ).all():
+        result = db.session.execute(
+            delete(TaxonomyChange).where(
+                TaxonomyChange.taxonomy == name,
+                TaxonomyChange.version <= version - keep_versions,
+            )
+        )
+        removed += result.rowcount  # type: ignore
+    return removed
@@ -0,0 +1,130 @@
+"""Module containing the merge of taxonomy items."""
+
+from typing import Dict, List, NamedTuple, Type
+
+from sqlalchemy import Column, and_, exists, tuple_
+from sqlalchemy.sql import delete, select, update
+
+from ... import db
+from .closure import delete_closure_subtree, move_closure_item
+from .helper_classes import Taxonomy, TreeTaxonomy
+from .journal import ChangeEnum, record_item_changes
+from .usage import TaxonomyReference, get_taxonomy_references
+
+
+class MergeResult(NamedTuple):
+    """The number of rows changed by a merge."""
+
+    # rewritten references by reference name
+    updated: Dict[str, int]
+    # removed association rows that would have been duplicates
+    removed_duplicates: Dict[str, int]
+    # children of the merged item moved below the target item
+    moved_children: int
+
+
+def _key_columns(reference: TaxonomyReference) -> List[Column]:
+    """Get the other primary key columns if the column is part of the key."""
+    key_columns = list(reference.table.primary_key.columns)
+    if reference.column not in key_columns:
+        return []
+    return [c for c in key_columns if c is not reference.column]
+
+
+def _remove_duplicates(reference: TaxonomyReference, source_id: int, target_id: int):
+    """Delete association rows of the source that also exist for the target."""
+    key_columns = _key_columns(reference)
+    if not key_columns:
+        return 0
+    table, column = reference.table, reference.column
+    other = table.alias("other")
+    duplicates_q = select(*key_columns).where(
+        column == source_id,
+        exists().where(
+            other.c[column.name] == target_id,
+            and_(*(other.c[c.name] == c for c in key_columns)),
+        ),
+    )
+    # select the keys first as some dbs forbid subqueries on the deleted table
+    duplicates = db.session.execute(duplicates_q).all()
+    if not duplicates:
+        return 0
+    if len(key_columns) == 1:
+        key_filter = key_columns[0].in_([row[0] for row in duplicates])
+    else:
+        key_filter = tuple_(*key_columns).in_([tuple(row) for row in duplicates])
+    db.session.execute(delete(table).where(column == source_id, key_filter))
+    return len(duplicates)
+
+
+def merge_taxonomy_items(tax: Type[Taxonomy], source_id: int, target_id: int):
+    """Merge the source item into the target item in the current transaction.
+
+    All references to the source item are rewritten with one set based
+    update per referencing column. Association rows that would collide with
+    an existing row of the target are removed first. Children of a tree item
+    are moved below the target. The source item is deleted afterwards.
+
+    Arguments:
+        tax: Type[Taxonomy] -- The taxonomy of both items.
+        source_id: int -- The id of the item to merge (and remove).
+        target_id: int -- The id of the item to keep.
+
+    Raises:
+        ValueError: If the target is the source or one of its descendants.
+
+    Returns:
+        MergeResult -- The number of changed rows.
+    """
+    if source_id == target_id:
+        raise ValueError("A taxonomy item cannot be merged into itself!")
+    table_name: str = tax.__tablename__  # type: ignore
+    connection = db.session.connection()
+    is_tree = issubclass(tax, TreeTaxonomy)
+    if is_tree:
+        subtree = set(
+            db.session.execute(tax.subtree_ids(source_id)).scalars()  # type: ignore
+        )
+        if target_id in subtree:
+            raise ValueError(
+                "A taxonomy item cannot be merged into one of its descendants!"
+            )
+
+    updated: Dict[str, int] = {}
+    removed_duplicates: Dict[str, int] = {}
+    for reference in get_taxonomy_references(tax):
+        removed = _remove_duplicates(reference, source_id, target_id)
+        if removed:
+            removed_duplicates[reference.name] = removed
+        result = db.session.execute(
+            update(reference.table)
+            .where(reference.column == source_id)
+            .values({reference.column.name: target_id})
+        )
+        if result.rowcount:
+            updated[reference.name] = result.rowcount
+
+    moved_children = 0
+    if is_tree:
+        children_q = select(tax.id).where(tax.parent_id == source_id)  # type: ignore
+        children = db.session.execute(children_q).scalars().all()
+        if children:
+            db.session.execute(
+                update(tax)
+                .where(tax.id.in_(children))
+                .values(parent_id=target_id)
+                .execution_options(synchronize_session=False)
+            )
+            for child_id in children:
+                move_closure_item(connection, table_name, child_id, target_id)
+            record_item_changes(tax, ChangeEnum.update, children)
+            moved_children = len(children)
+        delete_closure_subtree(connection, table_name, [source_id])
+    db.session.execute(
+        delete(tax)
+        .where(tax.id == source_id)
+        .execution_options(synchronize_session=False)
+    )
+    record_item_changes(tax, ChangeEnum.delete, [source_id])
+    tax.mark_changed()
+    return MergeResult(updated, removed_duplicates, moved_children)
@@ -0,0 +1,203 @@
+"""Module containing the registry of all taxonomies.
+
+Taxonomies register themselves when their class is defined (see
+Taxonomy.__init_subclass__). The registry is the only source of the
+taxonomy classes and their metadata for the api, the cli and the debug
+routes.
+"""
+
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Tuple, Type
+
+from flask import current_app
+from sqlalchemy import Column, Table
+from sqlalchemy.sql import select
+
+from ... import db
+from .version import has_uncommitted_changes
+
+if TYPE_CHECKING:
+    from .helper_classes import Taxonomy
+
+
+class TaxonomyReference(NamedTuple):
+    """A foreign key column referencing the items of a taxonomy."""
+
+    table: Table
+    column: Column
+    # column identifying the referencing row (the other side of association
+    # tables or the primary key)
+    row_column: Column
+
+    @property
+    def name(self) -> str:
+        return "{}.{}".format(self.table.name, self.column.name)
+
+
+class TaxonomyInfo:
+    """Metadata of a registered taxonomy.
+
+    Metadata derived from the db schema is computed on first access as the
+    class is not mapped yet when it is registered. The item ids by name are
+    cached per app together with the taxonomy version they were read for.
+    """
+
+    def __init__(self, taxonomy: Type["Taxonomy"]) -> None:
+        self.taxonomy = taxonomy
+        self.name: str = taxonomy.__name__
+        self.key: str = taxonomy.__name__.upper()
+        self._references: List[TaxonomyReference] | None = None
+
+    def __repr__(self):
+        return "<TaxonomyInfo {}>".format(self.name)
+
+    @property
+    def taxonomy_type(self) -> str:
+        return self.taxonomy.taxonomy_type
+
+    @property
+    def select_multiple(self) -> bool:
+        return self.taxonomy.select_multiple
+
+    @property
+    def select_leafs_only(self) -> bool:
+        return getattr(self.taxonomy, "select_leafs_only", False)
+
+    @property
+    def table(self) -> Table:
+        return self.taxonomy.__table__  # type: ignore
+
+    @property
+    def references(self) -> List[TaxonomyReference]:
+        """All columns referencing the taxonomy (without parent references)."""
+        if self._references is None:
+            self._references = _find_references(self.table)
+        return self._references
+
+    @property
+    def referencing_tables(self) -> List[str]:
+        """The names of all tables referencing the taxonomy."""
+        return sorted({reference.table.name for reference in self.references})
+
+    @property
+    def name_ids(self) -> Dict[str, int]:
+        """The item ids by item name (needs an app context).
+
+        For duplicate names (only possible in tree taxonomies) the lowest id
+        is used. The map is read from the db once per taxonomy version and
+        bypassed while the taxonomy has uncommitted changes.
+        """
+        if has_uncommitted_changes(self.name):
+            return self._load_name_ids()
+        cache: Dict[str, tuple[int, Dict[str, int]]]
+        cache = current_app.extensions.setdefault("m4m_taxonomy_name_ids", {})
+        version = self.taxonomy.get_version()
+        entry = cache.get(self.name)
+        if entry is None or entry[0] != version:
+            entry = (version, self._load_name_ids())
+            cache[self.name] = entry
+        return entry[1]
+
+    def forget_cached_items(self):
+        """Drop the cached names and parents of this process."""
+        for key in ("m4m_taxonomy_name_ids", "m4m_taxonomy_parents"):
+            current_app.extensions.get(key, {}).pop(self.name, None)
+
+    def _load_name_ids(self) -> Dict[str, int]:
+        tax = self.taxonomy
+        q = select(tax.id, tax.name).order_by(tax.id.desc())
+        return {name: item_id for item_id, name in db.session.execute(q)}
+
+    @property
+    def parents(self) -> Dict[int, Tuple[int | None, str]]:
+        """The parent id and name of every tree taxonomy item.
+
+        Needs an app context. Cached per taxonomy version like name_ids.
+        """
+        if has_uncommitted_changes(self.name):
+            return self._load_parents()
+        cache: Dict[str, tuple[int, Dict[int, Tuple[int | None, str]]]]
+        cache = current_app.extensions.setdefault("m4m_taxonomy_parents", {})
+        version = self.taxonomy.get_version()
+        entry = cache.get(self.name)
+        if entry is None or entry[0] != version:
+            entry = (version, self._load_parents())
+            cache[self.name] = entry
+        return entry[1]
+
+    def _load_parents(self) -> Dict[int, Tuple[int | None, str]]:
+        tax = self.taxonomy
+        q = select(tax.id, tax.parent_id, tax.name)  # type: ignore
+        return {
+            item_id: (parent, name) for item_id, parent, name in db.session.execute(q)
+        }
+
+    def ancestor_path(self, item_id: int) -> List[Tuple[int, str]]:
+        """Get the ancestors of a tree taxonomy item below the root item.
+
+        Returns:
+            List[Tuple[int, str]] -- The id and name of every ancestor, the
+                top most ancestor first.
+        """
+        parents = self.parents
+        path: List[Tuple[int, str]] = []
+        parent_id = parents.get(item_id, (None, ""))[0]
+        while parent_id is not None and len(path) < len(parents):
+            grandparent_id, name = parents[parent_id]
+            if grandparent_id is None and name == "root":
+                break
+            path.append((parent_id, name))
+            parent_id = grandparent_id
+        path.reverse()
+        return path
+
+    @property
+    def na_id(self) -> int | None:
+        """The id of the na item (needs an app context)."""
+        return self.name_ids.get("na")
+
+
+def _find_references(table: Table) -> List[TaxonomyReference]:
+    references = []
+    for other_table in db.metadata.sorted_tables:
+        if other_table is table:
+            continue
+        for fk in sorted(other_table.foreign_keys, key=lambda fk: fk.parent.name):
+            if fk.column.table is not table:
+                continue
+            column: Column = fk.parent  # type: ignore
+            row_column = next(
+                (c for c in other_table.primary_key.columns if c is not column),
+                column,
+            )
+            references.append(TaxonomyReference(other_table, column, row_column))
+    return references
+
+
+# taxonomies by upper cased class name (sorted by name)
+_taxonomies: Dict[str, Type["Taxonomy"]] = {}
+_infos: Dict[Type["Taxonomy"], TaxonomyInfo] = {}
+
+
+def register_taxonomy(taxonomy: Type["Taxonomy"]):
+    """Add a taxonomy class to the registry."""
+    info = TaxonomyInfo(taxonomy)
+    if info.key in _taxonomies and _taxonomies[info.key] is not taxonomy:
+        raise ValueError('Taxonomy "{}" is already registered!'.format(info.name))
+    _infos[taxonomy] = info
+    _taxonomies[info.key] = taxonomy
+    ordered = sorted(_taxonomies.items(), key=lambda item: item[1].__name__)
+    _taxonomies.clear()
+    _taxonomies.update(ordered)
+
+
+def get_taxonomies() -> Dict[str, Type["Taxonomy"]]:
+    """Get all taxonomies by upper cased name.
+
+    The returned dict is the registry itself and must not be modified.
+    """
+    return _taxonomies
+
+
+def get_taxonomy_info(taxonomy: Type["Taxonomy"]) -> TaxonomyInfo:
+    """Get the metadata of a registered taxonomy."""
+    return _infos[taxonomy]
@@ -0,0 +1,301 @@
+"""Module containing the incremental sync of taxonomies with csv files."""
+
+from collections import defaultdict
+from logging import Logger
+from typing import Dict, List, NamedTuple, Sequence, Tuple, Type
+
+from sqlalchemy.sql import delete, select, update
+
+from ... import db
+from .bulk import TreeRow, insert_returning_ids, list_rows, tree_levels
+from .closure import delete_closure_subtree, insert_closure_items, move_closure_item
+from .helper_classes import ListTaxonomy, Taxonomy, TreeTaxonomy
+from .journal import ChangeEnum, record_item_changes
+
+
+class NewItem(NamedTuple):
+    """An item to insert.
+
+    The parent is either an existing item (parent_id) or an item inserted by
+    the same sync (parent_key).
+    """
+
+    key: str
+    name: str
+    description: str | None
+    parent_id: int | None = None
+    parent_key: str | None = None
+
+
+class MovedItem(NamedTuple):
+    id: int
+    parent_id: int | None = None
+    parent_key: str | None = None
+
+
+class TaxonomyDiff:
+    """The changes needed to sync a taxonomy with its csv file."""
+
+    def __init__(self, taxonomy: Type[Taxonomy]) -> None:
+        self.taxonomy = taxonomy
+        # new items grouped by their depth below existing items
+        self.inserts: List[List[NewItem]] = []
+        self.updates: List[Dict] = []
+        self.moves: List[MovedItem] = []
+        self.deletes: List[int] = []
+        self.names: Dict[int, str] = {}
+
+    def __bool__(self):
+        return bool(self.inserts or self.updates or self.moves or self.deletes)
+
+    def add_insert(self, item: NewItem, depth: int):
+        if depth == len(self.inserts):
+            self.inserts.append([])
+        self.inserts[depth].append(item)
+
+    def report(self) -> List[str]:
+        """Describe the changes as human readable lines."""
+        lines = [
+            "{} inserted, {} updated, {} moved, {} deleted".format(
+                sum(len(level) for level in self.inserts),
+                len(self.updates),
+                len(self.moves),
+                len(self.deletes),
+            )
+        ]
+        lines.extend('  + "{}"'.format(i.key) for level in self.inserts for i in level)
+        lines.extend('  ~ "{}"'.format(self.names[u["id"]]) for u in self.updates)
+        lines.extend('  > "{}"'.format(self.names[m.id]) for m in self.moves)
+        lines.extend('  - "{}"'.format(self.names[item_id]) for item_id in self.deletes)
+        return lines
+
+
+def _same_description(a: str | None, b: str | None) -> bool:
+    return (a or "") == (b or "")
+
+
+def diff_list_taxonomy(
+    tax: Type[ListTaxonomy], rows: Sequence[Dict[str, str]], logger: Logger
+) -> TaxonomyDiff | None:
+    """Compare a list taxonomy with its csv rows by item name."""
+    items = list_rows(tax, rows, logger)
+    if items is None:
+        return None
+    diff = TaxonomyDiff(tax)
+    existing: Dict[str, List[Tuple[int, str | None]]] = defaultdict(list)
+    q = select(tax.id, tax.name, tax.description).order_by(tax.id)
+    for item_id, name, description in db.session.execute(q):
+        existing[name].append((item_id, description))
+        diff.names[item_id] = name
+    for item in items:
+        candidates = existing.get(item["name"])
+        if not candidates:
+            diff.add_insert(NewItem(item["name"], item["name"], item["description"]), 0)
+            continue
+        item_id, description = candidates.pop(0)
+        if not _same_description(description, item["description"]):
+            diff.updates.append({"id": item_id, "description": item["description"]})
+    has_na = bool(existing.get("na"))
+    existing.pop("na", None)
+    diff.deletes = [
+        item_id for same_name in existing.values() for item_id, _ in same_name
+    ]
+    if items and not has_na and not any(item["name"] == "na" for item in items):
+        diff.add_insert(NewItem("na", "na", None), 0)
+    return diff
+
+
+def _csv_name_counts(levels: List[List[TreeRow]]) -> Dict[str, int]:
+    counts: Dict[str, int] = defaultdict(int)
+    for level in levels:
+        for row in level:
+            counts[row.name] += 1
+    return counts
+
+
+class _TreeMatcher:
+    """Match the csv rows of a tree taxonomy with its existing items."""
+
+    def __init__(self, diff: TaxonomyDiff, nodes: Dict, levels: List[List[TreeRow]]):
+        self.diff = diff
+        self.nodes = nodes
+        self.children: Dict[int | None, Dict[str, List[int]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        self.by_name: Dict[str, List[int]] = defaultdict(list)
+        for node in nodes.values():
+            self.children[node.parent_id][node.name].append(node.id)
+            self.by_name[node.name].append(node.id)
+            diff.names[node.id] = node.name
+        self.csv_name_counts = _csv_name_counts(levels)
+        self.unclaimed = set(nodes)
+        self.item_ids: Dict[str, int] = {}  # csv key -> id of existing item
+        self.new_depths: Dict[str, int] = {}  # csv key -> depth of new item
+
+    def match(self, row: TreeRow):
+        parent_id = self.item_ids.get(row.parent_key) if row.parent_key else None
+        parent_is_new = row.parent_key in self.new_depths
+        item_id = None
+        if not parent_is_new:
+            same_name = self.children[parent_id].get(row.name, [])
+            item_id = next((i for i in same_name if i in self.unclaimed), None)
+        if item_id is None:
+            item_id = self.match_moved(row, parent_id, parent_is_new)
+        if item_id is None:
+            self.add(row, parent_id, parent_is_new)
+            return
+        self.unclaimed.discard(item_id)
+        self.item_ids[row.key] = item_id
+        if not _same_description(self.nodes[item_id].description, row.description):
+            self.diff.updates.append({"id": item_id, "description": row.description})
+
+    def match_moved(
+        self, row: TreeRow, parent_id: int | None, parent_is_new: bool
+    ) -> int | None:
+        """Match an item with a unique name that has a new parent."""
+        if self.csv_name_counts[row.name] != 1:
+            return None
+        candidates = [i for i in self.by_name.get(row.name, []) if i in self.unclaimed]
+        if len(candidates) != 1:
+            return None
+        item_id = candidates[0]
+        if parent_is_new:
+            self.diff.moves.append(MovedItem(item_id, parent_key=row.parent_key))
+        else:
+            self.diff.moves.append(MovedItem(item_id, parent_id=parent_id))
+        return item_id
+
+    def add(self, row: TreeRow, parent_id: int | None, parent_is_new: bool):
+        if parent_is_new:
+            depth = self.new_depths[row.parent_key] + 1  # type: ignore
+            new_item = NewItem(
+                row.key, row.name, row.description, parent_key=row.parent_key
+            )
+        else:
+            depth = 0
+            new_item = NewItem(row.key, row.name, row.description, parent_id=parent_id)
+        self.new_depths[row.key] = depth
+        self.diff.add_insert(new_item, depth)
+
+    def finish(self):
+        """Add the missing na item and delete all unmatched items."""
+        nodes = self.nodes
+        has_na = any(nodes[i].name == "na" for i in self.children[None].get("na", []))
+        if not has_na and not self.csv_name_counts["na"]:
+            self.diff.add_insert(NewItem("na", "na", None), 0)
+        self.diff.deletes = sorted(
+            i
+            for i in self.unclaimed
+            if not (nodes[i].name == "na" and nodes[i].parent_id is None)
+        )
+
+
+def diff_tree_taxonomy(
+    tax: Type[TreeTaxonomy], rows: Sequence[Dict[str, str]], logger: Logger
+) -> TaxonomyDiff | None:
+    """Compare a tree taxonomy with its csv rows.
+
+    Items are matched by their parent and name, starting at the root. An
+    unmatched item whose name is unique is moved to its new parent instead
+    of deleting and inserting it, so that its id stays stable.
+    """
+    levels = tree_levels(tax, rows, logger)
+    if levels is None:
+        return None
+    diff = TaxonomyDiff(tax)
+    matcher = _TreeMatcher(diff, tax.get_nodes(), levels)
+    for level in levels:
+        for row in level:
+            matcher.match(row)
+    matcher.finish()
+    return diff
+
+
+def diff_taxonomy(
+    tax: Type[Taxonomy], rows: Sequence[Dict[str, str]], logger: Logger
+) -> TaxonomyDiff | None:
+    """Compare a taxonomy with its csv rows.
+
+    Returns:
+        TaxonomyDiff | None -- The diff or None if the csv rows are invalid.
+    """
+    if issubclass(tax, TreeTaxonomy):
+        return diff_tree_taxonomy(tax, rows, logger)
+    assert issubclass(tax, ListTaxonomy)
+    return diff_list_taxonomy(tax, rows, logger)
+
+
+def _apply_inserts(diff: TaxonomyDiff, new_ids: Dict[str, int]):
+    tax = diff.taxonomy
+    is_tree = issubclass(tax, TreeTaxonomy)
+    closure_items: List[Tuple[int, int | None]] = []
+    for level in diff.inserts:
+        values: List[Dict] = []
+        for item in level:
+            item_values = {"name": item.name, "description": item.description}
+            if is_tree:
+                item_values["parent_id"] = _resolve_parent(item, new_ids)
+            values.append(item_values)
+        ids = insert_returning_ids(tax, values)
+        new_ids.update(zip((item.key for item in level), ids))
+        record_item_changes(tax, ChangeEnum.insert, ids)
+        if is_tree:
+            closure_items.extend(
+                (item_id, item_values["parent_id"])
+                for item_id, item_values in zip(ids, values)
+            )
+    if closure_items:
+        insert_closure_items(db.session.connection(), tax.__tablename__, closure_items)
+
+
+def _apply_updates(diff: TaxonomyDiff):
+    tax = diff.taxonomy
+    db.session.execute(update(tax), diff.updates)
+    record_item_changes(tax, ChangeEnum.update, (u["id"] for u in diff.updates))
+
+
+def _apply_moves(diff: TaxonomyDiff, new_ids: Dict[str, int]):
+    tax = diff.taxonomy
+    connection = db.session.connection()
+    moves = [(m.id, _resolve_parent(m, new_ids)) for m in diff.moves]
+    db.session.execute(
+        update(tax),
+        [{"id": item_id, "parent_id": parent} for item_id, parent in moves],
+    )
+    for item_id, parent_id in moves:
+        move_closure_item(connection, tax.__tablename__, item_id, parent_id)
+    record_item_changes(tax, ChangeEnum.update, (item_id for item_id, _ in moves))
+
+
+def _apply_deletes(diff: TaxonomyDiff):
+    tax = diff.taxonomy
+    db.session.execute(
+        delete(tax)
+        .where(tax.id.in_(diff.deletes))
+        .execution_options(synchronize_session=False)
+    )
+    if issubclass(tax, TreeTaxonomy):
+        delete_closure_subtree(db.session.connection(), tax.__tablename__, diff.deletes)
+    record_item_changes(tax, ChangeEnum.delete, diff.deletes)
+
+
+def _resolve_parent(item: NewItem | MovedItem, new_ids: Dict[str, int]) -> int | None:
+    return new_ids[item.parent_key] if item.parent_key else item.parent_id
+
+
+def apply_taxonomy_diff(diff: TaxonomyDiff):
+    """Apply the diff with bulk statements in the current transaction.
+
+    The closure table is updated only for the changed items.
+    """
+    if not diff:
+        return
+    new_ids: Dict[str, int] = {}  # csv key -> id of inserted item
+    _apply_inserts(diff, new_ids)
+    if diff.updates:
+        _apply_updates(diff)
+    if diff.moves:
+        _apply_moves(diff, new_ids)
+    if diff.deletes:
+        _apply_deletes(diff)
+    diff.taxonomy.mark_changed()
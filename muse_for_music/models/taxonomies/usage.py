@@ -0,0 +1,80 @@
+"""Module containing usage statistics of taxonomy items."""
+
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple, Type
+
+from sqlalchemy import literal, union_all
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import select
+from sqlalchemy.sql.functions import count
+
+from ... import db
+from .helper_classes import Taxonomy
+from .registry import TaxonomyReference, get_taxonomy_info
+
+
+def get_taxonomy_references(tax: Type[Taxonomy]) -> List[TaxonomyReference]:
+    """Find all columns referencing the taxonomy in the db metadata.
+
+    References of tree taxonomy items to their parent are excluded.
+    """
+    return get_taxonomy_info(tax).references
+
+
+def get_usage_counts(tax: Type[Taxonomy]) -> Dict[int, Dict[str, int]]:
+    """Count the referencing rows of all items of a taxonomy.
+
+    Uses one grouped aggregate query per referencing column.
+
+    Returns:
+        Dict[int, Dict[str, int]] -- The counts by reference name for every
+            used item id.
+    """
+    usage: Dict[int, Dict[str, int]] = defaultdict(dict)
+    for reference in get_taxonomy_references(tax):
+        q = (
+            select(reference.column, count())
+            .where(reference.column.is_not(None))
+            .group_by(reference.column)
+        )
+        for item_id, row_count in db.session.execute(q):
+            usage[item_id][reference.name] = row_count
+    return usage
+
+
+def get_item_usages(
+    tax: Type[Taxonomy], item_id: int, offset: int = 0, limit: int | None = None
+) -> Tuple[int, Sequence[Row]]:
+    """List the rows referencing a taxonomy item.
+
+    Arguments:
+        tax: Type[Taxonomy] -- The taxonomy of the item.
+        item_id: int -- The id of the item.
+        offset: int -- The number of rows to skip.
+        limit: int | None -- The maximum number of rows to return.
+
+    Returns:
+        Tuple[int, Sequence[Row]] -- The total number of referencing rows and
+            the requested rows with the columns "table", "column" and "row_id".
+    """
+    references = get_taxonomy_references(tax)
+    if not references:
+        return 0, []
+    usages = union_all(
+        *(
+            select(
+                literal(reference.table.name).label("table"),
+                literal(reference.column.name).label("column"),
+                reference.row_column.label("row_id"),
+            ).where(reference.column == item_id)
+            for reference in references
+        )
+    ).subquery()
+    total = db.session.execute(select(count()).select_from(usages)).scalar_one()
+    q = (
+        select(usages)
+        .order_by(usages.c.table, usages.c.column, usages.c.row_id)
+        .offset(offset)
+        .limit(limit)
+    )
+    return total, db.session.execute(q).all()
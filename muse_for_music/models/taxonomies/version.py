@@ -0,0 +1,184 @@
+"""Module containing the content version counters of all taxonomies."""
+
+from itertools import chain
+from time import monotonic
+from typing import Dict
+
+from flask import current_app, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.orm import MappedColumn, Session
+from sqlalchemy.sql import insert, select, update
+
+from ... import db
+
+CHANGED_TAXONOMIES_KEY = "m4m_changed_taxonomies"
+REQUEST_VERSIONS_KEY = "m4m.taxonomy_versions"
+
+# other models with a version counter (model -> counter name)
+_tracked_models: Dict[type, str] = {}
+
+
+class TaxonomyVersion(db.Model):
+    """DB Model for the content versions of the taxonomies.
+
+    The version of a taxonomy is bumped in the same transaction as any write
+    to the taxonomy. All workers can detect changes made by other workers by
+    comparing the versions.
+    """
+
+    __tablename__ = "taxonomy_version"
+
+    name: MappedColumn[str] = db.Column(db.String(120), primary_key=True)
+    version: MappedColumn[int] = db.Column(db.Integer, nullable=False, default=0)
+
+
+class _VersionCheck:
+    """Last versions read from the db by this worker."""
+
+    def __init__(self):
+        self.versions: Dict[str, int] = {}
+        self.checked_at: float | None = None
+
+
+def _get_version_check() -> _VersionCheck:
+    check = current_app.extensions.get("m4m_taxonomy_versions")
+    if check is None:
+        check = _VersionCheck()
+        current_app.extensions["m4m_taxonomy_versions"] = check
+    return check
+
+
+def get_taxonomy_versions() -> Dict[str, int]:
+    """Get the current versions of all taxonomies.
+
+    The versions are read from the db at most once per request. If
+    TAXONOMY_VERSION_TTL is configured the versions are only checked once per
+    TTL seconds across requests.
+
+    Returns:
+        Dict[str, int] -- The versions by taxonomy class name.
+    """
+    if has_request_context():
+        versions = request.environ.get(REQUEST_VERSIONS_KEY)
+        if versions is not None:
+            return versions
+    check = _get_version_check()
+    ttl = current_app.config.get("TAXONOMY_VERSION_TTL", 0)
+    now = monotonic()
+    if ttl and check.checked_at is not None and (now - check.checked_at) < ttl:
+        versions = check.versions
+    else:
+        q = select(TaxonomyVersion.name, TaxonomyVersion.version)
+        versions = {name: version for name, version in db.session.execute(q)}
+        check.versions = versions
+        check.checked_at = now
+    if has_request_context():
+        request.environ[REQUEST_VERSIONS_KEY] = versions
+    return versions
+
+
+def mark_taxonomy_changed(name: str):
+    """Bump the version of the taxonomy with the current transaction.
+
+    Arguments:
+        name: str -- The class name of the taxonomy.
+    """
+    changed = db.session.info.setdefault(CHANGED_TAXONOMIES_KEY, set())
+    changed.add(name)
+
+
+def track_model_changes(model: type, name: str):
+    """Keep a version counter for a model that is not a taxonomy.
+
+    The counter is bumped with every transaction writing instances of the
+    model through the ORM. It can be read like a taxonomy version with
+    get_taxonomy_versions.
+
+    Arguments:
+        model: type -- The model class.
+        name: str -- The name of the counter (must not be a taxonomy name).
+    """
+    _tracked_models[model] = name
+
+
+@event.listens_for(Session, "after_flush")
+def mark_changed_tracked_models(session: Session, flush_context):
+    if not _tracked_models:
+        return
+    for obj in chain(session.new, session.dirty, session.deleted):
+        name = _tracked_models.get(type(obj))
+        if name is not None:
+            session.info.setdefault(CHANGED_TAXONOMIES_KEY, set()).add(name)
+
+
+def has_uncommitted_changes(name: str) -> bool:
+    """Check if the taxonomy was marked as changed in this transaction."""
+    return name in db.session.info.get(CHANGED_TAXONOMIES_KEY, ())
+
+
+def _version_upsert(dialect: str, name: str):
+    """Insert or bump a version counter in one statement.
+
+    Two workers changing a taxonomy for the first time would both insert the
+    counter row with a separate update and insert. Returns None for dialects
+    without an upsert.
+    """
+    bumped = TaxonomyVersion.version + 1
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        return (
+            dialect_insert(TaxonomyVersion)
+            .values(name=name, version=1)
+            .on_conflict_do_update(
+                index_elements=[TaxonomyVersion.name], set_={"version": bumped}
+            )
+        )
+    if dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        return (
+            mysql_insert(TaxonomyVersion)
+            .values(name=name, version=1)
+            .on_duplicate_key_update(version=bumped)
+        )
+    return None
+
+
+@event.listens_for(Session, "before_commit")
+def write_changed_taxonomy_versions(session: Session):
+    if _tracked_models and (session.new or session.dirty or session.deleted):
+        session.flush()  # the commit only flushes after this hook
+    changed: set[str] = session.info.get(CHANGED_TAXONOMIES_KEY, set())
+    dialect = session.get_bind().dialect.name
+    for name in sorted(changed):  # fixed order to avoid deadlocks
+        upsert_q = _version_upsert(dialect, name)
+        if upsert_q is not None:
+            session.execute(upsert_q)
+            continue
+        update_q = (
+            update(TaxonomyVersion)
+            .where(TaxonomyVersion.name == name)
+            .values(version=TaxonomyVersion.version + 1)
+        )
+        result = session.execute(update_q)
+        if result.rowcount == 0:  # type: ignore
+            session.execute(insert(TaxonomyVersion).values(name=name, version=1))
+
+
+@event.listens_for(Session, "after_commit")
+def forget_taxonomy_versions(session: Session):
+    changed: set[str] = session.info.pop(CHANGED_TAXONOMIES_KEY, set())
+    if not changed or not has_app_context():
+        return
+    # force a fresh version check on the next access
+    _get_version_check().checked_at = None
+    if has_request_context():
+        request.environ.pop(REQUEST_VERSIONS_KEY, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_changed_taxonomies(session: Session):
+    session.info.pop(CHANGED_TAXONOMIES_KEY, None)
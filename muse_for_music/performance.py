@@ -1,15 +1,91 @@
-from collections import namedtuple
-from functools import wraps
+import re
+from collections import Counter, namedtuple
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from itertools import chain
 from logging import INFO, getLogger
-from time import time
-from typing import List
+from time import perf_counter, time
+from typing import Dict, Iterator, List, Sequence, Tuple
 
-from flask import Flask, current_app, g, request
+from flask import Flask, current_app, g, has_app_context, request
+from flask_restx import Api, Namespace, marshal
 from sqlalchemy import event
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import ChunkedIteratorResult, Engine
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from .slow_requests import QueryFingerprint, get_slow_request_store
 
 QueryRecord = namedtuple("QueryRecord", ["duration", "statement", "write", "params"])
 
+# sql: cursor execution, orm: fetching the rows and building the orm objects
+# (only measured with REQUEST_PHASE_ORM or for profiled requests, see
+# measure_orm_execute),
+# marshal: flask_restx marshalling (without links), links: hal link generation,
+# json: encoding the response, other: everything else
+PHASES = ("sql", "orm", "marshal", "links", "json", "other")
+
+# string and number literals and bind parameters of all supported dialects
+SQL_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%\(\w+\)s|%s|(?<!:):\w+|\?")
+SQL_IN_LISTS = re.compile(
+    r"\bIN \((?:\?, )*\?\)|\bIN \(\[POSTCOMPILE_\w+\]\)", re.IGNORECASE
+)
+# the filter of a lazy load ("? = child.parent_id" or "parent.id = ?")
+SQL_LAZY_FILTER = re.compile(r"\bWHERE (?:\? = (\w+)\.(\w+)|(\w+)\.(\w+) = \?)")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """Normalize a sql statement so that repeated queries share one fingerprint.
+
+    Literals and bind parameters are replaced with "?" and IN lists are
+    collapsed to "IN (?)".
+    """
+    normalized = " ".join(statement.split())
+    normalized = SQL_LITERALS.sub("?", normalized)
+    return SQL_IN_LISTS.sub("IN (?)", normalized)
+
+
+@lru_cache(maxsize=256)
+def guess_relationship(statement_fingerprint: str) -> str | None:
+    """Guess the ORM relationship(s) a query loads from its table and column."""
+    match = SQL_LAZY_FILTER.search(statement_fingerprint.replace('"', ""))
+    if match is None:
+        return None
+    table, column = match.group(1, 2) if match.group(1) else match.group(3, 4)
+
+    from . import db
+
+    names = []
+    for mapper in db.Model.registry.mappers:
+        for prop in mapper.relationships:
+            if prop.secondary is not None:
+                if getattr(prop.secondary, "name", None) != table:
+                    continue
+                # (parent column, association table column)
+                columns = [remote for _, remote in prop.synchronize_pairs]
+            else:
+                if getattr(prop.target, "name", None) != table:
+                    continue
+                columns = [remote for _, remote in prop.local_remote_pairs]
+            if any(c.name == column and c.table.name == table for c in columns):
+                names.append("{}.{}".format(mapper.class_.__name__, prop.key))
+    if not names:
+        return "{}.{}".format(table, column)
+    return " or ".join(sorted(names))
+
+
+def get_view_name() -> str:
+    """Get the name of the view function (or resource method) of the request."""
+    view = current_app.view_functions.get(request.endpoint)  # type: ignore
+    if view is None:
+        return request.endpoint or "<unmatched>"
+    view_class = getattr(view, "view_class", None)
+    if view_class is not None:
+        return "{}.{}.{}".format(
+            view_class.__module__, view_class.__qualname__, request.method.lower()
+        )
+    return "{}.{}".format(view.__module__, view.__qualname__)
+
 
 class RequestPerformance:
 
@@ -20,6 +96,8 @@ class RequestPerformance:
     duration: float
     query_start: float
     queries: List[QueryRecord]
+    fingerprints: Counter
+    phases: Dict[str, float]
 
     def __init__(self):
         t = time()
@@ -30,29 +108,114 @@ class RequestPerformance:
         self.view_end = t
         self.duration = 0
         self.queries = []
+        self.fingerprints = Counter()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self._phase_stack: List[str] = []
+        self._phase_start = 0.0
 
     def end_request(self):
         self.req_end = time()
         self.duration = self.req_end - self.req_start
+        measured = sum(self.phases.values()) - self.phases["other"]
+        self.phases["other"] = max(self.duration - measured, 0)
         logger = getLogger("flask.app.perf")
-        if self.duration > current_app.config.get("LONG_REQUEST_THRESHHOLD", 1):
-            self.log_performance_record(logger.warning)
-        elif len(self.queries) > 100:
+        if self.is_slow():
             self.log_performance_record(logger.warning)
         elif logger.getEffectiveLevel() <= INFO:
             self.log_performance_record(logger.info)
+        self.log_n_plus_one_suspects(logger.warning)
+
+    def is_slow(self) -> bool:
+        if self.duration > current_app.config.get("LONG_REQUEST_THRESHHOLD", 1):
+            return True
+        return len(self.queries) > current_app.config.get(
+            "SLOW_REQUEST_QUERY_THRESHOLD", 100
+        )
+
+    def top_queries(self, limit: int = 5) -> List[QueryFingerprint]:
+        """Get the query fingerprints with the longest total duration."""
+        counts: Counter = Counter()
+        durations: Counter = Counter()
+        for q in self.queries:
+            statement_fingerprint = fingerprint(q.statement)
+            counts[statement_fingerprint] += 1
+            durations[statement_fingerprint] += q.duration
+        return [
+            QueryFingerprint(
+                statement_fingerprint, counts[statement_fingerprint], duration
+            )
+            for statement_fingerprint, duration in durations.most_common(limit)
+        ]
+
+    def enter_phase(self, name: str):
+        """Start a phase, pausing the enclosing phase until it ends."""
+        now = perf_counter()
+        if self._phase_stack:
+            self.phases[self._phase_stack[-1]] += now - self._phase_start
+        self._phase_stack.append(name)
+        self._phase_start = now
+
+    def exit_phase(self, name: str):
+        if name not in self._phase_stack:
+            return
+        now = perf_counter()
+        elapsed = now - self._phase_start
+        # also closes phases that were not ended because of an exception
+        while self._phase_stack:
+            current = self._phase_stack.pop()
+            self.phases[current] += elapsed
+            elapsed = 0
+            if current == name:
+                break
+        self._phase_start = now
 
     def start_query(self):
         self.query_start = time()
+        self.enter_phase("sql")
 
     def end_query(self, statement, parameters):
+        self.exit_phase("sql")
         query_end = time()
         write = not statement.upper().startswith("SELECT")
         self.queries.append(
             QueryRecord(query_end - self.query_start, statement, write, parameters)
         )
+        self.fingerprints[fingerprint(statement)] += 1
         self.query_start = query_end
 
+    def n_plus_one_suspects(self) -> List[Tuple[str, int]]:
+        """Get the fingerprints of queries repeated too often in this request.
+
+        Queries repeated more than N_PLUS_ONE_THRESHOLD times are suspects.
+        """
+        threshold = current_app.config.get("N_PLUS_ONE_THRESHOLD", 10)
+        return [
+            (statement_fingerprint, count)
+            for statement_fingerprint, count in self.fingerprints.most_common()
+            if count > threshold
+        ]
+
+    def log_n_plus_one_suspects(self, methodToLogWith):
+        suspects = self.n_plus_one_suspects()
+        if not suspects:
+            return
+        view = get_view_name()
+        for statement_fingerprint, count in suspects:
+            methodToLogWith(
+                (
+                    "performance report: possible N+1 query: {count} times "
+                    "{relationship} in view {view}, url {method} {url}, "
+                    'statement "{statement}"'
+                ).format(
+                    count=count,
+                    relationship=guess_relationship(statement_fingerprint) or "<unknown>",
+                    view=view,
+                    method=request.method,
+                    url=request.url,
+                    statement=statement_fingerprint,
+                )
+            )
+
     def start_view_function(self):
         t = time()
         self.view_start = t
@@ -141,17 +304,51 @@ class RequestPerformance:
                     url=url,
                 )
             )
+        methodToLogWith(
+            "performance report: phases {phases}, url {method} {url}".format(
+                phases=", ".join(
+                    "{} {:.2f}ms".format(phase, duration * 1000)
+                    for phase, duration in self.phases.items()
+                ),
+                method=method,
+                url=url,
+            )
+        )
 
 
 def before_request(*args, **kwargs):
     g.m4m_request_performance = RequestPerformance()
 
 
-def after_request(request, *args, **kwargs):
+def after_request(response, *args, **kwargs):
     r_perf: RequestPerformance = g.get("m4m_request_performance")
     if r_perf is not None:
         r_perf.end_request()
-    return request
+        if current_app.config.get("REQUEST_METRICS", True):
+            from .metrics import record_request
+
+            record_request(
+                request.endpoint or "<unmatched>",
+                request.method,
+                response.status_code,
+                r_perf.duration,
+                ((q.duration, q.write) for q in r_perf.queries),
+                r_perf.phases,
+            )
+        if current_app.config.get("SLOW_REQUEST_STORE", True) and r_perf.is_slow():
+            get_slow_request_store().record(
+                request.endpoint or "<unmatched>",
+                get_view_name(),
+                request.method,
+                request.url,
+                response.status_code,
+                r_perf.duration,
+                len(r_perf.queries),
+                sum(1 for q in r_perf.queries if q.write),
+                sum(q.duration for q in r_perf.queries),
+                r_perf.top_queries(),
+            )
+    return response
 
 
 @event.listens_for(Engine, "before_cursor_execute")
@@ -168,6 +365,108 @@ def after_query(conn, cursor, statement, parameters, context, executemany):
         r_perf.end_query(statement, parameters)
 
 
+def _timed_chunks(chunks, r_perf: RequestPerformance):
+    def timed_chunks(size: int | None) -> Iterator[Sequence]:
+        iterator = iter(chunks(size))
+        while True:
+            r_perf.enter_phase("orm")
+            try:
+                chunk = next(iterator, None)
+            finally:
+                r_perf.exit_phase("orm")
+            if chunk is None:
+                return
+            yield chunk
+
+    return timed_chunks
+
+
+@event.listens_for(Session, "do_orm_execute")
+def measure_orm_execute(orm_execute_state: ORMExecuteState):
+    if not orm_execute_state.is_select or not has_app_context():
+        return None
+    r_perf: RequestPerformance | None = g.get("m4m_request_performance")
+    if r_perf is None:
+        return None
+    if not current_app.config.get("REQUEST_PHASE_ORM", False):
+        if g.get("m4m_profiler") is None:
+            return None
+    result = orm_execute_state.invoke_statement()
+    if not isinstance(result, ChunkedIteratorResult) or result.dynamic_yield_per:
+        return result
+    if callable(getattr(result, "chunks", None)):
+        # SQLAlchemy has no public hook around building the orm objects. They
+        # are built while the chunks of rows are fetched, so the chunk source
+        # of the (not yet consumed) result is wrapped. This replaces the same
+        # two instance attributes ChunkedIteratorResult.__init__ sets, all
+        # fetch methods read the rows through them. Results of other types
+        # or with a dynamic yield_per are returned unchanged.
+        result.chunks = _timed_chunks(result.chunks, r_perf)
+        result.iterator = chain.from_iterable(result.chunks(None))
+    return result
+
+
+@contextmanager
+def request_phase(name: str):
+    """Measure the time of a phase of the current request (see PHASES).
+
+    Time spent in nested phases (e.g. sql queries of lazy loads during
+    marshalling) only counts for the nested phase.
+    """
+    r_perf: RequestPerformance | None = None
+    if has_app_context():
+        r_perf = g.get("m4m_request_performance")
+    if r_perf is None:
+        yield
+        return
+    r_perf.enter_phase(name)
+    try:
+        yield
+    finally:
+        r_perf.exit_phase(name)
+
+
+def timed_marshal(data, fields, *args, **kwargs):
+    """Marshal the data with flask_restx in the marshal phase of the request."""
+    with request_phase("marshal"):
+        return marshal(data, fields, *args, **kwargs)
+
+
+class TimedNamespace(Namespace):
+    """Namespace measuring the marshalling of marshal_with (see PHASES)."""
+
+    def marshal_with(self, fields, *args, **kwargs):
+        restx_decorator = super().marshal_with(fields, *args, **kwargs)
+
+        def decorator(func):
+            @wraps(func)
+            def view(*view_args, **view_kwargs):
+                # pauses the marshal phase while the view itself runs
+                with request_phase("other"):
+                    return func(*view_args, **view_kwargs)
+
+            marshalled = restx_decorator(view)
+
+            @wraps(marshalled)
+            def wrapper(*view_args, **view_kwargs):
+                with request_phase("marshal"):
+                    return marshalled(*view_args, **view_kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+class TimedApi(Api):
+    """Api creating TimedNamespaces."""
+
+    def namespace(self, *args, **kwargs) -> TimedNamespace:
+        kwargs["ordered"] = kwargs.get("ordered", self.ordered)
+        ns = TimedNamespace(*args, **kwargs)
+        self.add_namespace(ns)
+        return ns
+
+
 def record_view_performance():
     def record_view_performance_decorator(f):
         @wraps(f)
@@ -188,3 +487,12 @@ def record_view_performance():
 def register_performance_monitoring(app: Flask):
     app.before_request(before_request)
     app.after_request(after_request)
+
+    from .metrics import register_metrics
+
+    register_metrics(app)
+
+    from .profiling import register_request_profiling
+
+    # registered last, so the profiler only covers the request itself
+    register_request_profiling(app)
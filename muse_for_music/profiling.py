@@ -0,0 +1,120 @@
+"""On demand profiling of single requests.
+
+Admins can profile a request by sending the header "X-M4M-Profile: 1". The
+request is run under cProfile and the stats are saved to the profile folder
+(default: instance/profiles) as a pstats dump (<id>.prof, e.g. for
+snakeviz) and a text summary (<id>.txt). The id of the profile is returned
+in the "X-M4M-Profile-Id" response header. Requests without the header
+are not affected.
+"""
+
+import io
+import os
+import pstats
+import re
+from cProfile import Profile
+from datetime import datetime, timezone
+from secrets import token_hex
+
+from flask import Flask, current_app, g, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt import PyJWTError
+
+from .user_api import RoleEnum, auth_logger
+
+PROFILE_HEADER = "X-M4M-Profile"
+PROFILE_ID_HEADER = "X-M4M-Profile-Id"
+PROFILE_ID = re.compile(r"^\d{8}T\d{12}-[0-9a-f]{8}$")
+
+
+def get_profile_folder() -> str:
+    folder = current_app.config.get("REQUEST_PROFILE_PATH") or os.path.join(
+        current_app.instance_path, "profiles"
+    )
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def get_profile_summary(profile_id: str) -> str | None:
+    """Get the text summary of a saved profile (None if it does not exist)."""
+    if not PROFILE_ID.match(profile_id):
+        return None
+    try:
+        with open(os.path.join(get_profile_folder(), profile_id + ".txt")) as summary:
+            return summary.read()
+    except FileNotFoundError:
+        return None
+
+
+def save_profile(profiler: Profile, status: int) -> str:
+    """Save the stats of the profiler and remove the oldest profiles.
+
+    Returns:
+        str -- The id of the saved profile.
+    """
+    folder = get_profile_folder()
+    profile_id = "{:%Y%m%dT%H%M%S%f}-{}".format(datetime.now(timezone.utc), token_hex(4))
+    profiler.dump_stats(os.path.join(folder, profile_id + ".prof"))
+    summary = io.StringIO()
+    summary.write(
+        "{} {} -> {} (endpoint {})\n\n".format(
+            request.method, request.url, status, request.endpoint
+        )
+    )
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(50)
+    with open(os.path.join(folder, profile_id + ".txt"), "w") as summary_file:
+        summary_file.write(summary.getvalue())
+
+    # profile ids start with the time, so they sort oldest first
+    keep = current_app.config.get("REQUEST_PROFILE_KEEP", 100)
+    saved = sorted(name[:-5] for name in os.listdir(folder) if name.endswith(".prof"))
+    for old_id in saved[: max(len(saved) - keep, 0)]:
+        for extension in (".prof", ".txt"):
+            try:
+                os.remove(os.path.join(folder, old_id + extension))
+            except FileNotFoundError:
+                pass
+    return profile_id
+
+
+def start_profiling(*args, **kwargs):
+    if PROFILE_HEADER not in request.headers:
+        return
+    if request.headers[PROFILE_HEADER] not in ("1", "true"):
+        return
+    if not current_app.config.get("REQUEST_PROFILING", True):
+        return
+    try:
+        verify_jwt_in_request()
+    except (JWTExtendedException, PyJWTError):
+        return  # the view reports the invalid token
+    if RoleEnum.admin.name not in get_jwt().get("user_claims", []):
+        auth_logger.debug("Profiling request denied for user without admin role.")
+        return
+    profiler = Profile()
+    g.m4m_profiler = profiler
+    profiler.enable()
+
+
+def stop_profiling(response, *args, **kwargs):
+    profiler: Profile | None = g.pop("m4m_profiler", None)
+    if profiler is None:
+        return response
+    profiler.disable()
+    response.headers[PROFILE_ID_HEADER] = save_profile(profiler, response.status_code)
+    return response
+
+
+def discard_profiling(*args, **kwargs):
+    # after_request is skipped for unhandled exceptions
+    profiler: Profile | None = g.pop("m4m_profiler", None)
+    if profiler is not None:
+        profiler.disable()
+
+
+def register_request_profiling(app: Flask):
+    app.before_request(start_profiling)
+    app.after_request(stop_profiling)
+    app.teardown_request(discard_profiling)
@@ -0,0 +1,240 @@
+"""Module containing the persistent store of slow requests.
+
+Requests slower than LONG_REQUEST_THRESHHOLD or with more than
+SLOW_REQUEST_QUERY_THRESHOLD queries are stored with their most expensive
+query fingerprints in a sqlite file (default: instance/slow_requests.sqlite).
+The store is a ring buffer: only the last SLOW_REQUEST_STORE_SIZE requests
+are kept. All workers write to the same file.
+"""
+
+import json
+import os
+import sqlite3
+from collections import defaultdict
+from datetime import datetime, timezone
+from math import ceil
+from threading import local
+from time import time
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from flask import current_app
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS slow_request (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    time REAL NOT NULL,
+    endpoint TEXT NOT NULL,
+    view TEXT NOT NULL,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    query_count INTEGER NOT NULL,
+    write_count INTEGER NOT NULL,
+    query_duration REAL NOT NULL,
+    top_queries TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_slow_request_time ON slow_request (time);
+CREATE INDEX IF NOT EXISTS ix_slow_request_endpoint ON slow_request (endpoint, time);
+"""
+
+COLUMNS = (
+    "id",
+    "time",
+    "endpoint",
+    "view",
+    "method",
+    "url",
+    "status",
+    "duration",
+    "query_count",
+    "write_count",
+    "query_duration",
+    "top_queries",
+)
+
+
+class QueryFingerprint(NamedTuple):
+    """A normalized sql statement with its executions in one request."""
+
+    fingerprint: str
+    count: int
+    duration: float
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """Get the nearest rank percentile of sorted values."""
+    if not values:
+        return 0
+    rank = max(ceil(len(values) * percent / 100), 1)
+    return values[min(rank, len(values)) - 1]
+
+
+class SlowRequestStore:
+    """A capped sqlite table of slow requests.
+
+    Every thread keeps its own connection to the sqlite file.
+    """
+
+    def __init__(self, file_path: str, size: int = 1000):
+        self.file_path = file_path
+        self.size = size
+        self._local = local()
+        self._get_connection().executescript(SCHEMA)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.file_path, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.row_factory = sqlite3.Row
+            self._local.connection = connection
+        return connection
+
+    def record(
+        self,
+        endpoint: str,
+        view: str,
+        method: str,
+        url: str,
+        status: int,
+        duration: float,
+        query_count: int,
+        write_count: int,
+        query_duration: float,
+        top_queries: List[QueryFingerprint],
+        timestamp: float | None = None,
+    ):
+        """Store a slow request and drop the oldest requests above the size."""
+        row = (
+            time() if timestamp is None else timestamp,
+            endpoint,
+            view,
+            method,
+            url,
+            status,
+            duration,
+            query_count,
+            write_count,
+            query_duration,
+            json.dumps([list(query) for query in top_queries]),
+        )
+        connection = self._get_connection()
+        with connection:
+            cursor = connection.execute(
+                "INSERT INTO slow_request ({}) VALUES ({})".format(
+                    ", ".join(COLUMNS[1:]), ", ".join("?" * len(row))
+                ),
+                row,
+            )
+            connection.execute(
+                "DELETE FROM slow_request WHERE id <= ?",
+                (cursor.lastrowid - self.size,),  # type: ignore
+            )
+
+    def _select(
+        self, endpoint: str | None, since: datetime | None, until: datetime | None
+    ) -> List[Dict]:
+        conditions: List[str] = []
+        params: List[str | float] = []
+        if endpoint:
+            conditions.append("endpoint = ?")
+            params.append(endpoint)
+        if since is not None:
+            conditions.append("time >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            conditions.append("time < ?")
+            params.append(until.timestamp())
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        rows = (
+            self._get_connection()
+            .execute(
+                "SELECT {} FROM slow_request{} ORDER BY duration DESC".format(
+                    ", ".join(COLUMNS), where
+                ),
+                params,
+            )
+            .fetchall()
+        )
+        requests = []
+        for row in rows:
+            request = dict(row)
+            request["time"] = datetime.fromtimestamp(row["time"], timezone.utc)
+            request["top_queries"] = [
+                QueryFingerprint(*query)._asdict()
+                for query in json.loads(row["top_queries"])
+            ]
+            requests.append(request)
+        return requests
+
+    def get_requests(
+        self,
+        endpoint: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        min_percentile: float = 0,
+        limit: int = 50,
+    ) -> List[Dict]:
+        """Get the stored requests, slowest first.
+
+        Arguments:
+            endpoint: str -- Only requests of this endpoint. (Default: all)
+            since: datetime -- Only requests after this time.
+            until: datetime -- Only requests before this time.
+            min_percentile: float -- Only requests at or above this duration
+                percentile of the selected requests.
+            limit: int -- The maximum number of requests.
+        """
+        requests = self._select(endpoint, since, until)
+        if min_percentile > 0 and requests:
+            durations = sorted(r["duration"] for r in requests)
+            min_duration = percentile(durations, min_percentile)
+            requests = [r for r in requests if r["duration"] >= min_duration]
+        return requests[:limit]
+
+    def get_endpoint_summaries(
+        self, since: datetime | None = None, until: datetime | None = None
+    ) -> List[Dict]:
+        """Get the duration percentiles and query counts by endpoint.
+
+        Returns:
+            List[Dict] -- The summaries, endpoint with the slowest p95 first.
+        """
+        by_endpoint: Dict[Tuple[str, str], List[Dict]] = defaultdict(list)
+        for request in self._select(None, since, until):
+            by_endpoint[(request["endpoint"], request["method"])].append(request)
+        summaries = []
+        for (endpoint, method), requests in by_endpoint.items():
+            durations = sorted(r["duration"] for r in requests)
+            query_counts = [r["query_count"] for r in requests]
+            summaries.append(
+                {
+                    "endpoint": endpoint,
+                    "method": method,
+                    "count": len(requests),
+                    "duration_p50": percentile(durations, 50),
+                    "duration_p95": percentile(durations, 95),
+                    "duration_max": durations[-1],
+                    "query_count_avg": sum(query_counts) / len(query_counts),
+                    "query_count_max": max(query_counts),
+                    "last_seen": max(r["time"] for r in requests),
+                }
+            )
+        summaries.sort(key=lambda s: s["duration_p95"], reverse=True)
+        return summaries
+
+
+def get_slow_request_store() -> SlowRequestStore:
+    """Get the slow request store of the current app."""
+    store = current_app.extensions.get("m4m_slow_requests")
+    if store is None:
+        file_path = current_app.config.get("SLOW_REQUEST_STORE_PATH") or os.path.join(
+            current_app.instance_path, "slow_requests.sqlite"
+        )
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        store = SlowRequestStore(
+            file_path, current_app.config.get("SLOW_REQUEST_STORE_SIZE", 1000)
+        )
+        current_app.extensions["m4m_slow_requests"] = store
+    return store
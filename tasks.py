@@ -139,13 +139,13 @@ def before_docker_start(c):
 @task
 def fill_db(c):
     c.run("flask init_db", shell=SHELL, pty=True)
-    c.run("flask init_taxonomies taxonomies", shell=SHELL, pty=True)
+    c.run("flask init_taxonomies --bulk taxonomies", shell=SHELL, pty=True)
 
 
 @task
 def create_test_db(c):
     c.run("flask create_populated_db", shell=SHELL, pty=True)
-    c.run("flask init_taxonomies taxonomies", shell=SHELL, pty=True)
+    c.run("flask init_taxonomies --bulk taxonomies", shell=SHELL, pty=True)
 
 
 @task(dependencies_js, before_build)
@@ -2,10 +2,22 @@
 
 import argparse
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from csv import DictWriter
-from typing import List, Optional
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, TextIO
 from xml.etree import ElementTree as ET
 
+NAME_SUFFIX = re.compile(r"\s\(\w+\)$")
+
+FIELDNAMES = ["name", "parent", "description"]
+
+
+def filter_name(name: str) -> str:
+    """Remove the "(annotation)" suffix from a node name."""
+    return NAME_SUFFIX.sub("", name)
+
 
 class Node:
     """A MindMap Node."""
@@ -13,6 +25,7 @@ class Node:
     def __init__(self, node, parent=None):
         self.node = node
         self.parent = parent
+        self._children: Optional[List["Node"]] = None
 
     @property
     def id(self) -> str:
@@ -24,15 +37,14 @@ class Node:
 
     @property
     def name_filtered(self):
-        regex = re.compile("\s\(\w+\)$")
-        name = self.name
-        name = re.sub(regex, "", name)
-        return name
+        return filter_name(self.name)
 
     @property
     def children(self) -> List["Node"]:
-        nodes = self.node.findall("./node")
-        return [Node(node, self) for node in nodes]
+        if self._children is None:
+            nodes = self.node.findall("./node")
+            self._children = [Node(node, self) for node in nodes]
+        return self._children
 
     def __str__(self) -> str:
         return 'Node {} "{}"'.format(self.id, self.name)
@@ -60,6 +72,116 @@ class MindMap:
         return Node(node)
 
 
+class ConversionResult(NamedTuple):
+    """The result of converting a single mindmap."""
+
+    source: str
+    target: str
+    rows: int
+    duplicates: List[str]
+
+
+def stream_rows(
+    source, root_id: Optional[str] = None, duplicates: Optional[List[str]] = None
+) -> Iterator[Dict[str, str]]:
+    """Stream the csv rows of a mindmap without loading the whole document.
+
+    The rows are emitted in document order (parents before children). Node
+    elements are cleared as soon as they are closed.
+
+    Arguments:
+        source -- The mindmap file name or file object.
+        root_id: str -- The ID of the node to use as root (default: map root).
+        duplicates: List[str] -- Duplicate names are appended to this list.
+
+    Duplicate names are renamed to "(n) name" like in the csv export of a
+    taxonomy, so the rows can be imported again.
+    """
+    seen: Dict[str, str] = {}
+    counts: Dict[str, int] = {"root": 1}
+    # names of the open node elements (None for nodes outside the subtree)
+    stack: List[Optional[str]] = []
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if element.tag != "node":
+            continue
+        if event == "end":
+            stack.pop()
+            element.clear()
+            continue
+        node_id = element.attrib.get("ID", "")
+        parent = stack[-1] if stack else None
+        if parent is None:
+            is_root = node_id == root_id if root_id else not stack
+            if not is_root:
+                stack.append(None)
+                continue
+            stack.append("root")
+            yield {"name": "root", "parent": "", "description": ""}
+            continue
+        name = filter_name(element.attrib.get("TEXT", node_id))
+        if name in seen and duplicates is not None:
+            duplicates.append('"{}" ({} and {})'.format(name, seen[name], node_id))
+        seen.setdefault(name, node_id)
+        count = counts.get(name, 0) + 1
+        counts[name] = count
+        if count > 1:
+            name = "({count}) {name}".format(count=count, name=name)
+        stack.append(name)
+        yield {"name": name, "parent": parent, "description": ""}
+
+
+def write_rows(output: TextIO, rows: Iterator[Dict[str, str]]) -> int:
+    """Write the rows in the csv format of the taxonomy import."""
+    writer = DictWriter(output, fieldnames=FIELDNAMES)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def convert(source: str, target: str, root_id: Optional[str] = None) -> ConversionResult:
+    """Convert a mindmap into a taxonomy csv file."""
+    duplicates: List[str] = []
+    with open(target, "w", newline="") as csvfile:
+        count = write_rows(csvfile, stream_rows(source, root_id, duplicates))
+    return ConversionResult(source, target, count, duplicates)
+
+
+def convert_all(
+    sources: List[Path], output: Path, root_id: Optional[str] = None, jobs: int = 1
+) -> List[ConversionResult]:
+    """Convert multiple mindmaps into csv files in the output folder."""
+    output.mkdir(parents=True, exist_ok=True)
+    targets = [str(output / (source.stem + ".csv")) for source in sources]
+    if jobs == 1 or len(sources) < 2:
+        return [convert(str(s), t, root_id) for s, t in zip(sources, targets)]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(convert, str(source), target, root_id)
+            for source, target in zip(sources, targets)
+        ]
+        return [future.result() for future in futures]
+
+
+def convert_main(args) -> int:
+    """Convert a mindmap or a folder of mindmaps without user interaction."""
+    path = Path(args.file)
+    sources = sorted(path.glob("*.mm")) if path.is_dir() else [path]
+    output = (
+        Path(args.output) if args.output else (path if path.is_dir() else path.parent)
+    )
+    results = convert_all(sources, output, args.root, args.jobs)
+    has_duplicates = False
+    for result in results:
+        print("{} -> {} ({} rows)".format(result.source, result.target, result.rows))
+        for duplicate in result.duplicates:
+            has_duplicates = True
+            print("  duplicate name {}".format(duplicate), file=sys.stderr)
+    return 1 if has_duplicates and args.strict else 0
+
+
 def select(node: Node, with_parent: bool = False):
     children = node.children
     index = 1 if with_parent else 0
@@ -81,8 +203,30 @@ def select(node: Node, with_parent: bool = False):
 def main():
     """Main input loop."""
     parser = argparse.ArgumentParser(description="Extract a taxonomie from a Mindmap.")
-    parser.add_argument("file")
+    parser.add_argument(
+        "file", help="A mindmap or a folder of mindmaps (with --convert)."
+    )
+    parser.add_argument(
+        "-c",
+        "--convert",
+        action="store_true",
+        help="Convert without user interaction by streaming the mindmap.",
+    )
+    parser.add_argument(
+        "-o", "--output", help="Folder for the csv files (with --convert)."
+    )
+    parser.add_argument("-r", "--root", help="ID of the root node (with --convert).")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Convert mindmaps in parallel."
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help='Fail if a mindmap contains duplicate names (renamed to "(n) name").',
+    )
     args = parser.parse_args()
+    if args.convert:
+        sys.exit(convert_main(args))
     mindmap = MindMap(args.file)
 
     next_node = mindmap.root
@@ -0,0 +1,68 @@
+import csv
+import importlib.util
+import sys
+from pathlib import Path
+
+MINDMAP = """<map version="freeplane 1.7.0">
+<node TEXT="Ontologie" ID="ID_1">
+<node TEXT="Holzblasinstrument (Instrument)" ID="ID_2">
+<node TEXT="Fl&#xf6;te" ID="ID_3"/>
+<node TEXT="Oboe" ID="ID_4"><richcontent TYPE="NOTE"><html/></richcontent></node>
+</node>
+<node TEXT="Blechblasinstrument" ID="ID_5">
+<node TEXT="Horn" ID="ID_6"/>
+<node TEXT="Oboe" ID="ID_7"/>
+</node>
+</node>
+</map>
+"""
+
+
+def load_from_mindmap():
+    path = Path(__file__).parent.parent / "taxonomies" / "from_mindmap.py"
+    spec = importlib.util.spec_from_file_location("from_mindmap", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["from_mindmap"] = module  # needed to pickle the process pool jobs
+    spec.loader.exec_module(module)  # type: ignore
+    return module
+
+
+def test_stream_mindmap(tempdir: str):
+    from_mindmap = load_from_mindmap()
+    source = Path(tempdir) / "Instrument.mm"
+    source.write_text(MINDMAP, encoding="utf-8")
+
+    duplicates = []
+    rows = list(from_mindmap.stream_rows(str(source), duplicates=duplicates))
+    assert [(row["name"], row["parent"]) for row in rows] == [
+        ("root", ""),
+        ("Holzblasinstrument", "root"),
+        ("Flöte", "Holzblasinstrument"),
+        ("Oboe", "Holzblasinstrument"),
+        ("Blechblasinstrument", "root"),
+        ("Horn", "Blechblasinstrument"),
+        ("(2) Oboe", "Blechblasinstrument"),
+    ]
+    assert duplicates == ['"Oboe" (ID_4 and ID_7)']
+    names = [row["name"] for row in rows]
+    assert len(set(names)) == len(names)
+
+    subtree = list(from_mindmap.stream_rows(str(source), root_id="ID_5"))
+    assert [(row["name"], row["parent"]) for row in subtree] == [
+        ("root", ""),
+        ("Horn", "root"),
+        ("Oboe", "root"),
+    ]
+
+    # the interactive mode still sees the same tree
+    mindmap = from_mindmap.MindMap(str(source))
+    assert [n.name_filtered for n in mindmap.root.children] == [
+        "Holzblasinstrument",
+        "Blechblasinstrument",
+    ]
+
+    output = Path(tempdir) / "csv"
+    results = from_mindmap.convert_all([source, source], output, jobs=2)
+    assert [result.rows for result in results] == [7, 7]
+    with open(output / "Instrument.csv", newline="") as csv_file:
+        assert list(csv.DictReader(csv_file)) == rows
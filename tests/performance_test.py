@@ -0,0 +1,273 @@
+import logging
+import os
+import pstats
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from flask import Flask, g
+from flask.testing import FlaskClient
+from pytest import LogCaptureFixture
+from sqlalchemy import select
+from util import AuthActions, get_hateoas_resource
+
+from muse_for_music import db
+from muse_for_music.metrics import MetricsStore
+from muse_for_music.models.users import User
+from muse_for_music.performance import PHASES, RequestPerformance, fingerprint
+from muse_for_music.slow_requests import get_slow_request_store
+
+
+def test_fingerprint():
+    assert fingerprint(
+        "SELECT part.id FROM part\n WHERE part.opus_id = 12 AND part.name = 'it''s'"
+    ) == ("SELECT part.id FROM part WHERE part.opus_id = ? AND part.name = ?")
+    assert fingerprint("SELECT a FROM b WHERE b.id IN (?, ?, ?) LIMIT 10") == (
+        "SELECT a FROM b WHERE b.id IN (?) LIMIT ?"
+    )
+    assert fingerprint(
+        "SELECT a FROM b WHERE b.id IN (%(id_1_1)s, %(id_1_2)s) AND b.c = :c_1"
+    ) == fingerprint("SELECT a FROM b WHERE b.id IN (?) AND b.c = ?")
+
+
+def test_n_plus_one_detection(app: Flask, caplog: LogCaptureFixture):
+    app.config["N_PLUS_ONE_THRESHOLD"] = 3
+    with app.test_request_context("/api/"):
+        g.m4m_request_performance = r_perf = RequestPerformance()
+        user = db.session.execute(select(User)).scalars().first()
+        for _ in range(5):
+            db.session.expire(user, ["roles"])
+            assert user.roles is not None
+
+        suspects = r_perf.n_plus_one_suspects()
+        assert [count for _, count in suspects] == [5]
+
+        with caplog.at_level(logging.WARNING, logger="flask.app.perf"):
+            r_perf.end_request()
+        messages = [r.getMessage() for r in caplog.records if "N+1" in r.getMessage()]
+        assert len(messages) == 1
+        assert "5 times User.roles in view" in messages[0]
+        db.session.rollback()
+    app.config["N_PLUS_ONE_THRESHOLD"] = 10
+
+
+def test_slow_request_store(
+    client: FlaskClient, auth: AuthActions, app: Flask, tempdir: str
+):
+    token = auth.login("admin", "admin").get_json()["access_token"]
+    headers = {"Authorization": "Bearer " + token}
+    assert client.get("/api/performance/endpoints/", headers=headers).status_code == 404
+
+    app.config["SLOW_REQUEST_STORE"] = True
+    app.config["SLOW_REQUEST_STORE_PATH"] = tempdir + "/slow.sqlite"
+    app.config["SLOW_REQUEST_STORE_SIZE"] = 5
+    app.extensions.pop("m4m_slow_requests", None)
+    with app.app_context():
+        store = get_slow_request_store()
+    for duration in range(1, 8):
+        store.record(
+            "api.old", "view", "GET", "/old", 200, duration, 3, 0, 0.1, [], duration
+        )
+    # only the last 5 requests are kept
+    assert [r["duration"] for r in store.get_requests()] == [7, 6, 5, 4, 3]
+    assert [r["duration"] for r in store.get_requests(min_percentile=50)] == [7, 6, 5]
+    until = datetime.fromtimestamp(5, timezone.utc)
+    assert [r["duration"] for r in store.get_requests(until=until)] == [4, 3]
+
+    app.config["LONG_REQUEST_THRESHHOLD"] = 0
+    client.get("/api/taxonomies/", headers=headers)
+    app.config["LONG_REQUEST_THRESHHOLD"] = 1
+
+    result = client.get(
+        "/api/performance/slow-requests/",
+        query_string={"endpoint": "api.taxonomies_taxonomy_list_resource"},
+        headers=headers,
+    )
+    assert result.status_code == 200, result.get_data(as_text=True)
+    requests = result.get_json()
+    assert len(requests) == 1
+    assert requests[0]["view"].endswith("TaxonomyListResource.get")
+    assert requests[0]["query_count"] == sum(
+        q["count"] for q in requests[0]["top_queries"]
+    )
+
+    result = client.get(
+        "/api/performance/endpoints/",
+        query_string={"since": "1970-01-01T00:00:04"},
+        headers=headers,
+    )
+    assert result.status_code == 200
+    summaries = {s["endpoint"]: s for s in result.get_json()}
+    assert summaries["api.old"]["count"] == 4
+    assert summaries["api.old"]["duration_p95"] == 7
+    assert "api.taxonomies_taxonomy_list_resource" in summaries
+
+    result = client.get(
+        "/api/performance/endpoints/",
+        query_string={"since": "yesterday"},
+        headers=headers,
+    )
+    assert result.status_code == 400
+    app.config["SLOW_REQUEST_STORE"] = False
+    app.extensions.pop("m4m_slow_requests", None)
+
+
+def test_request_profiling(
+    client: FlaskClient, auth: AuthActions, app: Flask, tempdir: str
+):
+    app.config["REQUEST_PROFILE_PATH"] = tempdir
+    app.config["REQUEST_PROFILE_KEEP"] = 2
+    token = auth.login("admin", "admin").get_json()["access_token"]
+    headers = {"Authorization": "Bearer " + token}
+
+    result = client.get("/api/taxonomies/", headers=headers)
+    assert "X-M4M-Profile-Id" not in result.headers
+    # only admins can profile requests
+    result = client.get("/api/taxonomies/", headers={"X-M4M-Profile": "1"})
+    assert result.status_code == 401
+    assert "X-M4M-Profile-Id" not in result.headers
+
+    profile_ids = []
+    for _ in range(3):
+        result = client.get("/api/taxonomies/", headers={"X-M4M-Profile": "1", **headers})
+        assert result.status_code == 200
+        profile_ids.append(result.headers["X-M4M-Profile-Id"])
+    assert sorted(os.listdir(tempdir)) == sorted(
+        profile_id + extension
+        for profile_id in profile_ids[1:]
+        for extension in (".prof", ".txt")
+    )
+    pstats.Stats(os.path.join(tempdir, profile_ids[-1] + ".prof"))
+
+    result = client.get(
+        "/api/performance/profiles/{}/".format(profile_ids[-1]), headers=headers
+    )
+    assert result.status_code == 200
+    summary = result.get_data(as_text=True)
+    assert summary.startswith("GET http://localhost/api/taxonomies/ -> 200")
+    assert "function calls" in summary
+    result = client.get(
+        "/api/performance/profiles/{}/".format(profile_ids[0]), headers=headers
+    )
+    assert result.status_code == 404
+
+
+def test_request_phases(
+    client: FlaskClient, auth: AuthActions, app: Flask, caplog: LogCaptureFixture
+):
+    with app.test_request_context("/api/"):
+        r_perf = RequestPerformance()
+        r_perf.enter_phase("marshal")
+        r_perf.enter_phase("sql")
+        r_perf.enter_phase("links")  # never closed (e.g. an exception)
+        r_perf.exit_phase("sql")
+        r_perf.exit_phase("marshal")
+        r_perf.exit_phase("json")  # not entered
+        assert r_perf._phase_stack == []
+        assert all(r_perf.phases[phase] > 0 for phase in ("marshal", "sql", "links"))
+        assert r_perf.phases["json"] == 0
+
+    token = auth.login("admin", "admin").get_json()["access_token"]
+
+    def get_phases(url: str):
+        caplog.clear()
+        with caplog.at_level(logging.INFO, logger="flask.app.perf"):
+            result = client.get(url, headers={"Authorization": "Bearer " + token})
+        assert result.status_code == 200
+        reports = [
+            r.getMessage()
+            for r in caplog.records
+            if r.getMessage().startswith("performance report: phases")
+        ]
+        assert len(reports) == 1
+        phases = reports[0][len("performance report: phases ") :].split(", url")[0]
+        return {
+            phase: float(duration[:-2])
+            for phase, duration in (p.split(" ") for p in phases.split(", "))
+        }
+
+    phases = get_phases("/api/persons/")
+    assert list(phases) == list(PHASES)
+    assert all(phases[phase] > 0 for phase in ("sql", "marshal", "json"))
+    assert phases["orm"] == 0  # only measured with REQUEST_PHASE_ORM
+    app.config["REQUEST_PHASE_ORM"] = True
+    phases = get_phases("/api/persons/")
+    assert all(phases[phase] > 0 for phase in ("sql", "orm", "marshal", "json"))
+    app.config["REQUEST_PHASE_ORM"] = False
+    phases = get_phases("/api/taxonomies/")
+    assert phases["links"] > 0
+
+
+def test_metrics(client: FlaskClient, auth: AuthActions, app: Flask, tempdir: str):
+    assert client.get("/metrics").status_code == 404
+    app.config["REQUEST_METRICS"] = True
+    app.config["METRICS_PATH"] = tempdir
+    app.extensions.pop("m4m_metrics", None)
+
+    # a second worker that already wrote its metrics
+    with open(tempdir + "/metrics-1-1.json", "w") as worker_file:
+        worker_file.write(
+            '{"counters": {"m4m_http_requests_total": [[[["endpoint", "api.root"],'
+            ' ["method", "GET"], ["status", "200"]], 5]]}, "histograms": {}}'
+        )
+    # a worker that has exited since
+    exited_pid = subprocess.run(
+        [sys.executable, "-c", "import os; print(os.getpid())"],
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+    with open("{}/metrics-{}-1.json".format(tempdir, exited_pid), "w") as worker_file:
+        worker_file.write(
+            '{"counters": {"m4m_http_requests_total": [[[["endpoint", "api.root"],'
+            ' ["method", "GET"], ["status", "200"]], 2]]}, "histograms": {}}'
+        )
+
+    assert client.get("/metrics").status_code == 401
+    get_hateoas_resource(client)
+    token = auth.login("admin", "admin").get_json()["access_token"]
+    result = client.get("/metrics", headers={"Authorization": "Bearer " + token})
+    assert result.status_code == 200
+    assert result.mimetype == "text/plain"
+    lines = result.get_data(as_text=True).splitlines()
+    assert "# TYPE m4m_http_request_duration_seconds histogram" in lines
+    assert (
+        'm4m_http_requests_total{endpoint="api.root",method="GET",status="200"} 8'
+        in lines
+    )
+    # the metrics of the exited worker are archived only once
+    assert {f for f in os.listdir(tempdir) if f.endswith(".json")} == {
+        "metrics-1-1.json",
+        "metrics-archive.json",
+        os.path.basename(app.extensions["m4m_metrics"].file_path),
+    }
+    result = client.get("/metrics", headers={"Authorization": "Bearer " + token})
+    assert (
+        'm4m_http_requests_total{endpoint="api.root",method="GET",status="200"} 8'
+        in result.get_data(as_text=True).splitlines()
+    )
+    assert (
+        'm4m_http_requests_total{endpoint="metrics",method="GET",status="401"} 1' in lines
+    )
+    assert (
+        'm4m_http_request_duration_seconds_count{endpoint="api.root",method="GET"} 1'
+        in lines
+    )
+    assert any(
+        line.startswith(
+            'm4m_db_queries_total{endpoint="user_api.auth_login",kind="read"}'
+        )
+        for line in lines
+    )
+    app.extensions.pop("m4m_metrics", None)
+    app.config["REQUEST_METRICS"] = False
+
+
+def test_metrics_flush_error(tempdir: str):
+    store = MetricsStore(tempdir)
+    os.mkdir(store.file_path)  # os.replace can not replace a directory
+    store.inc("m4m_http_requests_total", (("endpoint", "api.root"),))
+    store.flush(force=True)
+    assert not [f for f in os.listdir(tempdir) if f.startswith(".metrics-")]
+    os.rmdir(store.file_path)
+    store.flush(force=True)  # the failed flush is retried
+    assert os.path.isfile(store.file_path)
@@ -0,0 +1,980 @@
+import csv
+import json
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from flask_restx import fields, marshal
+from flask_restx.errors import ValidationError
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.sql import insert, select, update
+from util import AuthActions, auth_header
+
+from muse_for_music import db
+from muse_for_music.api import taxonomies as taxonomies_api
+from muse_for_music.api.autocomplete import AutocompleteEntry, PrefixIndex
+from muse_for_music.api.taxonomies.models import (
+    TaxonomyItemNested,
+    list_taxonomy_model,
+    taxonomy_item_get,
+    taxonomy_tree_item_get,
+    tree_taxonomy_model,
+)
+from muse_for_music.api.taxonomies.snapshot import TaxonomySnapshotStore
+from muse_for_music.models.data.citations import Citations
+from muse_for_music.models.data.people import Person
+from muse_for_music.models.taxonomies import (
+    DB_COMMAND_LOGGER,
+    TaxonomyClosure,
+    TaxonomyVersion,
+    get_taxonomies,
+    get_taxonomy_info,
+    sync,
+)
+from muse_for_music.models.taxonomies.bulk import insert_selecting_ids
+from muse_for_music.models.taxonomies.export import export_taxonomies
+from muse_for_music.models.taxonomies.usage import get_taxonomy_references
+from muse_for_music.models.taxonomies.version import mark_taxonomy_changed
+
+
+def editor_token(auth: AuthActions):
+    auth.add_role("taxonomy_editor")
+    return auth.login().get_json()["access_token"]
+
+
+def test_cached_tree_taxonomy(
+    client: FlaskClient, auth: AuthActions, app: Flask, taxonomies
+):
+    token = editor_token(auth)
+    url = "/api/taxonomies/tree/Instrument/"
+    first = client.get(url, headers=auth_header(token))
+    assert first.status_code == 200, first.get_data().decode()
+    second = client.get(url, headers=auth_header(token))
+    assert second.get_data() == first.get_data()
+
+    with app.test_request_context(url):
+        expected = marshal(taxonomies["INSTRUMENT"], tree_taxonomy_model)
+    assert first.get_json() == expected
+
+
+def test_taxonomy_cache_invalidation(client: FlaskClient, auth: AuthActions, taxonomies):
+    token = editor_token(auth)
+    url = "/api/taxonomies/list/Anteil/"
+    before = client.get(url, headers=auth_header(token)).get_json()
+    result = client.post(
+        url, json={"name": "cache-test", "description": ""}, headers=auth_header(token)
+    )
+    assert result.status_code == 200, result.get_data().decode()
+    new_item = result.get_json()
+    after = client.get(url, headers=auth_header(token)).get_json()
+    assert len(after["items"]) == len(before["items"]) + 1
+
+    item_url = "{}{}/".format(url, new_item["id"])
+    result = client.put(
+        item_url,
+        json={"name": "cache-test-renamed", "description": ""},
+        headers=auth_header(token),
+    )
+    assert result.status_code == 200, result.get_data().decode()
+    after = client.get(url, headers=auth_header(token)).get_json()
+    assert "cache-test-renamed" in {item["name"] for item in after["items"]}
+
+    result = client.delete(item_url, headers=auth_header(token))
+    assert result.status_code == 200, result.get_data().decode()
+    after = client.get(url, headers=auth_header(token)).get_json()
+    assert after["items"] == before["items"]
+
+
+def test_taxonomy_version_from_other_worker(
+    client: FlaskClient, auth: AuthActions, app: Flask, taxonomies
+):
+    token = editor_token(auth)
+    url = "/api/taxonomies/list/Anteil/"
+    before = client.get(url, headers=auth_header(token)).get_json()
+    tax = taxonomies["ANTEIL"]
+    with app.app_context():
+        # simulate a write of another worker that bypasses this worker
+        item_id = before["items"][0]["id"]
+        db.session.execute(update(tax).where(tax.id == item_id).values(name="renamed"))
+        db.session.execute(
+            update(TaxonomyVersion)
+            .where(TaxonomyVersion.name == tax.__name__)
+            .values(version=TaxonomyVersion.version + 1)
+        )
+        db.session.commit()
+    after = client.get(url, headers=auth_header(token)).get_json()
+    assert after["items"][0]["name"] == "renamed"
+    with app.app_context():
+        item = db.session.get(tax, item_id)
+        item.name = before["items"][0]["name"]
+        tax.mark_changed()
+        db.session.commit()
+
+
+def test_taxonomy_version_upsert(app: Flask):
+    with app.app_context():
+        for expected in (1, 2):
+            mark_taxonomy_changed("UpsertTest")
+            db.session.commit()
+            version_q = select(TaxonomyVersion.version).where(
+                TaxonomyVersion.name == "UpsertTest"
+            )
+            assert db.session.execute(version_q).scalar_one() == expected
+
+
+def test_taxonomy_etag(client: FlaskClient, auth: AuthActions, taxonomies):
+    token = editor_token(auth)
+    for url in ("/api/taxonomies/list/Anteil/", "/api/taxonomies/tree/Instrument/"):
+        result = client.get(url, headers=auth_header(token))
+        etag = result.headers["ETag"]
+        headers = {"If-None-Match": etag, **auth_header(token)}
+        not_modified = client.get(url, headers=headers)
+        assert not_modified.status_code == 304
+        assert not_modified.headers["ETag"] == etag
+        assert not not_modified.get_data()
+
+    url = "/api/taxonomies/list/Anteil/"
+    etag = client.get(url, headers=auth_header(token)).headers["ETag"]
+    result = client.post(
+        url, json={"name": "etag-test", "description": ""}, headers=auth_header(token)
+    )
+    assert result.status_code == 200, result.get_data().decode()
+    headers = {"If-None-Match": etag, **auth_header(token)}
+    modified = client.get(url, headers=headers)
+    assert modified.status_code == 200
+    assert modified.headers["ETag"] != etag
+    client.delete(
+        "{}{}/".format(url, result.get_json()["id"]), headers=auth_header(token)
+    )
+
+
+def test_taxonomy_snapshot(
+    client: FlaskClient, auth: AuthActions, app: Flask, tempdir, taxonomies
+):
+    token = editor_token(auth)
+    url = "/api/taxonomies/list/Anteil/"
+    tree_url = "/api/taxonomies/tree/Instrument/"
+    expected = client.get(url, headers=auth_header(token)).get_data()
+    expected_tree = client.get(tree_url, headers=auth_header(token)).get_data()
+    bundle_url = "/api/taxonomies/bundle/"
+    bundle = client.get(bundle_url, headers=auth_header(token)).get_json()
+    app.config.update(TAXONOMY_SNAPSHOT=True, TAXONOMY_SNAPSHOT_PATH=tempdir)
+    app.extensions.pop("m4m_taxonomy_snapshots", None)
+    try:
+        assert client.get(url, headers=auth_header(token)).get_data() == expected
+        with app.app_context():
+            version = taxonomies["ANTEIL"].get_version()
+            tree_version = taxonomies["INSTRUMENT"].get_version()
+        # a second worker serves the taxonomies from the file without encoding
+        other_worker = TaxonomySnapshotStore(tempdir)
+        host_url = "http://localhost/"
+        key = "Anteil:" + list_taxonomy_model.name
+        view = other_worker.get(host_url, key, version, lambda: b"")
+        assert isinstance(view, memoryview) and view == expected
+        # the first miss wrote the snapshot of all taxonomies
+        tree_key = "Instrument:" + tree_taxonomy_model.name
+        tree_view = other_worker.get(host_url, tree_key, tree_version, lambda: b"")
+        assert tree_view == expected_tree
+        result = client.get(tree_url, headers=auth_header(token))
+        assert result.content_length == len(expected_tree)
+        assert result.get_data() == expected_tree
+        assert client.get(bundle_url, headers=auth_header(token)).get_json() == bundle
+
+        client.post(
+            url,
+            json={"name": "snapshot-test", "description": ""},
+            headers=auth_header(token),
+        )
+        data = client.get(url, headers=auth_header(token)).get_data()
+        assert b"snapshot-test" in data
+        assert other_worker.get(host_url, key, version + 1, lambda: b"") == data
+        assert other_worker.get(host_url, tree_key, tree_version, lambda: b"") == (
+            expected_tree
+        )
+    finally:
+        app.config["TAXONOMY_SNAPSHOT"] = False
+        app.extensions.pop("m4m_taxonomy_snapshots", None)
+
+
+def test_taxonomy_bundle(client: FlaskClient, auth: AuthActions, taxonomies):
+    token = editor_token(auth)
+    url = "/api/taxonomies/bundle/"
+    result = client.get(url, headers=auth_header(token))
+    assert result.status_code == 200, result.get_data().decode()
+    bundle = result.get_json()
+    assert len(bundle["taxonomies"]) == len(taxonomies)
+    assert bundle["unchanged"] == []
+    instrument = client.get(
+        "/api/taxonomies/tree/Instrument/", headers=auth_header(token)
+    ).get_json()
+    assert bundle["taxonomies"]["Instrument"]["taxonomy"] == instrument
+
+    query = "?taxonomies=Instrument,anteil&versions=Anteil:{}".format(
+        bundle["taxonomies"]["Anteil"]["version"]
+    )
+    result = client.get(url + query, headers=auth_header(token))
+    assert result.status_code == 200, result.get_data().decode()
+    partial = result.get_json()
+    assert list(partial["taxonomies"].keys()) == ["Instrument"]
+    assert partial["unchanged"] == ["Anteil"]
+
+    result = client.get(url + "?versions=Anteil", headers=auth_header(token))
+    assert result.status_code == 400
+    result = client.get(url + "?taxonomies=Unknown", headers=auth_header(token))
+    assert result.status_code == 404
+
+
+def test_tree_taxonomy_closure(
+    client: FlaskClient, auth: AuthActions, app: Flask, taxonomies
+):
+    token = editor_token(auth)
+    tax = taxonomies["INSTRUMENT"]
+    root_id = client.get(
+        "/api/taxonomies/tree/Instrument/", headers=auth_header(token)
+    ).get_json()["items"]["id"]
+    url = "/api/taxonomies/tree/Instrument/{}/"
+    parent = client.post(
+        url.format(root_id),
+        json={"name": "closure-parent", "description": ""},
+        headers=auth_header(token),
+    ).get_json()
+    child = client.post(
+        url.format(parent["id"]),
+        json={"name": "closure-child", "description": ""},
+        headers=auth_header(token),
+    ).get_json()
+
+    def subtree(item_id):
+        q = select(tax.id).where(tax.in_subtree(tax.id, item_id))
+        return set(db.session.execute(q).scalars().all())
+
+    with app.app_context():
+        assert subtree(parent["id"]) == {parent["id"], child["id"]}
+        assert child["id"] in subtree(root_id)
+        all_ids = set(db.session.execute(select(tax.id)).scalars().all())
+        assert subtree(root_id) == all_ids - {tax.not_applicable_item().id}
+
+        # move the child up to the root
+        db.session.get(tax, child["id"]).parent_id = root_id
+        db.session.commit()
+        assert subtree(parent["id"]) == {parent["id"]}
+        assert child["id"] in subtree(root_id)
+        closure_q = select(TaxonomyClosure.__table__)
+        before_rebuild = db.session.execute(closure_q).all()
+        tax.rebuild_closure()
+        db.session.commit()
+        after_rebuild = db.session.execute(closure_q).all()
+        assert set(before_rebuild) == set(after_rebuild)
+
+    for item in (child, parent):
+        result = client.delete(url.format(item["id"]), headers=auth_header(token))
+        assert result.status_code == 200, result.get_data().decode()
+    with app.app_context():
+        assert subtree(parent["id"]) == set()
+        assert child["id"] not in subtree(root_id)
+
+
+def test_tree_nodes_match_orm_items(
+    client: FlaskClient, auth: AuthActions, app: Flask, taxonomies
+):
+    token = editor_token(auth)
+    tax = taxonomies["INSTRUMENT"]
+
+    def sort_children(item):
+        item["children"].sort(key=lambda child: child["id"])
+        for child in item["children"]:
+            sort_children(child)
+        return item
+
+    with app.test_request_context("/"):
+        root = tax.get_root()
+        orm_tree = sort_children(marshal(root, taxonomy_tree_item_get))
+        assert marshal(tax.get_tree(), taxonomy_tree_item_get) == orm_tree
+        subtree_root = root.children[0]
+        orm_subtree = sort_children(marshal(subtree_root, taxonomy_tree_item_get))
+
+    url = "/api/taxonomies/tree/Instrument/{}/".format(subtree_root.id)
+    result = client.get(url, headers=auth_header(token))
+    assert result.status_code == 200, result.get_data().decode()
+    assert result.get_json() == orm_subtree
+
+
+def taxonomy_contents(taxonomies):
+    contents = {}
+    for name, tax in taxonomies.items():
+        if tax.taxonomy_type == "tree":
+            root = tax.get_tree()
+            contents[name] = tree_contents(root) if root else None
+        else:
+            contents[name] = sorted((i.name, i.description) for i in tax.get_all())
+        contents[name + "-na"] = tax.not_applicable_item() is not None
+    return contents
+
+
+def tree_contents(node):
+    return (node.name, node.description, [tree_contents(c) for c in node.children])
+
+
+def test_bulk_taxonomy_import(app_with_temp: Flask):
+    app = app_with_temp
+    folder = str(Path(__file__).parent.parent / "taxonomies")
+    runner = app.test_cli_runner()
+    with app.app_context():
+        result = runner.invoke(args=["init_taxonomies", folder])
+        assert result.exit_code == 0, result.output
+        taxonomies = get_taxonomies()
+        expected = taxonomy_contents(taxonomies)
+        closure_q = select(TaxonomyClosure.__table__)
+        expected_closure_size = len(db.session.execute(closure_q).all())
+        instrument_version = taxonomies["INSTRUMENT"].get_version()
+
+    with app.app_context():
+        result = runner.invoke(args=["init_taxonomies", "-r", "-j", "2", folder])
+        assert result.exit_code == 0, result.output
+        assert taxonomy_contents(taxonomies) == expected
+        assert len(db.session.execute(closure_q).all()) == expected_closure_size
+        assert taxonomies["INSTRUMENT"].get_version() > instrument_version
+
+
+def test_insert_selecting_ids(app: Flask, taxonomies):
+    tax = taxonomies["INSTRUMENT"]
+    with app.app_context():
+        root_id = tax.get_id_by_name("root")
+        values = [
+            {"name": name, "description": None, "parent_id": root_id}
+            for name in ("select-a", "select-b", "select-a")
+        ]
+        ids = insert_selecting_ids(tax, values)
+        assert ids[0] < ids[2]
+        for item_id, item_values in zip(ids, values):
+            assert db.session.get(tax, item_id).name == item_values["name"]
+        list_tax = taxonomies["EPOCHE"]
+        ids = insert_selecting_ids(list_tax, [{"name": "select-c", "description": None}])
+        assert db.session.get(list_tax, ids[0]).name == "select-c"
+        db.session.rollback()
+
+
+def test_export_taxonomies_streams():
+    loaded: list[str] = []
+
+    def fake_taxonomy(name: str):
+        def export_data():
+            loaded.append(name)
+            return [name]
+
+        return type(
+            name,
+            (),
+            {
+                "taxonomy_type": "list",
+                "get_version": staticmethod(lambda: 1),
+                "export_data": staticmethod(export_data),
+                "export_rows": staticmethod(
+                    lambda data, logger: ({"name": row} for row in data)
+                ),
+            },
+        )
+
+    taxonomies = [fake_taxonomy("Tax{}".format(i)) for i in range(5)]
+    exported = export_taxonomies(taxonomies, 1, DB_COMMAND_LOGGER)
+    first = next(exported)
+    assert first.name == "Tax0" and first.row_count == 1
+    assert len(loaded) < len(taxonomies)
+    assert [tax.name for tax in exported] == ["Tax1", "Tax2", "Tax3", "Tax4"]
+    assert len(loaded) == len(taxonomies)
+
+
+def test_export_taxonomies(app_with_temp: Flask, tempdir: str):
+    app = app_with_temp
+    source = str(Path(__file__).parent.parent / "taxonomies")
+    runner = app.test_cli_runner()
+    folder = Path(tempdir) / "export"
+    archive = Path(tempdir) / "export.zip"
+    with app.app_context():
+        result = runner.invoke(args=["init_taxonomies", "-r", source])
+        assert result.exit_code == 0, result.output
+        taxonomies = get_taxonomies()
+        expected = taxonomy_contents(taxonomies)
+
+        result = runner.invoke(args=["export_taxonomies", "-j", "3", str(folder)])
+        assert result.exit_code == 0, result.output
+        result = runner.invoke(args=["export_taxonomies", str(archive)])
+        assert result.exit_code == 0, result.output
+
+        with zipfile.ZipFile(archive) as zip_file:
+            manifest = json.loads(zip_file.read("manifest.json"))
+            assert [t["name"] for t in manifest["taxonomies"]] == [
+                tax.__name__ for tax in taxonomies.values()
+            ]
+            for entry in manifest["taxonomies"]:
+                content = zip_file.read(entry["file"])
+                assert content == (folder / entry["file"]).read_bytes()
+                assert len(content.decode().splitlines()) == entry["rows"] + 1
+                tax = taxonomies[entry["name"].upper()]
+                assert entry["version"] == tax.get_version()
+
+        # the files are identical to the csv files written by Taxonomy.save
+        for name in ("INSTRUMENT", "ANTEIL"):
+            tax = taxonomies[name]
+            legacy = Path(tempdir) / "legacy.csv"
+            with open(legacy, mode="w") as csv_file:
+                writer = csv.DictWriter(csv_file, ["name", "parent", "description"])
+                tax.save(writer, DB_COMMAND_LOGGER)
+            assert legacy.read_bytes() == (folder / (tax.__name__ + ".csv")).read_bytes()
+        assert taxonomy_contents(taxonomies) == expected
+
+        subset = Path(tempdir) / "subset.tar.gz"
+        args = ["export_taxonomies", "-t", "instrument", "-t", "Anteil", str(subset)]
+        result = runner.invoke(args=args)
+        assert result.exit_code == 0, result.output
+        with tarfile.open(subset) as tar_file:
+            names = tar_file.getnames()
+            assert names == ["Instrument.csv", "Anteil.csv", "manifest.json"]
+            content = tar_file.extractfile("Instrument.csv").read()  # type: ignore
+            assert content == (folder / "Instrument.csv").read_bytes()
+
+        result = runner.invoke(args=["export_taxonomies", "-t", "missing", str(subset)])
+        assert result.exit_code != 0
+
+
+def test_sync_taxonomies(app_with_temp: Flask, tempdir: str, monkeypatch):
+    app = app_with_temp
+    runner = app.test_cli_runner()
+    source = Path(__file__).parent.parent / "taxonomies" / "Instrument.csv"
+    with open(source) as csv_file:
+        rows = list(csv.DictReader(csv_file))
+    for row in rows:
+        if row["name"] == "klarinettenartiges Instrument":
+            row["parent"] = "Doppelrohrblattinstrument"
+        elif row["name"] == "Oboe":
+            row["description"] = "changed"
+        elif row["name"] == "Fagott":
+            row["name"] = "Fagotto"
+    rows.append({"name": "neu", "parent": "klarinettenartiges Instrument"})
+    modified = Path(tempdir) / "Instrument.csv"
+    with open(modified, mode="w") as csv_file:
+        writer = csv.DictWriter(csv_file, ["name", "parent", "description"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+    with app.app_context():
+        tax = get_taxonomies()["INSTRUMENT"]
+        result = runner.invoke(args=["sync_taxonomies", str(source.parent)])
+        assert result.exit_code == 0, result.output
+        ids_before = {node.name: node.id for node in tax.get_nodes().values()}
+        version = tax.get_version()
+
+        result = runner.invoke(args=["sync_taxonomies", "--dry-run", tempdir])
+        assert result.exit_code == 0, result.output
+        assert "2 inserted, 1 updated, 1 moved, 1 deleted" in result.output
+        assert {n.name: n.id for n in tax.get_nodes().values()} == ids_before
+
+        result = runner.invoke(args=["sync_taxonomies", tempdir])
+        assert result.exit_code == 0, result.output
+        assert "2 inserted, 1 updated, 1 moved, 1 deleted" in result.output
+        nodes = tax.get_nodes()
+        ids_after = {node.name: node.id for node in nodes.values()}
+        assert ids_after.keys() == (ids_before.keys() - {"Fagott"}) | {"Fagotto", "neu"}
+        for name, item_id in ids_after.items():
+            assert ids_before.get(name, item_id) == item_id
+        assert nodes[ids_after["Oboe"]].description == "changed"
+        subtree_q = select(tax.id).where(
+            tax.in_subtree(tax.id, ids_after["Doppelrohrblattinstrument"])
+        )
+        subtree = set(db.session.execute(subtree_q).scalars())
+        assert {ids_after["kleine Klarinette"], ids_after["neu"]} <= subtree
+        assert tax.get_version() > version
+
+        closure_q = select(TaxonomyClosure.__table__).where(
+            TaxonomyClosure.taxonomy == tax.__tablename__
+        )
+        closure = set(db.session.execute(closure_q).all())
+        tax.rebuild_closure()
+        assert set(db.session.execute(closure_q).all()) == closure
+        db.session.rollback()
+
+        # a failing closure update rolls back the whole sync
+        def move_below_descendant(*args):
+            raise ValueError("A taxonomy item cannot be moved below its own descendant!")
+
+        monkeypatch.setattr(sync, "move_closure_item", move_below_descendant)
+        result = runner.invoke(args=["sync_taxonomies", str(source.parent)])
+        assert result.exit_code == 0, result.output
+        assert "below its own descendant! No taxonomy was changed." in result.output
+        assert {n.name: n.id for n in tax.get_nodes().values()} == ids_after
+
+
+def test_taxonomy_usage(client: FlaskClient, auth: AuthActions, app: Flask, taxonomies):
+    token = editor_token(auth)
+    with app.app_context():
+        references = get_taxonomy_references(taxonomies["INSTRUMENT"])
+        names = {reference.name for reference in references}
+        assert "instrument_to_citations.instrument_id" in names
+        assert "instumentation_to_instrument.instrument_id" in names
+        assert not any(name.startswith("instrument.") for name in names)
+
+    result = client.get(
+        "/api/taxonomies/tree/Instrument/usage/", headers=auth_header(token)
+    )
+    assert result.status_code == 200, result.get_data().decode()
+    usage = result.get_json()
+    assert set(usage["references"]) == names
+    with app.app_context():
+        item_count = len(db.session.execute(select(taxonomies["INSTRUMENT"].id)).all())
+    assert len(usage["items"]) == item_count
+    item = usage["items"][0]
+    assert item["usage_count"] == sum(item["references"].values())
+
+    result = client.get(
+        "/api/taxonomies/tree/Instrument/{}/usage/?page_size=5".format(item["id"]),
+        headers=auth_header(token),
+    )
+    assert result.status_code == 200, result.get_data().decode()
+    where_used = result.get_json()
+    assert where_used["usage_count"] == item["usage_count"]
+    assert len(where_used["references"]) == min(item["usage_count"], 5)
+
+    result = client.get(
+        "/api/taxonomies/list/Instrument/usage/", headers=auth_header(token)
+    )
+    assert result.status_code == 400
+
+
+def test_merge_taxonomy_items(
+    client: FlaskClient, auth: AuthActions, app: Flask, taxonomies
+):
+    token = editor_token(auth)
+    url = "/api/taxonomies/list/Epoche/"
+    source, target = (
+        client.post(
+            url, json={"name": name, "description": ""}, headers=auth_header(token)
+        ).get_json()
+        for name in ("merge-source", "merge-target")
+    )
+    association = db.metadata.tables["epoche_to_citations"]
+    with app.app_context():
+        citation_ids = [
+            db.session.execute(insert(Citations)).inserted_primary_key[0]
+            for _ in range(2)
+        ]
+        db.session.execute(
+            insert(association),
+            [
+                {"citations_id": citation_ids[0], "epoche_id": source["id"]},
+                {"citations_id": citation_ids[1], "epoche_id": source["id"]},
+                {"citations_id": citation_ids[1], "epoche_id": target["id"]},
+            ],
+        )
+        db.session.commit()
+
+    merge_url = "{}{}/merge/".format(url, source["id"])
+    result = client.post(
+        merge_url, json={"target": source["id"]}, headers=auth_header(token)
+    )
+    assert result.status_code == 400, result.get_data().decode()
+    result = client.post(
+        merge_url, json={"target": target["id"]}, headers=auth_header(token)
+    )
+    assert result.status_code == 200, result.get_data().decode()
+    merged = result.get_json()
+    assert merged["target"]["id"] == target["id"]
+    assert merged["updated"] == {"epoche_to_citations.epoche_id": 1}
+    assert merged["removed_duplicates"] == {"epoche_to_citations.epoche_id": 1}
+
+    with app.app_context():
+        tax = taxonomies["EPOCHE"]
+        assert db.session.get(tax, source["id"]) is None
+        rows = db.session.execute(
+            select(association).where(association.c.citations_id.in_(citation_ids))
+        ).all()
+        assert set(rows) == {(c, target["id"]) for c in citation_ids}
+
+    history = client.get("/api/history/", headers=auth_header(token)).get_json()
+    merges = [entry for entry in history if entry["method"] == "merge"]
+    assert merges[0]["type"] == "taxonomy"
+    assert "resource" not in merges[0]
+    assert merges[0]["full_resource"] == {
+        "type": "HistoryTaxonomyItemGET",
+        "id": target["id"],
+        "taxonomy": "Epoche",
+        "name": "merge-target",
+        "merged_id": source["id"],
+    }
+
+    # children of merged tree items are moved below the target
+    tax = taxonomies["INSTRUMENT"]
+    url = "/api/taxonomies/tree/Instrument/{}/"
+    root_id = client.get(
+        "/api/taxonomies/tree/Instrument/", headers=auth_header(token)
+    ).get_json()["items"]["id"]
+    source, target = (
+        client.post(
+            url.format(root_id),
+            json={"name": name, "description": ""},
+            headers=auth_header(token),
+        ).get_json()
+        for name in ("merge-source", "merge-target")
+    )
+    child = client.post(
+        url.format(source["id"]),
+        json={"name": "merge-child", "description": ""},
+        headers=auth_header(token),
+    ).get_json()
+    result = client.post(
+        url.format(source["id"]) + "merge/",
+        json={"target": child["id"]},
+        headers=auth_header(token),
+    )
+    assert result.status_code == 400, result.get_data().decode()
+    result = client.post(
+        url.format(source["id"]) + "merge/",
+        json={"target": target["id"]},
+        headers=auth_header(token),
+    )
+    assert result.status_code == 200, result.get_data().decode()
+    assert result.get_json()["moved_children"] == 1
+    with app.app_context():
+        assert db.session.get(tax, child["id"]).parent_id == target["id"]
+        closure_q = select(TaxonomyClosure.__table__).where(
+            TaxonomyClosure.taxonomy == tax.__tablename__
+        )
+        closure = set(db.session.execute(closure_q).all())
+        tax.rebuild_closure()
+        assert set(db.session.execute(closure_q).all()) == closure
+        db.session.rollback()
+
+
+def test_tree_taxonomy_depth(
+    client: FlaskClient, auth: AuthActions, app: Flask, taxonomies
+):
+    token = editor_token(auth)
+    root_id = client.get(
+        "/api/taxonomies/tree/Tempo/", headers=auth_header(token)
+    ).get_json()["items"]["id"]
+    url = "/api/taxonomies/tree/Tempo/{}/".format(root_id)
+    full = client.get(url, headers=auth_header(token)).get_json()
+
+    def count_descendants(item):
+        return sum(1 + count_descendants(child) for child in item["children"])
+
+    result = client.get(url + "?depth=0", headers=auth_header(token))
+    assert result.status_code == 200, result.get_data().decode()
+    lazy = result.get_json()
+    assert lazy["children"] == []
+    assert lazy["child_count"] == len(full["children"])
+    assert lazy["descendant_count"] == count_descendants(full)
+
+    lazy = client.get(url + "?depth=1", headers=auth_header(token)).get_json()
+    assert [c["id"] for c in lazy["children"]] == [c["id"] for c in full["children"]]
+    assert lazy["descendant_count"] == count_descendants(full)
+    for child, full_child in zip(lazy["children"], full["children"]):
+        assert child["children"] == []
+        assert child["child_count"] == len(full_child["children"])
+        assert child["descendant_count"] == count_descendants(full_child)
+
+    lazy = client.get(url + "?depth=10", headers=auth_header(token)).get_json()
+    assert count_descendants(lazy) == count_descendants(full)
+
+    result = client.get(url + "?depth=-1", headers=auth_header(token))
+    assert result.status_code == 400
+    result = client.get(url + "?depth=a", headers=auth_header(token))
+    assert result.status_code == 400
+
+
+def test_tree_taxonomy_batch_post(
+    client: FlaskClient, auth: AuthActions, app: Flask, taxonomies, monkeypatch
+):
+    token = editor_token(auth)
+    tax = taxonomies["MUSIKALISCHEWENDUNG"]
+    with app.app_context():
+        parent_id = tax.get_id_by_name("MUSIKALISCHEWENDUNG-1")
+        version = tax.get_version()
+    url = "/api/taxonomies/tree/MusikalischeWendung/{}/batch/".format(parent_id)
+    items = [
+        {
+            "name": "batch-1",
+            "description": "first",
+            "children": [
+                {"name": "batch-1-1", "children": [{"name": "batch-1-1-1"}]},
+                {"name": "batch-1-2"},
+            ],
+        },
+        {"name": "batch-2", "description": None},
+    ]
+    result = client.post(url, json=items, headers=auth_header(token))
+    assert result.status_code == 200, result.get_data().decode()
+    data = result.get_json()
+    assert data["parent"] == parent_id
+    ids = dict(
+        zip(["batch-1", "batch-1-1", "batch-1-1-1", "batch-1-2", "batch-2"], data["ids"])
+    )
+    with app.app_context():
+        assert tax.get_version() > version
+        nodes = tax.get_nodes()
+        assert nodes[ids["batch-1"]].description == "first"
+        assert nodes[ids["batch-1-1-1"]].parent_id == ids["batch-1-1"]
+        assert nodes[ids["batch-2"]].parent_id == parent_id
+        closure_q = select(TaxonomyClosure.__table__).where(
+            TaxonomyClosure.taxonomy == tax.__tablename__
+        )
+        closure = set(db.session.execute(closure_q).all())
+        tax.rebuild_closure()
+        assert set(db.session.execute(closure_q).all()) == closure
+        db.session.rollback()
+
+    for invalid in ([{"name": "root"}], [{"name": "ok", "children": [{}]}], {}):
+        result = client.post(url, json=invalid, headers=auth_header(token))
+        assert result.status_code == 400, result.get_data().decode()
+    with app.app_context():
+        assert tax.get_id_by_name("ok") is None
+
+    def failing_insert(error: Exception):
+        def insert_tree_items(*args):
+            raise error
+
+        return insert_tree_items
+
+    for error, status in (
+        (IntegrityError("INSERT", {}, Exception("conflict")), 409),
+        (DataError("INSERT", {}, Exception("too long")), 400),
+    ):
+        monkeypatch.setattr(taxonomies_api, "insert_tree_items", failing_insert(error))
+        result = client.post(url, json=[{"name": "ok"}], headers=auth_header(token))
+        assert result.status_code == status, result.get_data().decode()
+
+
+def test_taxonomy_changes(client: FlaskClient, auth: AuthActions, app: Flask, taxonomies):
+    token = editor_token(auth)
+    url = "/api/taxonomies/list/Gattung/"
+    changes_url = "/api/taxonomies/list/Gattung/changes/?since={}"
+    with app.app_context():
+        version = taxonomies["GATTUNG"].get_version()
+        gattung_1 = taxonomies["GATTUNG"].get_id_by_name("GATTUNG-1")
+        gattung_2 = taxonomies["GATTUNG"].get_id_by_name("GATTUNG-2")
+    result = client.get(changes_url.format(version), headers=auth_header(token))
+    assert result.get_json()["items"] == [] and not result.get_json()["snapshot"]
+
+    new_item = client.post(
+        url, json={"name": "journal-new", "description": ""}, headers=auth_header(token)
+    ).get_json()
+    client.put(
+        "{}{}/".format(url, gattung_1),
+        json={"name": "GATTUNG-1", "description": "changed"},
+        headers=auth_header(token),
+    )
+    client.delete("{}{}/".format(url, gattung_2), headers=auth_header(token))
+    changes = client.get(changes_url.format(version), headers=auth_header(token))
+    changes = changes.get_json()
+    assert changes["version"] == version + 3
+    assert not changes["snapshot"]
+    assert [(i["id"], i["description"]) for i in changes["items"]] == sorted(
+        [(gattung_1, "changed"), (new_item["id"], "")]
+    )
+    assert changes["deleted"] == [gattung_2]
+    changes = client.get(changes_url.format(version + 2), headers=auth_header(token))
+    assert changes.get_json()["items"] == []
+    assert changes.get_json()["deleted"] == [gattung_2]
+
+    # deleting a tree item deletes its subtree
+    tax = taxonomies["FORMALEFUNKTION"]
+    with app.app_context():
+        version = tax.get_version()
+        parent_id = tax.get_id_by_name("FORMALEFUNKTION-1")
+    ids = client.post(
+        "/api/taxonomies/tree/FormaleFunktion/{}/batch/".format(parent_id),
+        json=[{"name": "journal-parent", "children": [{"name": "journal-child"}]}],
+        headers=auth_header(token),
+    ).get_json()["ids"]
+    tree_changes_url = "/api/taxonomies/tree/FormaleFunktion/changes/?since={}"
+    changes = client.get(tree_changes_url.format(version), headers=auth_header(token))
+    assert [(i["id"], i["parent"]) for i in changes.get_json()["items"]] == [
+        (ids[0], parent_id),
+        (ids[1], ids[0]),
+    ]
+    client.delete(
+        "/api/taxonomies/tree/FormaleFunktion/{}/".format(ids[0]),
+        headers=auth_header(token),
+    )
+    changes = client.get(tree_changes_url.format(version), headers=auth_header(token))
+    assert changes.get_json()["items"] == []
+    assert changes.get_json()["deleted"] == ids
+
+    # compacted journal or unknown versions need a full snapshot
+    result = app.test_cli_runner().invoke(args=["compact_taxonomy_journal", "-k", "0"])
+    assert result.exit_code == 0, result.output
+    for since in (version, version + 100):
+        changes = client.get(tree_changes_url.format(since), headers=auth_header(token))
+        assert changes.get_json()["snapshot"]
+        assert parent_id in {item["id"] for item in changes.get_json()["items"]}
+    result = client.get(tree_changes_url.format("x"), headers=auth_header(token))
+    assert result.status_code == 400
+
+
+def test_taxonomy_path_expansion(app: Flask, taxonomies):
+    tax = taxonomies["INSTRUMENT"]
+    model = {
+        "instrument": TaxonomyItemNested(taxonomy_item_get),
+        "instruments": fields.List(TaxonomyItemNested(taxonomy_item_get)),
+        "missing": TaxonomyItemNested(taxonomy_item_get, allow_null=True),
+    }
+    with app.test_request_context("/?expand=taxonomy_paths"):
+        item = tax.get_by_name("INSTRUMENT-3")
+        parent = tax.get_by_name("INSTRUMENT-1")
+        na = tax.not_applicable_item()
+        data = {"instrument": item, "instruments": [item, parent, na], "missing": None}
+        result = marshal(data, model)
+        expected_path = [{"id": parent.id, "name": "INSTRUMENT-1"}]
+        assert result["instrument"]["path"] == expected_path
+        paths = [i["path"] for i in result["instruments"]]
+        assert paths == [expected_path, [], []]
+        assert result["missing"] is None
+        list_item = taxonomies["ANTEIL"].get_by_name("ANTEIL-1")
+        assert "path" not in marshal({"instrument": list_item}, model)["instrument"]
+    with app.test_request_context("/"):
+        item = tax.get_by_name("INSTRUMENT-3")
+        assert "path" not in marshal({"instrument": item}, model)["instrument"]
+
+
+def test_taxonomy_path_documented(client: FlaskClient):
+    definitions = client.get("/api/swagger.json").get_json()["definitions"]
+    path = definitions["TaxonomyItemGETWithPath"]["allOf"][1]["properties"]["path"]
+    assert path["items"] == {"$ref": "#/definitions/TaxonomyPathItem"}
+    # the data models reference the taxonomy items with the path
+    assert "#/definitions/TaxonomyItemGETWithPath" in json.dumps(definitions)
+
+
+def test_prefix_index():
+    index = PrefixIndex(
+        [
+            AutocompleteEntry(1, "Johann Sebastian Bach"),
+            AutocompleteEntry(2, "Carl Philipp Emanuel Bach"),
+            AutocompleteEntry(3, "Bartók, Béla"),
+            AutocompleteEntry(4, "Beethoven"),
+        ]
+    )
+    assert [e.id for e in index.search("b")] == [3, 4, 2, 1]
+    assert [e.id for e in index.search("bach")] == [2, 1]
+    assert [e.id for e in index.search("BARTOK")] == [3]
+    assert [e.id for e in index.search("bela")] == [3]
+    assert [e.id for e in index.search("beethofen")] == [4]
+    assert index.search("b", limit=1) == [index.entries[0]]
+    assert index.search("") == []
+
+
+def test_autocomplete(client: FlaskClient, auth: AuthActions, taxonomies):
+    token = editor_token(auth)
+    url = "/api/taxonomies/tree/Instrument/autocomplete/?q=instrument-3"
+    result = client.get(url, headers=auth_header(token))
+    assert result.status_code == 200, result.get_data().decode()
+    assert result.get_json() == [
+        {
+            "id": result.get_json()[0]["id"],
+            "name": "INSTRUMENT-3",
+            "path": ["INSTRUMENT-1"],
+        }
+    ]
+    url = "/api/taxonomies/list/Anteil/autocomplete/?q=anteil&limit=2"
+    result = client.get(url, headers=auth_header(token))
+    assert [item["name"] for item in result.get_json()] == ["ANTEIL-0", "ANTEIL-1"]
+
+    url = "/api/persons/autocomplete/?q=autocomplete"
+    assert client.get(url, headers=auth_header(token)).get_json() == []
+    result = client.post(
+        "/api/persons/",
+        json={"name": "Autocomplete Person", "gender": "other"},
+        headers=auth_header(token),
+    )
+    assert result.status_code == 200, result.get_data().decode()
+    person = result.get_json()
+    matches = client.get(url, headers=auth_header(token)).get_json()
+    assert matches == [{"id": person["id"], "name": "Autocomplete Person", "path": []}]
+    client.delete("/api/persons/{}/".format(person["id"]), headers=auth_header(token))
+    assert client.get(url, headers=auth_header(token)).get_json() == []
+
+
+def test_taxonomy_registry(app: Flask, taxonomies):
+    assert get_taxonomies() is get_taxonomies()
+    assert "TAXONOMY" not in get_taxonomies()
+    assert "TREETAXONOMY" not in get_taxonomies()
+    tax = get_taxonomies()["INSTRUMENT"]
+    info = get_taxonomy_info(tax)
+    assert info.name == "Instrument"
+    assert info.taxonomy_type == "tree"
+    assert info.table.name == "instrument"
+    assert "instrument_to_citations" in info.referencing_tables
+    assert info.references is get_taxonomy_references(tax)
+    with app.app_context():
+        assert info.na_id == tax.not_applicable_item().id
+
+
+def test_taxonomy_name_ids(app: Flask, taxonomies):
+    tax = taxonomies["ANTEIL"]
+    with app.test_request_context():
+        name_ids = get_taxonomy_info(tax).name_ids
+        assert get_taxonomy_info(tax).name_ids is name_ids  # cached
+        item = tax.get_by_name("ANTEIL-1")
+        assert item is not None and item.id == name_ids["ANTEIL-1"]
+        assert tax.get_by_name("missing") is None
+        assert tax.not_applicable_item().name == "na"
+        assert tax.resolve_reference("ANTEIL-1") == item.id
+        assert tax.resolve_reference(item.id) == item.id
+
+        # uncommitted items can be resolved in the same transaction
+        new_item = tax(name="name-id-test", description=None)
+        db.session.add(new_item)
+        tax.mark_changed()
+        db.session.flush()
+        assert tax.get_id_by_name("name-id-test") == new_item.id
+        db.session.rollback()
+        assert tax.get_id_by_name("name-id-test") is None
+
+        # marking the taxonomy as changed drops the cached names
+        name_ids = get_taxonomy_info(tax).name_ids
+        tax.mark_changed()
+        db.session.rollback()
+        assert get_taxonomy_info(tax).name_ids is not name_ids
+
+        with pytest.raises(ValidationError):
+            Person.resolve_reference("ANTEIL-1")
+
+
+def test_taxonomy_name_references_in_api(
+    client: FlaskClient, auth: AuthActions, taxonomies
+):
+    token = auth.login().get_json()["access_token"]
+    person = client.post(
+        "/api/persons/",
+        json={"name": "name-reference-test", "gender": "other"},
+        headers=auth_header(token),
+    ).get_json()
+    result = client.post(
+        "/api/opuses/",
+        json={
+            "name": "name-reference-test",
+            "composer": person,
+            "grundton": "GRUNDTON-1",
+        },
+        headers=auth_header(token),
+    )
+    assert result.status_code == 200, result.get_data().decode()
+    opus_url = "/api/opuses/{}/".format(result.get_json()["id"])
+    opus = client.get(opus_url, headers=auth_header(token)).get_json()
+    assert opus["grundton"]["name"] == "GRUNDTON-1"
+
+    opus["grundton"] = "GRUNDTON-2"
+    result = client.put(opus_url, json=opus, headers=auth_header(token))
+    assert result.status_code == 200, result.get_data().decode()
+    assert result.get_json()["grundton"]["name"] == "GRUNDTON-2"
+
+    opus["grundton"] = "missing"
+    result = client.put(opus_url, json=opus, headers=auth_header(token))
+    assert result.status_code == 400, result.get_data().decode()
+    opus["grundton"] = 42
+    result = client.put(opus_url, json=opus, headers=auth_header(token))
+    assert result.status_code == 400, result.get_data().decode()
+
+    client.delete(opus_url, headers=auth_header(token))
+    client.delete("/api/persons/{}/".format(person["id"]), headers=auth_header(token))